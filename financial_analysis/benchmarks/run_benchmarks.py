@@ -0,0 +1,303 @@
+"""
+Benchmark suite for the hot paths: loading, feature construction, backtests,
+grid search and Monte Carlo sampling.
+
+Each case runs on the bundled data and on synthetic price series of growing size
+(10^3 ... 10^7 bars). For every (case, size) the suite records
+
+    seconds    : best wall time over --repeat runs
+    peak_mb    : peak memory allocated during one run (tracemalloc, NumPy included)
+    throughput : work units per second (bars/s, pairs/s or draws/s)
+
+appends the run to a JSON history and compares it with a saved baseline.
+
+Usage (from financial_analysis/)::
+
+    python benchmarks/run_benchmarks.py                      # 10^3 .. 10^6 bars
+    python benchmarks/run_benchmarks.py --sizes 1e3 1e7      # pick sizes
+    python benchmarks/run_benchmarks.py --cases grid_search backtest
+    python benchmarks/run_benchmarks.py --save-baseline      # current run becomes the baseline
+    python benchmarks/run_benchmarks.py --check              # exit 1 on regressions
+    python benchmarks/run_benchmarks.py --profile stages.prom  # per-stage times (.prom or .json)
+
+A (case, size) is a regression when it is slower than the baseline by more than
+--tolerance (default 20%). History and baseline are machine-specific and live next
+to this script (history.json, baseline.json), ignored by git.
+
+grid_search keeps one SMA row per window in memory, so 10^7 bars needs several GB.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent                                   # financial_analysis/
+
+# Make the fintech_labs package (in financial_analysis/) importable
+sys.path.insert(0, str(ROOT))
+
+HISTORY_FILE = HERE / 'history.json'
+BASELINE_FILE = HERE / 'baseline.json'
+
+DEFAULT_SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+
+# Slowdowns smaller than this (timer noise on sub-millisecond cases) are never flagged
+MIN_REGRESSION_SECONDS = 0.002
+
+# Grid benchmarked by grid_search (10 x 10 = 100 pairs, all with fast < slow)
+GRID_FAST = list(range(5, 51, 5))
+GRID_SLOW = list(range(60, 251, 20))
+
+
+# -------------------------
+# Inputs
+# -------------------------
+
+def synthetic_prices(n: int, seed: int = 0) -> pd.DataFrame:
+    """Geometric random walk with a Close column, indexed by minute bars (fits 10^7 bars)."""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    index = pd.date_range('2000-01-03', periods=n, freq='min', name='Date')
+    return pd.DataFrame({'Close': close}, index=index)
+
+
+def bundled_prices() -> pd.DataFrame:
+    from fintech_labs.market_data import load_ohlcv, data_path
+    return load_ohlcv(data_path('microsoft'))
+
+
+# -------------------------
+# Cases: setup(df) -> (fn, units, unit)
+# -------------------------
+
+def case_load_ohlcv(df):
+    from fintech_labs.market_data import load_ohlcv, data_path
+    path = data_path('microsoft')
+    load_ohlcv(path)                                 # make sure the cache is warm
+    return (lambda: load_ohlcv(path)), len(df), 'bars'
+
+
+def case_features(df):
+    """Feature sets of microsoft_features.py and baseline_strategy.py."""
+    from fintech_labs.features import (FeaturePipeline, direction, next_close, price_diff, profit, shares,
+                                       simple_return, sma, wealth)
+    ma_fast, ma_slow = sma(10), sma(30).named('MA50')
+    held = shares(ma_fast, ma_slow)
+    pnl = profit(held)
+    pipeline = FeaturePipeline([
+        price_diff(), simple_return(), direction(),
+        sma(30).named('ma30'), sma(60).named('ma60'), sma(120).named('ma120'),
+        ma_fast, ma_slow, held, next_close(), pnl, wealth(pnl),
+    ])
+    return (lambda: pipeline.run(df)), len(df), 'bars'
+
+
+def case_backtest(df):
+    from fintech_labs.backtest import backtest_ma_crossover
+    return (lambda: backtest_ma_crossover(df, fast=20, slow=100, fee_bps=10)), len(df), 'bars'
+
+
+def case_grid_search(df):
+    from fintech_labs.backtest import grid_search
+    pairs = len(GRID_FAST) * len(GRID_SLOW)
+    return (lambda: grid_search(df, GRID_FAST, GRID_SLOW, fee_bps=10)), pairs, 'pairs'
+
+
+def case_calendar_windows(df):
+    """Short-window backtests (500 bars every 250), date ranges resolved by a TradingCalendar."""
+    from fintech_labs.backtest import backtest_ma_crossover
+    from fintech_labs.trading_calendar import TradingCalendar
+    cal = TradingCalendar(df.index, {'Close': df['Close'].to_numpy()})
+    ranges = [(cal.dates[i], cal.dates[i + 499]) for i in range(0, len(cal) - 499, 250)]
+
+    def run():
+        for start, end in ranges:
+            backtest_ma_crossover(cal.view(start, end, ['Close']), fast=20, slow=100, fee_bps=10)
+    return run, len(ranges), 'windows'
+
+
+def case_sampling(df):
+    """variation-of-sample-complete.py: samples of 30 draws, as many draws as bars."""
+    from fintech_labs.sampling import sampling_distribution
+    n = 30
+    trials = max(1, len(df) // n)
+    return (lambda: sampling_distribution(n=n, trials=trials, loc=10, scale=5, seed=0)), n * trials, 'draws'
+
+
+CASES = {
+    'load_ohlcv': case_load_ohlcv,
+    'features': case_features,
+    'backtest': case_backtest,
+    'grid_search': case_grid_search,
+    'calendar_windows': case_calendar_windows,
+    'sampling': case_sampling,
+}
+
+# Cases that only make sense on the bundled file
+BUNDLED_ONLY = {'load_ohlcv'}
+
+
+# -------------------------
+# Measurement
+# -------------------------
+
+def measure(fn, repeat: int) -> dict:
+    """Best wall time over ``repeat`` runs, then one traced run for peak memory."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': min(times), 'peak_mb': peak / 1024 ** 2}
+
+
+def run_suite(cases, sizes, repeat: int) -> list:
+    results = []
+    inputs = [('bundled', bundled_prices())] + [(int(n), None) for n in sizes]
+    for size, df in inputs:
+        if df is None:
+            df = synthetic_prices(size)
+        for name in cases:
+            if name in BUNDLED_ONLY and size != 'bundled':
+                continue
+            fn, units, unit = CASES[name](df)
+            m = measure(fn, repeat)
+            row = {'case': name, 'size': size, 'bars': len(df), **m,
+                   'throughput': units / m['seconds'] if m['seconds'] > 0 else float('inf'),
+                   'unit': f'{unit}/s'}
+            results.append(row)
+            print(f"{name:12s} {str(size):>9s}  {m['seconds']:10.4f} s  {m['peak_mb']:9.1f} MB  "
+                  f"{row['throughput']:14,.0f} {row['unit']}", flush=True)
+    return results
+
+
+# -------------------------
+# History and baseline
+# -------------------------
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_record(results) -> dict:
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.platform(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+
+
+def _load_json(path: Path, default):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path: Path, data):
+    tmp = path.with_suffix('.json.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, path)
+
+
+def append_history(record: dict, path: Path = HISTORY_FILE):
+    history = _load_json(path, [])
+    history.append(record)
+    _write_json(path, history)
+
+
+def _key(row) -> str:
+    return f"{row['case']}@{row['size']}"
+
+
+def compare(results, baseline: dict, tolerance: float) -> list:
+    """(key, baseline seconds, current seconds, ratio) of every regression."""
+    base = {_key(r): r['seconds'] for r in baseline.get('results', [])}
+    regressions = []
+    for row in results:
+        old = base.get(_key(row))
+        if old is None or old <= 0:
+            continue
+        ratio = row['seconds'] / old
+        if ratio > 1.0 + tolerance and row['seconds'] - old > MIN_REGRESSION_SECONDS:
+            regressions.append((_key(row), old, row['seconds'], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    parser.add_argument('--sizes', nargs='+', type=float, default=list(DEFAULT_SIZES),
+                        help='synthetic series lengths (e.g. 1e3 1e5 1e7)')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per case (best is kept)')
+    parser.add_argument('--tolerance', type=float, default=0.20, help='allowed slowdown vs baseline')
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the baseline')
+    parser.add_argument('--check', action='store_true', help='exit with status 1 if any case regressed')
+    parser.add_argument('--no-history', action='store_true', help='do not append to history.json')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='also record per-stage wall times (fintech_labs.profiling) to a .json or '
+                             'Prometheus .prom file')
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        from fintech_labs.profiling import Profiler
+        # Timing only: measure() runs its own tracemalloc pass for the peak memory
+        with Profiler(memory=False) as profiler:
+            results = run_suite(args.cases, args.sizes, args.repeat)
+        if args.profile.endswith('.json'):
+            profiler.to_json(args.profile)
+        else:
+            profiler.to_prometheus(args.profile, labels={'commit': _git_commit() or 'unknown'})
+        print(f"Stage profile written to {args.profile}")
+    else:
+        results = run_suite(args.cases, args.sizes, args.repeat)
+    record = run_record(results)
+    if not args.no_history:
+        append_history(record)
+
+    regressions = compare(results, _load_json(BASELINE_FILE, {}), args.tolerance)
+    for key, old, new, ratio in regressions:
+        print(f"REGRESSION {key}: {old:.4f} s -> {new:.4f} s ({ratio:.2f}x)")
+    if not regressions:
+        print("No regressions against the baseline.")
+
+    if args.save_baseline:
+        _write_json(BASELINE_FILE, record)
+        print(f"Baseline saved to {BASELINE_FILE}")
+
+    return 1 if (args.check and regressions) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
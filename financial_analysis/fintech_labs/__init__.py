@@ -0,0 +1,19 @@
+"""
+Reusable building blocks for the fintech-labs scripts (data loading, features, statistics,
+backtests).
+
+The scripts in munging_visualizing/, random_vars_and_dist/ ... import from here.
+Importing any module of the package has no side effects: nothing is read from
+data/, nothing is plotted, and matplotlib/scipy are only imported by the functions
+that need them. Worker processes pay for numpy and pandas only.
+
+    market_data, features, feature_store,     loading, derived columns, bars, dates
+    bars, trading_calendar
+    backtest, panel_backtest, walk_forward,   backtest engines and signal families
+    streaming, bootstrap_grid, signals
+    rolling_stats, sampling, bootstrap,       statistics
+    hypothesis_tests, ecdf, dist_fit,
+    horizon_risk, normal_sweep, discrete_sums
+    reports                                   headless chart pages (PNG/SVG)
+    profiling                                 optional per-stage timing and memory metrics
+"""
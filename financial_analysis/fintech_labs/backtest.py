@@ -0,0 +1,491 @@
+"""
+Moving-average crossover backtests: one pair, or a whole (fast, slow) grid at once.
+
+- ``backtest_ma_crossover``: reference pandas implementation for one pair.
+- ``grid_search``: every pair from one SMA table (cumulative sums), evaluated in
+  vectorized, memory-bounded chunks, optionally in worker processes.
+- ``grid_strategy_returns``: the daily strategy returns of every pair, for
+  resampling (``fintech_labs.bootstrap_grid``).
+
+Importing this module only costs numpy and pandas (no plotting, no data loading).
+"""
+import os
+import tempfile
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .profiling import profiled, stage
+
+
+@profiled()
+def backtest_ma_crossover(df: pd.DataFrame, fast: int, slow: int, fee_bps: float = 0.0, store=None, ticker=None,
+                          periods_per_year: float = 252):
+    """
+    Moving-average crossover backtest (long-or-flat).
+
+    Parameters
+    ----------
+    df : pd.DataFrame, dict of arrays or np.ndarray
+        Input OHLCV-like DataFrame. Must contain at least a 'Close' column.
+        Ideally indexed by datetime for easy slicing, but not strictly required.
+        A ``{'Close': array}`` mapping (e.g. ``TradingCalendar.view``) or a Close
+        array is backtested directly with the NumPy engine, without building a frame
+        (``store`` is then not allowed).
+    fast : int
+        Window length (in trading days) for the fast moving average.
+    slow : int
+        Window length (in trading days) for the slow moving average. Must be > fast.
+    fee_bps : float
+        Trading cost in basis points (bps) applied whenever the position changes.
+        Example: 10 bps = 0.10% = 0.001 in decimal return.
+        This is a simplified way to model commissions + spread + slippage.
+    store : fintech_labs.feature_store.FeatureStore, optional
+        If given (``ticker`` is then required), the moving averages are pulled from
+        the feature store instead of being recomputed. ``df`` must then be a contiguous
+        date slice of that ticker's data.
+    ticker : str, optional
+        Ticker name in the store (e.g. 'microsoft').
+    periods_per_year : float
+        Bars per year, for the Sharpe annualization: 252 for daily bars, 52 for weekly
+        bars... (``fintech_labs.bars.bars_per_year``). Windows are counted in bars.
+
+    Returns
+    -------
+    dict
+        Summary metrics of the strategy:
+        - total_return: final strategy return
+        - bh_return: buy-and-hold return
+        - sharpe: simple per-bar Sharpe annualized by sqrt(periods_per_year)
+        - max_dd: maximum drawdown of the strategy equity curve
+        - trades: number of position changes (entries/exits)
+        - final_eq: final equity (starting at 1.0)
+    """
+    _check_store(df, store, ticker)
+    if not isinstance(df, pd.DataFrame):
+        return _backtest_arrays(close_values(df), fast, slow, fee_bps, periods_per_year)
+
+    # Work on a copy with only the 'Close' price to keep things simple and explicit
+    x = df[['Close']].copy()
+
+    # Daily simple returns:
+    # ret[t] = Close[t] / Close[t-1] - 1
+    with stage('pct_change'):
+        x['ret'] = x['Close'].pct_change()
+
+    # Compute moving averages (simple moving averages, SMA)
+    with stage('rolling_mean'):
+        if store is not None:
+            # Cached full-history SMAs, cut to this slice (first window-1 rows NaN as rolling())
+            x['ma_fast'] = store.rolling_mean(ticker, fast, x.index)
+            x['ma_slow'] = store.rolling_mean(ticker, slow, x.index)
+        else:
+            x['ma_fast'] = x['Close'].rolling(fast).mean()
+            x['ma_slow'] = x['Close'].rolling(slow).mean()
+
+    # Drop the initial rows where moving averages are NaN
+    # (you can't generate signals until enough history exists)
+    with stage('dropna'):
+        x = x.dropna()
+
+    with stage('positions'):
+        # Raw position signal:
+        # 1 means "in the market / long 1 unit" when fast MA is above slow MA
+        # 0 means "flat / out of the market" otherwise
+        x['pos'] = (x['ma_fast'] > x['ma_slow']).astype(int)
+
+        # IMPORTANT (anti-lookahead):
+        # We shift the position by 1 day so that today's signal is applied to tomorrow's return.
+        # Otherwise you would be implicitly using today's close to decide and profit from today's move.
+        x['pos_lag'] = x['pos'].shift(1).fillna(0)
+
+        # Trade detection:
+        # pos.diff().abs() is 1 when you switch between 0 and 1 (enter or exit), 0 otherwise.
+        x['trade'] = x['pos'].diff().abs().fillna(0)
+
+        # Convert bps (basis points) to decimal and apply only on trade days
+        # Example: 10 bps => 10/10000 = 0.001 = 0.1%
+        cost = (fee_bps / 10_000.0) * x['trade']
+
+        # Strategy return:
+        # - If pos_lag = 1, you earn the market return for that day.
+        # - If pos_lag = 0, you earn 0 that day.
+        # - Subtract costs on trade days.
+        x['strat_ret'] = x['pos_lag'] * x['ret'] - cost
+
+        # Buy & hold return (baseline)
+        x['bh_ret'] = x['ret']
+
+    with stage('cumprod'):
+        # Equity curves (starting at 1.0):
+        # equity[t] = Π(1 + return[t])
+        x['strat_eq'] = (1 + x['strat_ret']).cumprod()
+        x['bh_eq'] = (1 + x['bh_ret']).cumprod()
+
+    # Helper: maximum drawdown computed from the equity curve
+    def max_drawdown(equity: pd.Series) -> float:
+        peak = equity.cummax()            # running peak
+        dd = equity / peak - 1.0          # drawdown series (<= 0)
+        return float(dd.min())            # worst drawdown (most negative)
+
+    with stage('metrics'):
+        # Total returns relative to 1.0 initial equity
+        total = x['strat_eq'].iloc[-1] - 1
+        bh_total = x['bh_eq'].iloc[-1] - 1
+
+        # Simple annualized Sharpe:
+        # sqrt(252) * mean(daily_return) / std(daily_return)  (sqrt(52) on weekly bars...)
+        # NOTE: This is a basic Sharpe; in real work you'd handle risk-free rate, stability, etc.
+        sharpe = np.sqrt(periods_per_year) * x['strat_ret'].mean() / (x['strat_ret'].std(ddof=0) + 1e-12)
+
+        max_dd = max_drawdown(x['strat_eq'])
+
+    return {
+        'fast': fast,
+        'slow': slow,
+        'total_return': float(total),
+        'bh_return': float(bh_total),
+        'sharpe': float(sharpe),
+        'max_dd': max_dd,
+        'trades': int(x['trade'].sum()),
+        'final_eq': float(x['strat_eq'].iloc[-1]),
+    }
+
+
+# Upper bound on (pairs x days) cells evaluated at once by the grid engine.
+# Keeps the temporaries of a big sweep at a few tens of MB instead of GBs.
+GRID_CHUNK_CELLS = 2_000_000
+
+
+def sma_table(close: np.ndarray, windows) -> np.ndarray:
+    """
+    Simple moving averages for several windows from ONE cumulative-sum pass.
+
+    Parameters
+    ----------
+    close : np.ndarray
+        1-D array of prices (no NaNs).
+    windows : sequence of int
+        Window lengths. Row i of the output is the SMA for windows[i].
+
+    Returns
+    -------
+    np.ndarray
+        (len(windows), len(close)) array. The first w-1 entries of each row are NaN,
+        exactly like ``rolling(w).mean()``.
+
+    Notes
+    -----
+    SMA_w[t] = (S[t+1] - S[t+1-w]) / w with S the cumulative sum of the prices.
+    We subtract close[0] before summing (and add it back at the end) so the running
+    sum stays small and the difference of two big sums does not lose precision.
+    """
+    close = np.asarray(close, dtype=float)
+    base = close[0] if close.size else 0.0
+
+    csum = np.empty(close.size + 1)
+    csum[0] = 0.0
+    np.cumsum(close - base, out=csum[1:])
+
+    out = np.full((len(windows), close.size), np.nan)
+    for i, w in enumerate(windows):
+        if w <= close.size:
+            out[i, w - 1:] = (csum[w:] - csum[:-w]) / w + base
+    return out
+
+
+def _position_returns(ret: np.ndarray, pos: np.ndarray, start: np.ndarray, fee_bps: float):
+    """
+    Daily strategy returns for a batch of raw position rows at once.
+
+    ``pos`` is the (n_rows x n_days) long/flat signal of each row (any signal family)
+    and row p only "exists" from day start[p] (first day its indicator is defined,
+    i.e. what ``dropna()`` keeps in ``backtest_ma_crossover``). Before that day the
+    strategy return is forced to 0, so the equity curve is flat at 1.0 and does not
+    affect cumprod / drawdown.
+
+    Returns (strat_ret, trade, in_win), all (n_rows x n_days).
+    """
+    n = ret.size
+    t = np.arange(n)
+    in_win = t[None, :] >= start[:, None]            # (P, n) rows kept by dropna()
+    pos = pos & in_win
+
+    # pos_lag: yesterday's position (0 on the first day of each window, because pos
+    # is 0 before the window starts)
+    pos_lag = np.zeros_like(pos)
+    pos_lag[:, 1:] = pos[:, :-1]
+
+    # trade: 1 when pos changes; the first day of each window never counts as a trade
+    trade = np.zeros_like(pos)
+    trade[:, 1:] = pos[:, 1:] != pos[:, :-1]
+    trade &= t[None, :] > start[:, None]
+
+    # Strategy return (same formula as the single backtest), 0 outside the window
+    cost = (fee_bps / 10_000.0) * trade
+    strat_ret = np.where(pos_lag, ret[None, :], 0.0) - cost
+    return strat_ret, trade, in_win
+
+
+def _grid_returns(ret: np.ndarray, sma: np.ndarray, fi: np.ndarray, si: np.ndarray,
+                  slow: np.ndarray, fee_bps: float):
+    """
+    Daily strategy returns for a batch of (fast, slow) pairs at once.
+
+    Raw position: 1 if fast MA > slow MA (NaN comparisons are False => 0), from day
+    slow - 1 (first day where both MAs are defined). See ``_position_returns``.
+    """
+    return _position_returns(ret, sma[fi] > sma[si], slow - 1, fee_bps)
+
+
+def _strategy_metrics(strat_ret: np.ndarray, trade: np.ndarray, in_win: np.ndarray, start: np.ndarray,
+                      periods_per_year: float = 252) -> dict:
+    """Metrics of a batch of ``_position_returns`` rows (batched reductions along time)."""
+    n = strat_ret.shape[1]
+
+    # Equity curves and drawdowns as batched reductions along the time axis
+    strat_eq = np.cumprod(1 + strat_ret, axis=1)
+    peak = np.maximum.accumulate(strat_eq, axis=1)
+    max_dd = (strat_eq / peak - 1.0).min(axis=1)
+
+    # Sharpe over the window only (length m = n - start), population std (ddof=0)
+    m = n - start
+    mean = strat_ret.sum(axis=1) / m
+    dev = np.where(in_win, strat_ret - mean[:, None], 0.0)
+    std = np.sqrt((dev ** 2).sum(axis=1) / m)
+    sharpe = np.sqrt(periods_per_year) * mean / (std + 1e-12)
+
+    return {
+        'total_return': strat_eq[:, -1] - 1,
+        'sharpe': sharpe,
+        'max_dd': max_dd,
+        'trades': trade.sum(axis=1).astype(np.int64),
+        'final_eq': strat_eq[:, -1],
+    }
+
+
+def _grid_metrics(close: np.ndarray, ret: np.ndarray, sma: np.ndarray,
+                  fi: np.ndarray, si: np.ndarray, slow: np.ndarray, fee_bps: float,
+                  periods_per_year: float = 252) -> dict:
+    """Metrics for a batch of (fast, slow) pairs at once (see ``_grid_returns``)."""
+    with stage('positions'):
+        strat_ret, trade, in_win = _grid_returns(ret, sma, fi, si, slow, fee_bps)
+    with stage('metrics'):
+        return _strategy_metrics(strat_ret, trade, in_win, slow - 1, periods_per_year)
+
+
+def bh_returns(ret: np.ndarray, start) -> np.ndarray:
+    """Buy & hold return from each start day to the end (only depends on the start)."""
+    start = np.asarray(start, dtype=np.int64)
+    by_start = {s: np.cumprod(1 + ret[s:])[-1] - 1 for s in np.unique(start)}
+    return np.array([by_start[s] for s in start])
+
+
+def close_values(data) -> np.ndarray:
+    """Close prices of a DataFrame, of a {'Close': array} mapping or of a price array (no copy for float64)."""
+    if isinstance(data, pd.DataFrame):
+        return data['Close'].to_numpy(dtype=float)
+    if isinstance(data, Mapping):
+        data = data['Close']
+    return np.asarray(data, dtype=float)
+
+
+def _check_store(df, store, ticker):
+    """The feature store cuts a ticker's SMAs by the dates of ``df``: both are required."""
+    if store is None:
+        return
+    if ticker is None:
+        raise ValueError("store= needs ticker= (the name of the series in the store)")
+    if not isinstance(df, pd.DataFrame):
+        raise ValueError("store= needs a DataFrame with a date index, not arrays or a {'Close': ...} mapping")
+
+
+def _backtest_arrays(close: np.ndarray, fast: int, slow: int, fee_bps: float, periods_per_year: float) -> dict:
+    """``backtest_ma_crossover`` on a Close array: one pair of the grid engine."""
+    if np.isnan(close).any():
+        raise ValueError("Close contains NaNs")
+    if slow > close.size:
+        raise ValueError(f"slow window {slow} is longer than the data ({close.size} rows)")
+    ret = simple_returns(close)
+    sma = sma_table(close, [fast, slow])
+    slow_arr = np.array([slow])
+    m = _grid_metrics(close, ret, sma, np.array([0]), np.array([1]), slow_arr, fee_bps, periods_per_year)
+    return {
+        'fast': fast,
+        'slow': slow,
+        'total_return': float(m['total_return'][0]),
+        'bh_return': float(bh_returns(ret, slow_arr - 1)[0]),
+        'sharpe': float(m['sharpe'][0]),
+        'max_dd': float(m['max_dd'][0]),
+        'trades': int(m['trades'][0]),
+        'final_eq': float(m['final_eq'][0]),
+    }
+
+
+def simple_returns(close: np.ndarray) -> np.ndarray:
+    """Daily simple returns (ret[0] is undefined, as with pct_change)."""
+    ret = np.full(close.size, np.nan)
+    ret[1:] = close[1:] / close[:-1] - 1
+    return ret
+
+
+# Per-process state of the parallel grid workers (filled once by the initializer,
+# then reused by every chunk the process receives).
+_worker_state = {}
+
+
+def _init_grid_worker(close_path: str, windows: np.ndarray):
+    """
+    Process-pool initializer: map the shared Close array and build the SMA table.
+
+    The prices are NOT pickled to every task. They are written once to a .npy file
+    and each worker memory-maps it (read-only, pages shared through the OS cache).
+    """
+    close = np.load(close_path, mmap_mode='r')
+    _worker_state['close'] = close
+    _worker_state['ret'] = simple_returns(close)
+    _worker_state['sma'] = sma_table(close, windows)
+
+
+def _grid_worker_chunk(args) -> dict:
+    """Evaluate one chunk of pairs inside a worker (only small index arrays travel)."""
+    fi, si, slow, fee_bps, periods_per_year = args
+    s = _worker_state
+    return _grid_metrics(s['close'], s['ret'], s['sma'], fi, si, slow, fee_bps, periods_per_year)
+
+
+@profiled()
+def grid_search(df: pd.DataFrame, fast_list, slow_list, fee_bps: float = 0.0, workers: int = 1,
+                store=None, ticker=None, periods_per_year: float = 252) -> pd.DataFrame:
+    """
+    Parameter sweep over (fast, slow) combinations.
+
+    ``df`` may also be a ``{'Close': array}`` mapping or a Close array (see
+    ``backtest_ma_crossover``); those must not contain NaNs.
+
+    Instead of calling ``backtest_ma_crossover`` once per pair, the whole grid is
+    evaluated with NumPy:
+    - every needed SMA window is computed once (``sma_table``, one cumsum pass),
+    - positions for all pairs form a (n_pairs x n_days) matrix via broadcasting,
+    - returns, equity, Sharpe, max drawdown and trades are batched reductions.
+
+    workers : int
+        Number of processes. 1 (default) runs in this process; None uses every core.
+        With workers > 1 the grid is split into chunks across a process pool and the
+        Close array is shared through a memory-mapped file.
+    store, ticker :
+        Optional feature store to pull the SMA windows from (see ``backtest_ma_crossover``).
+        Used by the in-process path; pool workers build their own SMA table.
+    periods_per_year : float
+        Sharpe annualization (see ``backtest_ma_crossover``).
+
+    The output is the same DataFrame the per-pair loop produces (same columns,
+    same index, same order). Returns a DataFrame sorted by Sharpe then total return.
+    """
+    pairs = [(fast, slow) for fast in fast_list for slow in slow_list if fast < slow]
+    columns = ['fast', 'slow', 'total_return', 'bh_return', 'sharpe', 'max_dd', 'trades', 'final_eq']
+    if not pairs:
+        return pd.DataFrame(columns=columns)
+
+    _check_store(df, store, ticker)
+    close = close_values(df)
+
+    # NaNs inside the price series make dropna() remove rows in the middle of the
+    # sample; the matrix engine assumes a contiguous window, so use the loop there.
+    if np.isnan(close).any():
+        if not isinstance(df, pd.DataFrame):
+            raise ValueError("Close contains NaNs")
+        rows = [backtest_ma_crossover(df, fast, slow, fee_bps=fee_bps, store=store, ticker=ticker,
+                                      periods_per_year=periods_per_year)
+                for fast, slow in pairs]
+        return pd.DataFrame(rows).sort_values(['sharpe', 'total_return'], ascending=False)
+
+    fast = np.array([p[0] for p in pairs], dtype=np.int64)
+    slow = np.array([p[1] for p in pairs], dtype=np.int64)
+    if slow.max() > close.size:
+        raise ValueError(f"slow window {slow.max()} is longer than the data ({close.size} rows)")
+
+    # Every SMA window needed by the grid (index of each pair's fast/slow row)
+    windows = np.unique(np.concatenate([fast, slow]))
+    fi = np.searchsorted(windows, fast)
+    si = np.searchsorted(windows, slow)
+
+    with stage('returns'):
+        ret = simple_returns(close)
+        # Buy & hold only depends on where the window starts (i.e. on slow)
+        bh_return = bh_returns(ret, slow - 1)
+
+    # Evaluate the grid in chunks of pairs so memory stays bounded
+    if workers is None:
+        workers = os.cpu_count() or 1
+    step = max(1, GRID_CHUNK_CELLS // close.size)
+    if workers > 1:
+        # A few chunks per worker so the pool stays balanced
+        step = max(1, min(step, -(-len(pairs) // (workers * 4))))
+    chunks = [(fi[i:i + step], si[i:i + step], slow[i:i + step], fee_bps, periods_per_year)
+              for i in range(0, len(pairs), step)]
+
+    if workers > 1 and len(chunks) > 1:
+        fd, close_path = tempfile.mkstemp(suffix='.npy')
+        os.close(fd)
+        try:
+            np.save(close_path, close)
+            with stage('pool'), ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                                    initializer=_init_grid_worker,
+                                                    initargs=(close_path, windows)) as pool:
+                # map() yields results in submission order => same row order as serial
+                parts = list(pool.map(_grid_worker_chunk, chunks))
+        finally:
+            os.remove(close_path)
+    else:
+        with stage('sma_table'):
+            if store is not None:
+                sma = np.vstack([store.rolling_mean(ticker, w, df.index) for w in windows])
+            else:
+                sma = sma_table(close, windows)
+        with stage('chunks'):
+            parts = [_grid_metrics(close, ret, sma, *chunk) for chunk in chunks]
+
+    with stage('frame'):
+        metrics = {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+        res = pd.DataFrame({
+            'fast': fast,
+            'slow': slow,
+            'total_return': metrics['total_return'],
+            'bh_return': bh_return,
+            'sharpe': metrics['sharpe'],
+            'max_dd': metrics['max_dd'],
+            'trades': metrics['trades'],
+            'final_eq': metrics['final_eq'],
+        })
+        return res.sort_values(['sharpe', 'total_return'], ascending=False)
+
+
+def grid_strategy_returns(df: pd.DataFrame, fast_list, slow_list, fee_bps: float = 0.0):
+    """
+    Daily strategy returns of every (fast, slow) pair, as one matrix.
+
+    Returns
+    -------
+    pairs : pd.DataFrame
+        One row per pair (same order as the grid loops): fast, slow, start.
+        ``start`` is the first row of the pair's backtest window (slow - 1).
+    strat_ret : np.ndarray
+        (n_pairs x n_days) daily strategy returns; 0 before each pair's start.
+        Row p restricted to [start, n) is exactly ``strat_ret`` of
+        ``backtest_ma_crossover(df, fast, slow, fee_bps)``.
+    """
+    close = close_values(df)
+    if np.isnan(close).any():
+        raise ValueError("Close contains NaNs")
+    pairs = [(f, s) for f in fast_list for s in slow_list if f < s]
+    fast = np.array([p[0] for p in pairs], dtype=np.int64)
+    slow = np.array([p[1] for p in pairs], dtype=np.int64)
+
+    windows = np.unique(np.concatenate([fast, slow]))
+    sma = sma_table(close, windows)
+    strat_ret, _, _ = _grid_returns(simple_returns(close), sma, np.searchsorted(windows, fast),
+                                    np.searchsorted(windows, slow), slow, fee_bps)
+    return pd.DataFrame({'fast': fast, 'slow': slow, 'start': slow - 1}), strat_ret
@@ -0,0 +1,174 @@
+"""
+OHLCV bar aggregation: daily (or finer) bars to weekly, monthly, N-bar... bars.
+
+A timeframe is either a pandas frequency ('W', 'ME', 'QE', '6MS'... with the bins and
+labels of ``df.resample(rule)``) or an int N (bars of N consecutive rows, labelled
+with the date of their last row, the last bar possibly shorter). Periods without
+data produce no bar.
+
+``Timeframes`` computes the group boundaries of several timeframes ONCE per index.
+``aggregate`` then reads the data a single time: the union of all boundaries cuts
+the rows into "atoms" (segments no bar boundary crosses), each column is reduced
+per atom with one ``reduceat`` pass, and every timeframe is a second, much smaller
+segmented reduction over the atoms. Semantics per bar:
+
+    Open = first, High = max, Low = min, Close / Adj Close = last, Volume = sum
+
+High / Low skip NaNs; rows without a Close should be dropped beforehand.
+
+Example::
+
+    tf = Timeframes(prices.index, ['W', 'ME', 21])
+    bars = tf.aggregate(prices)                 # {'W': weekly, 'ME': monthly, 21: 21-day bars}
+    grid_search(bars['W'], ..., periods_per_year=bars_per_year('W'))
+"""
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+# Column -> segmented reduction (the same for rows -> atoms and atoms -> bars)
+_RULES = {
+    'Open': 'first',
+    'High': 'max',
+    'Low': 'min',
+    'Close': 'last',
+    'Adj Close': 'last',
+    'Volume': 'sum',
+}
+
+
+def bar_bounds(index, rule):
+    """
+    First row of every bar and its label, for one timeframe.
+
+    Returns
+    -------
+    (starts, labels) : (np.ndarray of int, pd.DatetimeIndex)
+    """
+    index = pd.DatetimeIndex(index)
+    n = len(index)
+    if isinstance(rule, (int, np.integer)):
+        if rule < 1:
+            raise ValueError("N-bar size must be >= 1")
+        starts = np.arange(0, n, rule)
+        ends = np.minimum(starts + rule, n)
+        return starts, index[ends - 1] if n else index
+    # Bins and labels exactly as resample(); empty bins (no rows) are dropped
+    first = pd.Series(np.arange(n), index=index).resample(rule).min().dropna()
+    return first.to_numpy(dtype=np.int64), pd.DatetimeIndex(first.index, name=index.name)
+
+
+def _reduce(x, starts, how, ends=None):
+    """Segmented reduction of x over [starts[i], starts[i+1])."""
+    if how == 'first':
+        return x[starts]
+    if how == 'last':
+        return x[ends - 1]
+    if how == 'max':
+        return np.fmax.reduceat(x, starts)
+    if how == 'min':
+        return np.fmin.reduceat(x, starts)
+    return np.add.reduceat(x, starts)
+
+
+class Timeframes:
+    """
+    Precomputed bar boundaries of several timeframes on one date index.
+
+    Parameters
+    ----------
+    index : DatetimeIndex
+        Sorted dates of the source bars.
+    rules : iterable of str or int
+        Timeframes (see module docstring).
+    """
+
+    def __init__(self, index, rules):
+        self.index = pd.DatetimeIndex(index)
+        if not self.index.is_monotonic_increasing:
+            raise ValueError("index must be sorted")
+        self.rules = list(rules)
+        if not self.rules:
+            raise ValueError("at least one timeframe is needed")
+        self.bounds = {rule: bar_bounds(self.index, rule) for rule in self.rules}
+
+        # Atoms: segments between consecutive boundaries of ANY timeframe
+        n = len(self.index)
+        self.atoms = np.unique(np.concatenate([s for s, _ in self.bounds.values()]))
+        self._atom_ends = np.r_[self.atoms[1:], n]
+        # Position of every bar start among the atoms
+        self._pos = {rule: np.searchsorted(self.atoms, starts) for rule, (starts, _) in self.bounds.items()}
+
+    def bar_count(self, rule) -> int:
+        return len(self.bounds[rule][0])
+
+    def aggregate(self, df: pd.DataFrame, columns=None) -> dict:
+        """
+        Bars of every timeframe from one pass over ``df``.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Source bars on ``self.index`` (canonical OHLCV columns; other columns are
+            ignored unless listed in ``columns`` with a known rule).
+        columns : list of str, optional
+            Columns to aggregate (default: the OHLCV columns present).
+
+        Returns
+        -------
+        dict
+            {rule: DataFrame indexed by bar label}.
+        """
+        if len(df) != len(self.index):
+            raise ValueError("df does not match the Timeframes index")
+        if columns is None:
+            columns = [c for c in _RULES if c in df.columns]
+        if len(df) == 0:
+            return {rule: df[columns].iloc[:0] for rule in self.rules}
+
+        # Pass 1: reduce every column per atom (the only pass over the full data)
+        atoms = {c: _reduce(df[c].to_numpy(), self.atoms, _RULES[c], self._atom_ends) for c in columns}
+
+        # Pass 2: merge atoms into the bars of each timeframe
+        out = {}
+        for rule in self.rules:
+            pos = self._pos[rule]
+            ends = np.r_[pos[1:], len(self.atoms)]
+            labels = self.bounds[rule][1]
+            out[rule] = pd.DataFrame({c: _reduce(atoms[c], pos, _RULES[c], ends) for c in columns}, index=labels)
+        return out
+
+
+def resample_ohlcv(df: pd.DataFrame, rule) -> pd.DataFrame:
+    """Bars of one timeframe (``Timeframes(df.index, [rule]).aggregate(df)[rule]``)."""
+    if rule is None or rule == 1:
+        return df
+    return Timeframes(df.index, [rule]).aggregate(df)[rule]
+
+
+def bars_per_year(rule) -> float:
+    """
+    Bars per year of a timeframe built from DAILY trading bars (Sharpe annualization).
+
+    252 for daily bars, 252 / N for N-bar bars, 52 for weekly, 12 for monthly...
+    """
+    if rule is None:
+        return float(TRADING_DAYS)
+    if isinstance(rule, (int, np.integer)):
+        return TRADING_DAYS / rule
+    offset = pd.tseries.frequencies.to_offset(rule)
+    n = offset.n
+    per_year = [
+        ((pd.offsets.Day, pd.offsets.BusinessDay), TRADING_DAYS),
+        ((pd.offsets.Week,), 52),
+        ((pd.offsets.MonthEnd, pd.offsets.MonthBegin, pd.offsets.BusinessMonthEnd,
+          pd.offsets.BusinessMonthBegin), 12),
+        ((pd.offsets.QuarterEnd, pd.offsets.QuarterBegin, pd.offsets.BQuarterEnd,
+          pd.offsets.BQuarterBegin), 4),
+        ((pd.offsets.YearEnd, pd.offsets.YearBegin, pd.offsets.BYearEnd, pd.offsets.BYearBegin), 1),
+    ]
+    for types, count in per_year:
+        if isinstance(offset, types):
+            return count / n
+    raise ValueError(f"no bars-per-year convention for {rule!r}")
@@ -0,0 +1,186 @@
+"""
+Bootstrap confidence intervals for strategy metrics (Sharpe, total return, max drawdown).
+
+Resampled paths are index matrices: row r of ``resample_indices(n, reps, ...)`` lists
+which days make up replicate r. Every replicate of every series is scored at once:
+order-free metrics (Sharpe, total return) as matrix products with the day counts of
+each replicate, max drawdown as batched reductions on ``returns[:, idx]``. Nothing
+calls a backtest per replicate.
+
+Methods
+-------
+- 'iid'          : days drawn independently (destroys autocorrelation)
+- 'moving_block' : consecutive blocks of ``block`` days (Künsch)
+- 'stationary'   : blocks of random geometric length with mean ``block``, wrapping
+                   around the end of the sample (Politis & Romano)
+"""
+import numpy as np
+import pandas as pd
+
+# Max (series x replicates x days) values materialized at once (~32 MB of float64 per block)
+MAX_CHUNK_CELLS = 2 ** 22
+
+METRICS = ('sharpe', 'total_return', 'max_dd')
+
+
+def resample_indices(n: int, reps: int, method: str = 'stationary', block: int = 20, rng=None,
+                     length: int = None) -> np.ndarray:
+    """
+    (reps x length) matrix of day indices, one resampled path per row.
+
+    Parameters
+    ----------
+    n : int
+        Number of days in the original sample.
+    reps : int
+        Number of replicates.
+    method : {'iid', 'moving_block', 'stationary'}
+    block : int
+        Block length (moving_block) or mean block length (stationary).
+    rng : np.random.Generator or int, optional
+    length : int, optional
+        Days per path (default n). Only these columns are generated, so short paths
+        from a long history (or paths longer than it) cost reps x length.
+    """
+    rng = np.random.default_rng(rng)
+    length = n if length is None else int(length)
+    if method == 'iid':
+        return rng.integers(0, n, size=(reps, length))
+
+    if method == 'moving_block':
+        block = min(block, n)
+        n_blocks = -(-length // block)
+        starts = rng.integers(0, n - block + 1, size=(reps, n_blocks))
+        idx = starts[:, :, None] + np.arange(block)
+        return idx.reshape(reps, -1)[:, :length]
+
+    if method == 'stationary':
+        # A new block starts with probability 1/block (always on day 0)
+        new_block = rng.random((reps, length)) < 1.0 / block
+        new_block[:, 0] = True
+        starts = rng.integers(0, n, size=(reps, length))
+        # Column where the current block started, for every (rep, day)
+        t = np.arange(length)
+        block_start = np.maximum.accumulate(np.where(new_block, t, 0), axis=1)
+        first = np.take_along_axis(starts, block_start, axis=1)
+        return (first + (t - block_start)) % n
+
+    raise ValueError(f"unknown method {method!r} (use 'iid', 'moving_block' or 'stationary')")
+
+
+def path_metrics(returns: np.ndarray) -> dict:
+    """
+    Sharpe, total return and max drawdown of return paths along the last axis.
+
+    Same definitions as ``backtest_ma_crossover``: Sharpe = sqrt(252) * mean / std
+    (ddof=0), equity = cumprod(1 + r), drawdown relative to the running peak.
+    """
+    equity = np.cumprod(1 + returns, axis=-1)
+    peak = np.maximum.accumulate(equity, axis=-1)
+    return {
+        'sharpe': np.sqrt(252) * returns.mean(axis=-1) / (returns.std(axis=-1) + 1e-12),
+        'total_return': equity[..., -1] - 1,
+        'max_dd': (equity / peak - 1.0).min(axis=-1),
+    }
+
+
+def _resampled_metrics(r: np.ndarray, r2: np.ndarray, log_r: np.ndarray, idx: np.ndarray) -> dict:
+    """
+    ``path_metrics`` of the paths r[:, idx], computed with as few passes as possible.
+
+    - Sharpe and total return only depend on HOW MANY times each day is drawn, not
+      on the order: with counts[rep, day], the sums over every path of every series
+      are matrix products (r @ counts.T), done by BLAS.
+    - Max drawdown needs the path. It is computed in log space on the gathered
+      log returns: log equity = cumsum(log(1 + r)), drawdown = expm1(log equity -
+      running max), all in place on one (series x reps x days) block.
+    """
+    reps, n = idx.shape
+    flat = (np.arange(reps)[:, None] * n + idx).ravel()
+    counts = np.bincount(flat, minlength=reps * n).reshape(reps, n).astype(float)
+
+    mean = (r @ counts.T) / n                        # (series x reps)
+    var = np.maximum((r2 @ counts.T) / n - mean ** 2, 0.0)
+    total = np.expm1(log_r @ counts.T)
+
+    lg = log_r[:, idx]                               # (series x reps x days)
+    np.cumsum(lg, axis=-1, out=lg)
+    peak = np.maximum.accumulate(lg, axis=-1)
+    np.subtract(lg, peak, out=peak)
+    max_dd = np.expm1(np.minimum(peak.min(axis=-1), 0.0))
+
+    return {
+        'sharpe': np.sqrt(252) * mean / (np.sqrt(var) + 1e-12),
+        'total_return': total,
+        'max_dd': max_dd,
+    }
+
+
+def bootstrap_distribution(returns, reps: int = 1000, method: str = 'stationary', block: int = 20,
+                           seed=None) -> dict:
+    """
+    Bootstrap replicates of every metric.
+
+    ``returns`` is (n,) or (series x n). All series share the same resampled days
+    (paired bootstrap), so differences between series are resampled consistently.
+
+    Returns {metric: array (series x reps)} (or (reps,) for a single series).
+    """
+    r = np.asarray(returns, dtype=float)
+    single = r.ndim == 1
+    r = np.atleast_2d(r)
+    s, n = r.shape
+    r2 = r * r
+    log_r = np.log1p(r)
+    rng = np.random.default_rng(seed)
+
+    out = {m: np.empty((s, reps)) for m in METRICS}
+    step = max(1, MAX_CHUNK_CELLS // (s * n))
+    for start in range(0, reps, step):
+        stop = min(start + step, reps)
+        idx = resample_indices(n, stop - start, method, block, rng)
+        for name, v in _resampled_metrics(r, r2, log_r, idx).items():
+            out[name][:, start:stop] = v
+
+    if single:
+        out = {k: v[0] for k, v in out.items()}
+    return out
+
+
+def bootstrap_metrics(returns, reps: int = 1000, method: str = 'stationary', block: int = 20,
+                      alpha: float = 0.05, seed=None, index=None) -> pd.DataFrame:
+    """
+    Point estimates and percentile confidence intervals of Sharpe, total return and max drawdown.
+
+    Parameters
+    ----------
+    returns : array-like
+        (n,) daily strategy returns, or (series x n) for many strategies at once.
+    reps : int
+        Number of bootstrap replicates.
+    method : {'iid', 'moving_block', 'stationary'}
+        See module docstring. Block methods keep the return autocorrelation.
+    block : int
+        (Mean) block length in days.
+    alpha : float
+        1 - confidence level (0.05 => 95% intervals).
+    seed : int, optional
+    index : optional
+        Row labels of the result (one per series).
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns: sharpe, sharpe_lo, sharpe_hi, total_return, ..., max_dd_hi.
+    """
+    r = np.atleast_2d(np.asarray(returns, dtype=float))
+    point = path_metrics(r)
+    dist = bootstrap_distribution(r, reps, method, block, seed)
+
+    cols = {}
+    for m in METRICS:
+        lo, hi = np.quantile(dist[m], [alpha / 2, 1 - alpha / 2], axis=1)
+        cols[m] = point[m]
+        cols[f'{m}_lo'] = lo
+        cols[f'{m}_hi'] = hi
+    return pd.DataFrame(cols, index=index)
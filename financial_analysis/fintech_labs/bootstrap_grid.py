@@ -0,0 +1,57 @@
+"""
+Bootstrap confidence intervals for MA crossover backtests and parameter grids.
+"""
+import numpy as np
+import pandas as pd
+
+from .backtest import grid_search, grid_strategy_returns
+from .bootstrap import bootstrap_metrics
+
+
+def bootstrap_backtest(df: pd.DataFrame, fast: int, slow: int, fee_bps: float = 0.0, reps: int = 1000,
+                       method: str = 'stationary', block: int = 20, alpha: float = 0.05, seed=None) -> pd.Series:
+    """
+    ``backtest_ma_crossover`` metrics with bootstrap confidence intervals.
+
+    Returns a Series: sharpe, sharpe_lo, sharpe_hi, total_return, ..., max_dd_hi.
+    The point estimates are the ones ``backtest_ma_crossover`` reports.
+    """
+    res = bootstrap_grid(df, [fast], [slow], fee_bps, reps, method, block, alpha, seed)
+    return res.iloc[0]
+
+
+def bootstrap_grid(df: pd.DataFrame, fast_list, slow_list, fee_bps: float = 0.0, reps: int = 1000,
+                   method: str = 'stationary', block: int = 20, alpha: float = 0.05, seed=None) -> pd.DataFrame:
+    """
+    ``grid_search`` table with confidence intervals for Sharpe, total return and max drawdown.
+
+    The daily strategy returns of all pairs come from one matrix
+    (``grid_strategy_returns``). Pairs with the same slow window share the same
+    backtest window, so they are resampled together with the same index matrix
+    (paired bootstrap) and scored in one vectorized batch.
+
+    Extra columns
+    -------------
+    <metric>_lo, <metric>_hi : percentile interval at level 1 - alpha
+    indistinguishable : True if the pair's Sharpe interval overlaps the interval of
+        the best pair (first row), i.e. the data cannot tell them apart.
+
+    Rows are in ``grid_search`` order (Sharpe, then total return).
+    """
+    table = grid_search(df, fast_list, slow_list, fee_bps=fee_bps)
+    pairs, strat_ret = grid_strategy_returns(df, fast_list, slow_list, fee_bps=fee_bps)
+    rng = np.random.default_rng(seed)
+
+    parts = []
+    for start, group in pairs.groupby('start', sort=False):
+        rows = group.index.to_numpy()
+        ci = bootstrap_metrics(strat_ret[rows, start:], reps=reps, method=method, block=block,
+                               alpha=alpha, seed=rng, index=rows)
+        parts.append(ci.drop(columns=['sharpe', 'total_return', 'max_dd']))
+    ci = pd.concat(parts).sort_index()
+
+    # grid_search rows are indexed by the pair's position in the grid loops
+    res = table.join(ci)
+    best = res.iloc[0]
+    res['indistinguishable'] = (res['sharpe_hi'] >= best['sharpe_lo']) & (res['sharpe_lo'] <= best['sharpe_hi'])
+    return res
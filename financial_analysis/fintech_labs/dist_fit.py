@@ -0,0 +1,239 @@
+"""
+Parametric vs empirical fits of return distributions, with a fit cache.
+
+Candidates (``scipy.stats`` families, parameters in scipy's order):
+
+- 'norm'     : (loc, scale), sample mean and std with ddof=1 (as the scripts'
+               ``norm(mu, sigma)``; the MLE scale would use ddof=0)
+- 't'        : (df, loc, scale), Student-t MLE started from the moment estimates
+- 'skewnorm' : (a, loc, scale), skew-normal MLE
+
+For every (series, candidate) ``fit_distributions`` reports the log-likelihood,
+AIC/BIC, the Kolmogorov-Smirnov distance to the empirical CDF and, for each tail
+threshold, the model probability P(X < threshold) next to the empirical one (the
+``P(X < -0.05)`` check of distribution_of_log_return_tests.py).
+
+Fitting a t or skew-normal is an iterative optimization, so fitted parameters are
+cached by a fingerprint of the data (hash of the values) and the candidate name:
+refitting identical series is a dict lookup, and a ``FitCache`` with a path is kept
+on disk between runs. Cache misses can be fitted in parallel processes.
+
+Example::
+
+    fits = fit_distributions({'microsoft': r_ms, 'apple': r_aapl}, workers=2,
+                             cache=FitCache(DATA_DIR / '.cache' / 'fits.json'))
+    fits.loc['microsoft'].sort_values('aic')
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .ecdf import EmpiricalCDF
+
+CANDIDATES = ('norm', 't', 'skewnorm')
+
+# Left-tail thresholds compared by default (daily log returns)
+TAIL_THRESHOLDS = (-0.05, -0.03)
+
+# Bump when a candidate's fitting procedure changes so old cached fits are ignored
+FIT_VERSION = 2
+
+
+def _clean(values) -> np.ndarray:
+    x = np.asarray(values, dtype=float).ravel()
+    return x[~np.isnan(x)]
+
+
+def fingerprint(values) -> str:
+    """Hash of the (NaN-free) sample: identical data -> identical key."""
+    x = np.ascontiguousarray(_clean(values))
+    return hashlib.sha1(x.tobytes()).hexdigest()
+
+
+def fit_params(values, dist: str) -> tuple:
+    """
+    Fitted parameters of one candidate, in scipy's argument order.
+
+    't' and 'skewnorm' are maximum likelihood fits; 'norm' is the exception: its
+    scale is the sample std with ddof=1 (the MLE would use ddof=0).
+    """
+    from scipy import stats
+
+    x = _clean(values)
+    if dist == 'norm':
+        return float(x.mean()), float(x.std(ddof=1))
+    if dist == 't':
+        # Start from the method of moments: excess kurtosis K = 6 / (df - 4)
+        k = stats.kurtosis(x)
+        df0 = 4.0 + 6.0 / k if k > 0 else 30.0
+        scale0 = x.std() * np.sqrt(max(df0 - 2.0, 0.1) / df0)
+        return tuple(float(p) for p in stats.t.fit(x, df0, loc=np.median(x), scale=scale0))
+    if dist == 'skewnorm':
+        return tuple(float(p) for p in stats.skewnorm.fit(x))
+    raise ValueError(f"unknown distribution {dist!r} (use one of {CANDIDATES})")
+
+
+def frozen(dist: str, params):
+    """The fitted scipy distribution: frozen('t', params).pdf(x)."""
+    from scipy import stats
+
+    return getattr(stats, dist)(*params)
+
+
+def pdf_grid(dist: str, params, lo: float, hi: float, points: int = 500) -> pd.DataFrame:
+    """x, pdf and cdf of a fitted candidate on an evenly spaced grid (for plots)."""
+    x = np.linspace(lo, hi, points)
+    f = frozen(dist, params)
+    return pd.DataFrame({'x': x, 'pdf': f.pdf(x), 'cdf': f.cdf(x)})
+
+
+class FitCache:
+    """
+    Fitted parameters keyed by (data fingerprint, candidate).
+
+    Parameters
+    ----------
+    path : str or Path, optional
+        JSON file to load from and ``save`` to. Without a path the cache only
+        lives in memory.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path is not None else None
+        self._params = {}
+        self.hits = 0
+        self.misses = 0
+        if self.path is not None:
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if data.get('version') == FIT_VERSION:
+                self._params = {k: tuple(v) for k, v in data.get('params', {}).items()}
+
+    @staticmethod
+    def key(fp: str, dist: str) -> str:
+        return f'{dist}:{fp}'
+
+    def get(self, fp: str, dist: str):
+        params = self._params.get(self.key(fp, dist))
+        if params is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return params
+
+    def put(self, fp: str, dist: str, params):
+        self._params[self.key(fp, dist)] = tuple(params)
+
+    def save(self):
+        """Write the cache atomically (no-op without a path)."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({'version': FIT_VERSION, 'params': self._params}, f)
+        os.replace(tmp, self.path)
+
+    def __len__(self):
+        return len(self._params)
+
+
+def _fit_job(args):
+    values, dist = args
+    return fit_params(values, dist)
+
+
+def _scores(x: np.ndarray, ecdf: EmpiricalCDF, dist: str, params, thresholds) -> dict:
+    """Goodness of fit and tail divergence of one fitted candidate."""
+    f = frozen(dist, params)
+    n = len(x)
+    loglik = float(f.logpdf(x).sum())
+    k = len(params)
+    # KS distance: largest gap between the model CDF and the ECDF steps
+    model = f.cdf(ecdf.sorted)
+    i = np.arange(1, n + 1)
+    ks = float(max((i / n - model).max(), (model - (i - 1) / n).max()))
+    row = {'params': tuple(params), 'loglik': loglik, 'aic': 2 * k - 2 * loglik,
+           'bic': k * np.log(n) - 2 * loglik, 'ks': ks}
+    for thr in thresholds:
+        p_emp = float(ecdf.tail_prob(thr))
+        p_model = float(f.cdf(thr))
+        row[f'P(X<{thr:g})'] = p_model
+        row[f'P(X<{thr:g})_emp'] = p_emp
+    return row
+
+
+def fit_distributions(series, dists=CANDIDATES, thresholds=TAIL_THRESHOLDS, cache: FitCache = None,
+                      workers: int = 1) -> pd.DataFrame:
+    """
+    Fit every candidate to every series and compare it with the empirical distribution.
+
+    Parameters
+    ----------
+    series : dict, pd.Series, pd.DataFrame or array-like
+        {name: returns}, one Series, a DataFrame (one column per series) or a
+        (series x observations) array. NaNs are dropped per series.
+    dists : iterable of str
+        Candidates among ('norm', 't', 'skewnorm').
+    thresholds : iterable of float
+        Left-tail thresholds for the P(X < threshold) comparison.
+    cache : FitCache, optional
+        Reused fitted parameters; new fits are added (and saved if it has a path).
+    workers : int or None
+        Processes used for the fits that are not cached (None = all cores).
+
+    Returns
+    -------
+    pd.DataFrame
+        Indexed by (series, dist): params, loglik, aic, bic, ks and, per threshold,
+        the model and empirical tail probabilities.
+    """
+    if isinstance(series, pd.Series):
+        series = {series.name: series}
+    elif isinstance(series, pd.DataFrame):
+        series = {c: series[c] for c in series.columns}
+    elif not isinstance(series, dict):
+        series = dict(enumerate(np.atleast_2d(np.asarray(series, dtype=float))))
+    cache = cache if cache is not None else FitCache()
+
+    data = {name: _clean(v) for name, v in series.items()}
+    fps = {name: fingerprint(x) for name, x in data.items()}
+
+    params = {}
+    todo = []
+    for name, x in data.items():
+        for dist in dists:
+            p = cache.get(fps[name], dist)
+            if p is None:
+                todo.append((name, dist))
+            else:
+                params[name, dist] = p
+
+    jobs = [(data[name], dist) for name, dist in todo]
+    if workers == 1 or len(jobs) <= 1:
+        fitted = [_fit_job(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            fitted = list(ex.map(_fit_job, jobs))
+    for (name, dist), p in zip(todo, fitted):
+        params[name, dist] = p
+        cache.put(fps[name], dist, p)
+    if todo:
+        cache.save()
+
+    rows = {}
+    for name, x in data.items():
+        ecdf = EmpiricalCDF(x)
+        for dist in dists:
+            rows[name, dist] = _scores(x, ecdf, dist, params[name, dist], thresholds)
+    out = pd.DataFrame.from_dict(rows, orient='index')
+    out.index = out.index.set_names(['series', 'dist'])
+    return out
@@ -0,0 +1,136 @@
+"""
+Empirical CDF / quantile index of a return distribution.
+
+The returns are sorted ONCE (plus one prefix sum); after that every question is a
+``searchsorted`` (O(log n)) or an O(1) lookup instead of a full scan like
+``np.mean(r < -0.05)``. All queries accept scalars or arrays, so thousands of
+thresholds are answered in one vectorized call.
+
+Example::
+
+    idx = EmpiricalCDF(log_returns)
+    idx.tail_prob(-0.05)                 # P(X < -0.05), same as np.mean(r < -0.05)
+    idx.tail_prob(np.linspace(-0.1, 0, 1000))
+    idx.quantile([0.01, 0.5, 0.99])      # same as np.quantile (linear interpolation)
+    idx.var(0.05), idx.cvar(0.05)        # historical VaR / expected shortfall (as losses)
+    all_tickers = EmpiricalCDF.merge([idx_msft, idx_aapl])   # pooled distribution
+"""
+import numpy as np
+
+
+def _merge_sorted(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Merge two sorted arrays in O(len(a) + len(b) log len(a)) without re-sorting."""
+    if len(a) < len(b):
+        a, b = b, a
+    out = np.empty(len(a) + len(b))
+    pos = np.searchsorted(a, b, side='right') + np.arange(len(b))
+    mask = np.zeros(len(out), dtype=bool)
+    mask[pos] = True
+    out[pos] = b
+    out[~mask] = a
+    return out
+
+
+class EmpiricalCDF:
+    """
+    Sorted-sample index answering tail probabilities, quantiles, VaR and CVaR.
+
+    Parameters
+    ----------
+    values : array-like
+        Sample (e.g. daily log returns). NaNs are dropped.
+    presorted : bool
+        Skip the sort when ``values`` is already ascending (and NaN-free).
+    """
+
+    def __init__(self, values, presorted: bool = False):
+        x = np.asarray(values, dtype=float).ravel()
+        if not presorted:
+            x = np.sort(x[~np.isnan(x)])
+        if len(x) == 0:
+            raise ValueError("EmpiricalCDF needs at least one non-NaN value")
+        self.sorted = x
+        # prefix[k] = sum of the k smallest values (for CVaR in O(1))
+        self._prefix = np.concatenate(([0.0], np.cumsum(x)))
+
+    @property
+    def n(self) -> int:
+        return len(self.sorted)
+
+    def __len__(self):
+        return self.n
+
+    def __repr__(self):
+        return f"EmpiricalCDF(n={self.n}, min={self.sorted[0]:.6g}, max={self.sorted[-1]:.6g})"
+
+    # -------------------------
+    # Probabilities
+    # -------------------------
+
+    def cdf(self, x):
+        """P(X <= x)."""
+        return np.searchsorted(self.sorted, x, side='right') / self.n
+
+    def tail_prob(self, x):
+        """P(X < x): the left-tail probability (strict, like ``np.mean(r < x)``)."""
+        return np.searchsorted(self.sorted, x, side='left') / self.n
+
+    def sf(self, x):
+        """P(X > x): the right-tail probability."""
+        return 1.0 - self.cdf(x)
+
+    def steps(self):
+        """(x, F(x)) points of the ECDF step function, ready to plot."""
+        return self.sorted, np.arange(1, self.n + 1) / self.n
+
+    # -------------------------
+    # Quantiles and risk
+    # -------------------------
+
+    def quantile(self, q):
+        """Quantiles with linear interpolation, same as ``np.quantile(values, q)``."""
+        q = np.asarray(q, dtype=float)
+        if np.any((q < 0) | (q > 1)):
+            raise ValueError("quantiles must be in [0, 1]")
+        pos = q * (self.n - 1)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, self.n - 1)
+        frac = pos - lo
+        return self.sorted[lo] + frac * (self.sorted[hi] - self.sorted[lo])
+
+    def var(self, alpha=0.05):
+        """Historical Value at Risk at level ``alpha``, as a positive loss: -quantile(alpha)."""
+        return -self.quantile(alpha)
+
+    def cvar(self, alpha=0.05):
+        """
+        Expected shortfall at level ``alpha``, as a positive loss.
+
+        Minus the mean of the observations at or below the ``alpha`` quantile.
+        """
+        k = np.maximum(np.searchsorted(self.sorted, self.quantile(alpha), side='right'), 1)
+        return -self._prefix[k] / k
+
+    # -------------------------
+    # Combining samples
+    # -------------------------
+
+    @classmethod
+    def merge(cls, indexes) -> "EmpiricalCDF":
+        """
+        Pooled index of several samples (tickers, time windows...).
+
+        The sorted arrays are merged pairwise, smallest first, without re-sorting
+        the pooled sample.
+        """
+        arrays = sorted((ix.sorted for ix in indexes), key=len)
+        if not arrays:
+            raise ValueError("nothing to merge")
+        while len(arrays) > 1:
+            merged = _merge_sorted(arrays.pop(0), arrays.pop(0))
+            arrays.append(merged)
+            arrays.sort(key=len)
+        return cls(arrays[0], presorted=True)
+
+    def __or__(self, other: "EmpiricalCDF") -> "EmpiricalCDF":
+        return EmpiricalCDF.merge([self, other])
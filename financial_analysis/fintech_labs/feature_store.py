@@ -0,0 +1,169 @@
+"""
+In-process feature store: lazy, memoized derived columns with a memory-bounded LRU.
+
+Features (the ``Feature`` objects of ``fintech_labs.features``) are computed the first
+time they are asked for and kept in memory, keyed by
+
+    (ticker, feature key (name + parameters), source-file fingerprint)
+
+so ``sma(Close, 30)`` for microsoft is built once per session and shared by
+``backtest_ma_crossover``, ``grid_search`` and the distribution scripts. Intermediates
+go through the store too (LogReturn reuses the cached log(Close)). When the CSV
+changes on disk (mtime/size) its entries simply stop matching.
+
+Example::
+
+    store = default_store()
+    ma30 = store.get('microsoft', sma(30))       # miss: computed
+    ma30 = store.get('microsoft', sma(30))       # hit
+    store.stats()                                # {'hits': 1, 'misses': 1, ...}
+"""
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .features import Feature, sma
+from .market_data import data_path, load_ohlcv_arrays, source_fingerprint
+
+
+def _freeze(fp: dict) -> tuple:
+    return tuple(sorted(fp.items()))
+
+
+class FeatureStore:
+    """
+    Memory-bounded LRU of computed features.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Upper bound on the memory held by cached feature arrays (default 256 MB).
+        Least recently used entries are evicted first. Raw price columns are
+        memory-mapped from the loader cache and do not count.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 ** 2):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()       # (ticker, feature key, fingerprint) -> np.ndarray
+        self._bytes = 0
+        self._sources = {}                  # ticker -> (fingerprint, arrays)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # -------------------------
+    # Sources
+    # -------------------------
+
+    @staticmethod
+    def _path(ticker) -> Path:
+        """'microsoft' -> data/microsoft.csv; paths are used as given."""
+        s = str(ticker)
+        if s.endswith('.csv') or '/' in s or '\\' in s:
+            return Path(s)
+        return data_path(s)
+
+    def _source(self, ticker):
+        """(fingerprint, canonical arrays) of the ticker's current file."""
+        path = self._path(ticker)
+        fp = _freeze(source_fingerprint(path))
+        cached = self._sources.get(ticker)
+        if cached is None or cached[0] != fp:
+            cached = (fp, load_ohlcv_arrays(path))
+            self._sources[ticker] = cached
+        return cached
+
+    def dates(self, ticker) -> pd.DatetimeIndex:
+        """Date index of the ticker's canonical frame."""
+        return pd.DatetimeIndex(self._source(ticker)[1]['Date'], name='Date')
+
+    # -------------------------
+    # Lookup
+    # -------------------------
+
+    def get(self, ticker, feature: Feature) -> np.ndarray:
+        """
+        Values of ``feature`` for ``ticker`` over its whole history (computed on first access).
+
+        The returned array is shared with the cache: treat it as read-only.
+        """
+        fp, arrays = self._source(ticker)
+        return self._value(ticker, fp, arrays, feature)
+
+    def _value(self, ticker, fp, arrays, dep):
+        if isinstance(dep, str):                       # raw column of the source file
+            return np.asarray(arrays[dep], dtype=float)
+
+        key = (ticker, dep.key, fp)
+        hit = self._entries.get(key)
+        if hit is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return hit
+
+        self.misses += 1
+        value = dep.fn(*[self._value(ticker, fp, arrays, d) for d in dep.deps])
+        value.setflags(write=False)
+        self._entries[key] = value
+        self._bytes += value.nbytes
+        self._evict()
+        return value
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, old = self._entries.popitem(last=False)
+            self._bytes -= old.nbytes
+            self.evictions += 1
+
+    def series(self, ticker, feature: Feature) -> pd.Series:
+        """``get`` as a Series indexed by date and named after the feature."""
+        return pd.Series(self.get(ticker, feature), index=self.dates(ticker), name=feature.name)
+
+    def rolling_mean(self, ticker, window: int, index=None, col: str = 'Close') -> np.ndarray:
+        """
+        ``rolling(window).mean()`` of ``col`` evaluated on the rows in ``index``.
+
+        ``index`` must be a contiguous date range of the ticker (e.g. ``ms.loc['2015']``).
+        The first window-1 rows come back as NaN, exactly as if rolling() had been
+        called on that slice, so results match the un-cached code path.
+        """
+        full = self.get(ticker, sma(window, col))
+        if index is None:
+            return full
+        rows = self.dates(ticker).get_indexer(pd.DatetimeIndex(index))
+        if len(rows) and ((rows < 0).any() or (np.diff(rows) != 1).any()):
+            raise ValueError(f"index is not a contiguous slice of {ticker}'s dates")
+        out = full[rows].copy()
+        out[:window - 1] = np.nan
+        return out
+
+    # -------------------------
+    # Housekeeping
+    # -------------------------
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+        }
+
+    def clear(self):
+        self._entries.clear()
+        self._sources.clear()
+        self._bytes = 0
+
+
+_default = None
+
+
+def default_store() -> FeatureStore:
+    """Process-wide store shared by scripts and notebooks in the same session."""
+    global _default
+    if _default is None:
+        _default = FeatureStore()
+    return _default
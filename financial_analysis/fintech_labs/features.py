@@ -0,0 +1,189 @@
+"""
+Declarative feature pipeline: PriceDiff, Return, LogReturn, Direction, MA-n, Shares, Profit, wealth.
+
+Each feature says which inputs it needs (raw columns like 'Close' or other features)
+and how to compute itself with NumPy. The pipeline evaluates them in dependency order,
+computes every intermediate ONCE (e.g. one log(Close) for all log-return features,
+one next-day close for PriceDiff, Return and Profit) and adds all columns in one go.
+
+Example (what microsoft_features.py does)::
+
+    pipe = FeaturePipeline([
+        price_diff(), simple_return(), direction(),
+        sma(30).named('ma30'), sma(60).named('ma60'), sma(120).named('ma120'),
+    ])
+    ms = pipe.run(ms)
+"""
+import numpy as np
+import pandas as pd
+
+from .profiling import profiled, stage
+
+
+class Feature:
+    """
+    One derived column.
+
+    key  : identity of the computation, e.g. ('sma', 30). Two features with the same
+           key are computed once, whatever their column names.
+    deps : inputs, either raw column names ('Close') or other Feature objects.
+    fn   : fn(*dep_arrays) -> np.ndarray
+    name : output column name.
+    """
+
+    def __init__(self, key, deps, fn, name):
+        self.key = key
+        self.deps = tuple(deps)
+        self.fn = fn
+        self.name = name
+
+    def named(self, name: str) -> 'Feature':
+        """Same computation, different output column name."""
+        return Feature(self.key, self.deps, self.fn, name)
+
+    def __repr__(self):
+        return f"Feature({self.name!r}, key={self.key!r})"
+
+
+# -------------------------
+# NumPy building blocks
+# -------------------------
+
+def _shift_back(x: np.ndarray) -> np.ndarray:
+    """x[t+1] at position t (like Series.shift(-1)); last value is NaN."""
+    out = np.empty_like(x, dtype=float)
+    out[:-1] = x[1:]
+    out[-1:] = np.nan
+    return out
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Simple moving average from cumulative sums (first window-1 values are NaN).
+
+    NaN-aware like ``Series.rolling(window).mean()``: a window holding a NaN is
+    NaN, and the windows after it are not affected.
+    """
+    x = np.asarray(x, dtype=float)
+    out = np.full(x.size, np.nan)
+    valid = ~np.isnan(x)
+    if window > x.size or not valid.any():
+        return out
+    base = x[valid.argmax()]                      # centre the prices to keep the sums small
+    csum = np.empty(x.size + 1)
+    csum[0] = 0.0
+    np.nancumsum(x - base, out=csum[1:])
+    count = np.empty(x.size + 1, dtype=np.int64)
+    count[0] = 0
+    np.cumsum(valid, out=count[1:])
+    full = count[window:] - count[:-window] == window
+    out[window - 1:] = np.where(full, (csum[window:] - csum[:-window]) / window + base, np.nan)
+    return out
+
+
+def _cumsum_skipna(x: np.ndarray) -> np.ndarray:
+    """Cumulative sum that skips NaNs but keeps them in place (like Series.cumsum)."""
+    out = np.nancumsum(x)
+    out[np.isnan(x)] = np.nan
+    return out
+
+
+# -------------------------
+# Built-in features
+# -------------------------
+
+def next_close(col: str = 'Close') -> Feature:
+    """Tomorrow's close at today's row (Close1 in baseline_strategy.py)."""
+    return Feature(('next', col), [col], _shift_back, 'Close1')
+
+
+def log_close(col: str = 'Close') -> Feature:
+    """log(Close); shared by every log-return feature."""
+    return Feature(('log', col), [col], np.log, 'LogClose')
+
+
+def price_diff(col: str = 'Close') -> Feature:
+    """PriceDiff[t] = Close[t+1] - Close[t]."""
+    return Feature(('price_diff', col), [next_close(col), col], np.subtract, 'PriceDiff')
+
+
+def simple_return(col: str = 'Close') -> Feature:
+    """Return[t] = PriceDiff[t] / Close[t]."""
+    return Feature(('return', col), [price_diff(col), col], np.divide, 'Return')
+
+
+def log_return(col: str = 'Close') -> Feature:
+    """LogReturn[t] = log(Close[t+1]) - log(Close[t])."""
+    lc = log_close(col)
+    return Feature(('log_return', col), [lc], lambda x: _shift_back(x) - x, 'LogReturn')
+
+
+def direction(col: str = 'Close') -> Feature:
+    """Direction[t] = 1 if tomorrow's close is higher, else 0 (NaN counts as 0)."""
+    return Feature(('direction', col), [price_diff(col)], lambda d: (d > 0).astype(np.int64), 'Direction')
+
+
+def sma(window: int, col: str = 'Close') -> Feature:
+    """Simple moving average of ``col`` over ``window`` rows (column 'MA<window>')."""
+    return Feature(('sma', col, window), [col], lambda x: rolling_mean(x, window), f'MA{window}')
+
+
+def shares(fast: Feature, slow: Feature) -> Feature:
+    """Shares[t] = 1 if the fast MA is above the slow MA, else 0."""
+    return Feature(('shares', fast.key, slow.key), [fast, slow],
+                   lambda f, s: (f > s).astype(np.int64), 'Shares')
+
+
+def profit(held: Feature, col: str = 'Close') -> Feature:
+    """Profit[t] = Close[t+1] - Close[t] when holding one share, else 0."""
+    return Feature(('profit', held.key, col), [held, next_close(col), col],
+                   lambda h, nxt, c: np.where(h == 1, nxt - c, 0.0), 'Profit')
+
+
+def wealth(pnl: Feature) -> Feature:
+    """Accumulated P&L (cumsum of Profit)."""
+    return Feature(('wealth', pnl.key), [pnl], _cumsum_skipna, 'wealth')
+
+
+# -------------------------
+# Pipeline
+# -------------------------
+
+class FeaturePipeline:
+    """
+    Ordered list of features to add to a price DataFrame.
+
+    Only the requested features become columns; their inputs are computed as
+    needed and shared by key.
+    """
+
+    def __init__(self, features):
+        self.features = list(features)
+
+    @profiled('features')
+    def compute(self, df: pd.DataFrame) -> dict:
+        """Return {column name: np.ndarray} for the requested features."""
+        done = {}                              # key -> array (shared intermediates)
+
+        def value(dep):
+            if isinstance(dep, str):           # raw input column (converted once)
+                if ('column', dep) not in done:
+                    done[('column', dep)] = df[dep].to_numpy(dtype=float)
+                return done[('column', dep)]
+            if dep.key not in done:
+                args = [value(d) for d in dep.deps]
+                with stage(dep.key[0]):
+                    done[dep.key] = dep.fn(*args)
+            return done[dep.key]
+
+        return {f.name: value(f) for f in self.features}
+
+    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Copy of ``df`` with every feature column added in one step (existing names are replaced)."""
+        return df.assign(**self.compute(df))
+
+    def to_csv(self, df: pd.DataFrame, path) -> pd.DataFrame:
+        """Compute the features, write them to ``path`` and return the frame."""
+        out = self.run(df)
+        out.to_csv(path)
+        return out
@@ -0,0 +1,150 @@
+"""
+Multi-horizon tail probabilities and VaR, for many instruments at once.
+
+distribution_of_log_return_tests.py scales the daily log-return parameters to one
+year (mu * 252, sigma * sqrt(252)) and calls ``norm.cdf`` once. Here every
+(instrument x horizon x threshold) combination is computed in one call:
+
+- Normal path (closed form): X_h ~ N(mu * h, sigma * sqrt(h)), evaluated with the
+  ``scipy.special`` ufuncs over broadcast arrays (scipy is imported on first use).
+- Monte Carlo path (non-normal): h-day log returns are sums of resampled daily log
+  returns (iid or stationary block bootstrap), simulated for all horizons from the
+  same paths, then read off with sorted-sample lookups.
+
+Horizons are in trading days and thresholds are on h-day LOG returns (-0.40 means
+the price falls to exp(-0.40) = 67% of its value). VaR is reported as a positive
+loss, like ``EmpiricalCDF.var``.
+
+Example::
+
+    mu, sigma = daily_moments(returns)                   # (instruments,)
+    p = normal_tail_prob(mu, sigma, HORIZONS, [-0.1, -0.2, -0.4])
+    cube_frame(p, tickers, HORIZONS, [-0.1, -0.2, -0.4])
+"""
+import numpy as np
+import pandas as pd
+
+from .bootstrap import resample_indices
+
+# 1 day, 1 week, 1 month, 1 quarter, 6 months, 1 year (trading days)
+HORIZONS = (1, 5, 21, 63, 126, 252)
+
+# Max (paths x days) values simulated at once per instrument (~32 MB of float64)
+MAX_CHUNK_CELLS = 2 ** 22
+
+
+def _as_rows(returns) -> list:
+    """List of NaN-free 1-D arrays from an array, a (k x n) matrix, a dict or a list."""
+    if isinstance(returns, dict):
+        returns = list(returns.values())
+    elif isinstance(returns, (pd.Series, np.ndarray)) and np.ndim(returns) == 1:
+        returns = [returns]
+    elif isinstance(returns, pd.DataFrame):
+        returns = [returns[c] for c in returns.columns]
+    rows = [np.asarray(r, dtype=float).ravel() for r in returns]
+    return [r[~np.isnan(r)] for r in rows]
+
+
+def daily_moments(returns):
+    """(mu, sigma) per instrument: mean and sample std (ddof=1) of daily log returns."""
+    rows = _as_rows(returns)
+    return (np.array([r.mean() for r in rows]),
+            np.array([r.std(ddof=1) for r in rows]))
+
+
+def _grid(mu, sigma, horizons):
+    """Broadcast to (instrument x horizon) mean and std of the h-day log return."""
+    mu = np.atleast_1d(np.asarray(mu, dtype=float))[:, None]
+    sigma = np.atleast_1d(np.asarray(sigma, dtype=float))[:, None]
+    h = np.asarray(horizons, dtype=float)[None, :]
+    return mu * h, sigma * np.sqrt(h)
+
+
+def normal_tail_prob(mu, sigma, horizons=HORIZONS, thresholds=(-0.05, -0.10, -0.20, -0.40)) -> np.ndarray:
+    """
+    P(X_h < threshold) under the Normal model, shape (instrument x horizon x threshold).
+
+    ``mu`` and ``sigma`` are the DAILY parameters, scalars or one per instrument.
+    """
+    from scipy import special
+
+    m, s = _grid(mu, sigma, horizons)
+    thr = np.asarray(thresholds, dtype=float)
+    return special.ndtr((thr[None, None, :] - m[..., None]) / s[..., None])
+
+
+def normal_var(mu, sigma, horizons=HORIZONS, alphas=(0.05, 0.01)) -> np.ndarray:
+    """h-day Value at Risk under the Normal model, shape (instrument x horizon x alpha)."""
+    from scipy import special
+
+    m, s = _grid(mu, sigma, horizons)
+    z = special.ndtri(np.asarray(alphas, dtype=float))
+    return -(m[..., None] + s[..., None] * z[None, None, :])
+
+
+def simulate_horizons(returns, horizons=HORIZONS, paths: int = 10_000, method: str = 'iid', block: int = 20,
+                      seed=None) -> np.ndarray:
+    """
+    Monte Carlo h-day log returns by resampling each instrument's daily log returns.
+
+    Parameters
+    ----------
+    returns : array-like, (k x n) matrix, dict or list of arrays
+        Daily log returns per instrument (lengths may differ; NaNs are dropped).
+    horizons : sequence of int
+        Horizons in trading days.
+    paths : int
+        Simulated paths per instrument.
+    method : {'iid', 'moving_block', 'stationary'}
+        Resampling scheme (see ``fintech_labs.bootstrap``). Block methods keep
+        volatility clustering, which fattens the multi-day tails.
+    block : int
+        (Mean) block length for the block methods.
+    seed : int or np.random.Generator, optional
+
+    Returns
+    -------
+    np.ndarray
+        (instrument x horizon x paths). All horizons of a path share the same days,
+        as in a real price path.
+    """
+    rows = _as_rows(returns)
+    h = np.asarray(horizons, dtype=np.int64)
+    days = int(h.max())
+    rng = np.random.default_rng(seed)
+
+    out = np.empty((len(rows), len(h), paths))
+    step = max(1, MAX_CHUNK_CELLS // days)
+    for i, r in enumerate(rows):
+        for start in range(0, paths, step):
+            stop = min(start + step, paths)
+            # Only the `days` columns the horizons need, whatever the history length
+            idx = resample_indices(len(r), stop - start, method, block, rng, length=days)
+            cum = np.cumsum(r[idx], axis=1)
+            out[i, :, start:stop] = cum[:, h - 1].T
+    return out
+
+
+def empirical_tail_prob(sims: np.ndarray, thresholds=(-0.05, -0.10, -0.20, -0.40)) -> np.ndarray:
+    """P(X_h < threshold) from simulated paths, shape (instrument x horizon x threshold)."""
+    s = np.sort(sims, axis=-1)
+    thr = np.asarray(thresholds, dtype=float)
+    k, nh, p = s.shape
+    out = np.empty((k, nh, len(thr)))
+    for i in range(k):
+        for j in range(nh):
+            out[i, j] = np.searchsorted(s[i, j], thr, side='left')
+    return out / p
+
+
+def empirical_var(sims: np.ndarray, alphas=(0.05, 0.01)) -> np.ndarray:
+    """h-day VaR from simulated paths, shape (instrument x horizon x alpha)."""
+    q = np.quantile(sims, np.asarray(alphas, dtype=float), axis=-1)     # (alpha x k x h)
+    return -np.moveaxis(q, 0, -1)
+
+
+def cube_frame(cube: np.ndarray, instruments, horizons, labels) -> pd.DataFrame:
+    """(instrument x horizon x label) cube as a table indexed by (instrument, horizon)."""
+    k, nh, nl = cube.shape
+    index = pd.MultiIndex.from_product([list(instruments), list(horizons)], names=['instrument', 'horizon'])
+    return pd.DataFrame(cube.reshape(k * nh, nl), index=index, columns=list(labels))
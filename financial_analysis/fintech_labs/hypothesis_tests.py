@@ -0,0 +1,192 @@
+"""
+Hypothesis tests on many return series at once.
+
+Every function takes a (series x observations) array (or a single 1-D series),
+reduces along the last axis ignoring NaNs, and returns one row per series. The
+statistics are closed-form and the p-values come from the vectorized special
+functions of ``scipy.special`` (imported on first use), so testing every ticker
+and every rolling window is a handful of array operations instead of one
+``scipy.stats`` call per series.
+
+Tests
+-----
+- ``t_test_1samp``   : H0 mean = popmean (Student t, ddof=1 std)
+- ``t_test_2samp``   : H0 mean_a = mean_b (pooled or Welch)
+- ``z_test_mean``    : H0 mean = mu0 with known (or large-sample) sigma
+- ``jarque_bera``    : H0 skew = 0 and excess kurtosis = 0 (normality)
+- ``return_tests``   : the three one-sample tests in one table
+
+Results agree with ``scipy.stats.ttest_1samp / ttest_ind / jarque_bera`` run row by
+row (``nan_policy='omit'``).
+
+Example::
+
+    r = np.log(close[:, 1:] / close[:, :-1])          # (tickers x days)
+    return_tests(r, index=tickers)
+    return_tests(rolling_windows(r[0], 252))          # one row per 252-day window
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+ALTERNATIVES = ('two-sided', 'greater', 'less')
+
+
+def _as_rows(x) -> np.ndarray:
+    return np.atleast_2d(np.asarray(x, dtype=float))
+
+
+def rolling_windows(x, window: int, step: int = 1) -> np.ndarray:
+    """
+    (windows x window) view of the rolling windows of a 1-D series (no copy).
+
+    Row i holds x[i*step : i*step + window], ready to be passed to any test below.
+    """
+    return sliding_window_view(np.asarray(x, dtype=float), window)[::step]
+
+
+def _moments(x: np.ndarray):
+    """NaN-aware count, mean and central moment sums M2, M3, M4 of every row."""
+    valid = ~np.isnan(x)
+    n = valid.sum(axis=-1).astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(valid, x, 0.0).sum(axis=-1) / n
+    dev = np.where(valid, x - mean[..., None], 0.0)
+    dev2 = dev * dev
+    return n, mean, dev2.sum(axis=-1), (dev2 * dev).sum(axis=-1), (dev2 * dev2).sum(axis=-1)
+
+
+def _p_value(stat, cdf, alternative: str):
+    """p-value from a vectorized CDF of the null distribution."""
+    if alternative == 'two-sided':
+        return 2 * cdf(-np.abs(stat))
+    if alternative == 'greater':
+        return cdf(-stat)
+    if alternative == 'less':
+        return cdf(stat)
+    raise ValueError(f"unknown alternative {alternative!r} (use one of {ALTERNATIVES})")
+
+
+def t_test_1samp(x, popmean: float = 0.0, alternative: str = 'two-sided', index=None) -> pd.DataFrame:
+    """
+    One-sample t-test of H0: mean = popmean, row by row.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns: n, mean, std (ddof=1), t, df, p_value.
+    """
+    from scipy import special
+
+    n, mean, m2, _, _ = _moments(_as_rows(x))
+    df = n - 1
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt(m2 / df)
+        t = (mean - popmean) / (std / np.sqrt(n))
+    p = _p_value(t, lambda v: special.stdtr(df, v), alternative)
+    return pd.DataFrame({'n': n, 'mean': mean, 'std': std, 't': t, 'df': df, 'p_value': p}, index=index)
+
+
+def t_test_2samp(a, b, equal_var: bool = True, alternative: str = 'two-sided', index=None) -> pd.DataFrame:
+    """
+    Two-sample t-test of H0: mean(a) = mean(b), row i of ``a`` against row i of ``b``.
+
+    ``a`` and ``b`` may have different numbers of observations (columns); a 1-D
+    argument is broadcast against every row of the other. ``equal_var=False`` gives
+    Welch's test with Welch-Satterthwaite degrees of freedom.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns: mean_a, mean_b, diff, t, df, p_value.
+    """
+    from scipy import special
+
+    na, ma, m2a, _, _ = _moments(_as_rows(a))
+    nb, mb, m2b, _, _ = _moments(_as_rows(b))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        va = m2a / (na - 1)
+        vb = m2b / (nb - 1)
+        if equal_var:
+            df = na + nb - 2
+            pooled = ((na - 1) * va + (nb - 1) * vb) / df
+            se = np.sqrt(pooled * (1 / na + 1 / nb))
+        else:
+            qa, qb = va / na, vb / nb
+            se = np.sqrt(qa + qb)
+            df = (qa + qb) ** 2 / (qa ** 2 / (na - 1) + qb ** 2 / (nb - 1))
+        t = (ma - mb) / se
+    df = np.broadcast_to(df, t.shape)
+    p = _p_value(t, lambda v: special.stdtr(df, v), alternative)
+    return pd.DataFrame({'mean_a': np.broadcast_to(ma, t.shape), 'mean_b': np.broadcast_to(mb, t.shape),
+                         'diff': ma - mb, 't': t, 'df': df, 'p_value': p}, index=index)
+
+
+def z_test_mean(x, mu0: float = 0.0, sigma=None, alternative: str = 'two-sided', index=None) -> pd.DataFrame:
+    """
+    z-test of H0: mean = mu0 (e.g. mean daily log return = 0).
+
+    ``sigma`` is the known population standard deviation, a scalar or one value per
+    row. If omitted the sample std (ddof=1) is used: the large-sample z-test, fine for
+    years of daily returns.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns: n, mean, sigma, z, p_value.
+    """
+    from scipy import special
+
+    n, mean, m2, _, _ = _moments(_as_rows(x))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        s = np.sqrt(m2 / (n - 1)) if sigma is None else np.broadcast_to(np.asarray(sigma, dtype=float), n.shape)
+        z = (mean - mu0) / (s / np.sqrt(n))
+    p = _p_value(z, special.ndtr, alternative)
+    return pd.DataFrame({'n': n, 'mean': mean, 'sigma': s, 'z': z, 'p_value': p}, index=index)
+
+
+def jarque_bera(x, index=None) -> pd.DataFrame:
+    """
+    Jarque-Bera normality test: JB = n/6 * (S^2 + K^2/4) ~ chi2(2) under H0.
+
+    S and K are the (biased) sample skewness and excess kurtosis, as in
+    ``scipy.stats.jarque_bera``. The chi2(2) survival function is exp(-JB/2).
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns: n, skew, kurt, jb, p_value.
+    """
+    n, _, m2, m3, m4 = _moments(_as_rows(x))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = m2 / n
+        skew = (m3 / n) / var ** 1.5
+        kurt = (m4 / n) / var ** 2 - 3.0
+        jb = n / 6 * (skew ** 2 + kurt ** 2 / 4)
+    return pd.DataFrame({'n': n, 'skew': skew, 'kurt': kurt, 'jb': jb, 'p_value': np.exp(-jb / 2)},
+                        index=index)
+
+
+def return_tests(x, mu0: float = 0.0, alternative: str = 'two-sided', index=None) -> pd.DataFrame:
+    """
+    Summary table of the one-sample tests for every series.
+
+    Columns: n, mean, std, t, t_p, z, z_p, skew, kurt, jb, jb_p. The moments are
+    computed once and shared by the three tests.
+    """
+    from scipy import special
+
+    n, mean, m2, m3, m4 = _moments(_as_rows(x))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt(m2 / (n - 1))
+        stat = (mean - mu0) / (std / np.sqrt(n))
+        var = m2 / n
+        skew = (m3 / n) / var ** 1.5
+        kurt = (m4 / n) / var ** 2 - 3.0
+        jb = n / 6 * (skew ** 2 + kurt ** 2 / 4)
+    return pd.DataFrame({
+        'n': n, 'mean': mean, 'std': std,
+        't': stat, 't_p': _p_value(stat, lambda v: special.stdtr(n - 1, v), alternative),
+        'z': stat, 'z_p': _p_value(stat, special.ndtr, alternative),
+        'skew': skew, 'kurt': kurt, 'jb': jb, 'jb_p': np.exp(-jb / 2),
+    }, index=index)
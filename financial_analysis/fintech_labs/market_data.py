@@ -0,0 +1,174 @@
+"""
+Market data loader: one canonical OHLCV layout for every CSV in data/, with an on-disk cache.
+
+The CSVs do not share a schema:
+- microsoft.csv, apple.csv, facebook.csv: Date,Open,High,Low,Close,Adj Close,Volume
+- ibm1.csv: lowercase names (adjclose), sorted newest-first, float volume
+- tsla.csv: leading Symbol column, no Adj Close
+
+``load_ohlcv`` maps all of them to:
+    index  : Date (DatetimeIndex, ascending, unique)
+    columns: Open, High, Low, Close, Adj Close (float64), Volume (int64)
+
+Parsing dates is the slow part, so the first read writes one .npy file per column to
+``<csv dir>/.cache/<csv name>/`` and later reads memory-map those files. The cache is
+rebuilt automatically when the CSV's mtime or size changes.
+"""
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .profiling import profiled, stage
+
+# financial_analysis/data (works no matter the current working directory)
+DATA_DIR = Path(__file__).resolve().parents[1] / 'data'
+
+CANONICAL_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+
+# Lowercased source name -> canonical name
+_ALIASES = {
+    'date': 'Date',
+    'open': 'Open',
+    'high': 'High',
+    'low': 'Low',
+    'close': 'Close',
+    'adj close': 'Adj Close',
+    'adjclose': 'Adj Close',
+    'adj_close': 'Adj Close',
+    'volume': 'Volume',
+}
+
+# Bump when the cache layout changes so old caches are ignored
+CACHE_VERSION = 1
+
+
+def data_path(ticker: str) -> Path:
+    """Path of a bundled CSV by ticker name: data_path('microsoft') -> data/microsoft.csv."""
+    return DATA_DIR / f'{ticker}.csv'
+
+
+def read_csv_normalized(path) -> pd.DataFrame:
+    """
+    Parse a price CSV (no cache) and return it in the canonical layout.
+
+    Raises ValueError if the file has no date or close column (e.g. housing.csv).
+    """
+    raw = pd.read_csv(path)
+    raw = raw.rename(columns={c: _ALIASES[c.strip().lower()] for c in raw.columns
+                              if c.strip().lower() in _ALIASES})
+    if 'Date' not in raw.columns or 'Close' not in raw.columns:
+        raise ValueError(f"{path}: not an OHLCV file (needs a date and a close column)")
+
+    df = pd.DataFrame(index=pd.DatetimeIndex(pd.to_datetime(raw['Date']), name='Date'))
+    for col in CANONICAL_COLUMNS:
+        if col in raw.columns:
+            values = pd.to_numeric(raw[col], errors='coerce').to_numpy()
+        else:
+            values = np.full(len(raw), np.nan)
+        if col == 'Volume':
+            values = np.nan_to_num(values).astype(np.int64)
+        else:
+            values = values.astype(np.float64)
+        df[col] = values
+
+    # Ascending dates, one row per date (keep the last occurrence)
+    df = df[~df.index.duplicated(keep='last')]
+    return df.sort_index(kind='stable')
+
+
+def _cache_dir(path: Path) -> Path:
+    return path.parent / '.cache' / path.stem
+
+
+def _column_file(path: Path, col: str) -> Path:
+    return _cache_dir(path) / (col.replace(' ', '_') + '.npy')
+
+
+def source_fingerprint(path) -> dict:
+    """Identity of a source file's current contents (mtime, size, cache format version)."""
+    st = os.stat(path)
+    return {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'version': CACHE_VERSION}
+
+
+def _read_cache(path: Path):
+    """Memory-map the cached columns, or return None if the cache is missing/stale."""
+    meta_file = _cache_dir(path) / 'meta.json'
+    try:
+        with open(meta_file) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get('source') != source_fingerprint(path):
+        return None
+    try:
+        return {col: np.load(_column_file(path, col), mmap_mode='r') for col in ['Date'] + CANONICAL_COLUMNS}
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(path: Path, df: pd.DataFrame):
+    """Write one .npy per column; meta.json goes last so a half-written cache is never used."""
+    cache = _cache_dir(path)
+    cache.mkdir(parents=True, exist_ok=True)
+    np.save(_column_file(path, 'Date'), df.index.to_numpy(dtype='datetime64[ns]'))
+    for col in CANONICAL_COLUMNS:
+        np.save(_column_file(path, col), df[col].to_numpy())
+
+    tmp = cache / 'meta.json.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'source': source_fingerprint(path), 'columns': ['Date'] + CANONICAL_COLUMNS}, f)
+    os.replace(tmp, cache / 'meta.json')
+
+
+def load_ohlcv_arrays(path, use_cache: bool = True) -> dict:
+    """
+    Canonical columns as NumPy arrays: {'Date', 'Open', ..., 'Volume'}.
+
+    When the cache is valid the arrays are read-only memory maps (no parsing, no copy),
+    which is what worker processes and tight loops should use.
+    """
+    path = Path(path)
+    if use_cache:
+        with stage('read_cache'):
+            cached = _read_cache(path)
+        if cached is not None:
+            return cached
+
+    with stage('parse_csv'):
+        df = read_csv_normalized(path)
+    if use_cache:
+        try:
+            with stage('write_cache'):
+                _write_cache(path, df)
+        except OSError:
+            pass  # read-only data dir: just work without a cache
+
+    arrays = {'Date': df.index.to_numpy(dtype='datetime64[ns]')}
+    arrays.update({col: df[col].to_numpy() for col in CANONICAL_COLUMNS})
+    return arrays
+
+
+@profiled()
+def load_ohlcv(path, use_cache: bool = True) -> pd.DataFrame:
+    """
+    Load a price CSV in the canonical OHLCV layout (see module docstring).
+
+    Parameters
+    ----------
+    path : str or Path
+        CSV file. Use ``data_path('microsoft')`` for the bundled files.
+    use_cache : bool
+        Read/write the binary cache next to the CSV (default True).
+
+    Returns
+    -------
+    pd.DataFrame
+        Indexed by Date (ascending), columns Open, High, Low, Close, Adj Close, Volume.
+    """
+    arrays = load_ohlcv_arrays(path, use_cache=use_cache)
+    with stage('frame'):
+        index = pd.DatetimeIndex(arrays['Date'], name='Date')
+        return pd.DataFrame({col: np.asarray(arrays[col]) for col in CANONICAL_COLUMNS}, index=index)
@@ -0,0 +1,296 @@
+"""
+Normal (mu x sigma x x) parameter sweeps, streamed to CSV / Parquet / xlsx in chunks.
+
+normal_sigma_sweep.xlsx evaluates ``pdf(x, mu, sigma)`` cell by cell (one column per
+sigma, one row per x). Here the same ``pdf`` (the one of gaussian_distribution_animation.py
+and simple_example_5_elements.py) is evaluated through broadcasting on blocks of
+(mu, sigma) pairs x all x, together with the CDF and the ±k·sigma coverage, and each
+block is written out before the next one is computed. Memory stays at one block
+(``MAX_CHUNK_CELLS`` values per array) whatever the size of the grid.
+
+Per (mu, sigma) pair the summary has:
+
+- ``peak``            pdf at x = mu, 1 / (sigma * sqrt(2 pi))
+- ``mass_in_range``   CDF(x_max) - CDF(x_min): how much of the curve the x grid shows
+- ``cov_<k>``         P(|X - mu| <= k sigma) inside [x_min, x_max] (exact, ndtr)
+- ``cov_<k>_grid``    the same area integrated on the x grid (trapezoid), i.e. what a
+                      chart or a spreadsheet built on that grid actually covers
+
+Without clipping the coverage is ``coverage(k)``: 0.6827, 0.9545, 0.9973.
+
+Example::
+
+    x = np.linspace(-6, 6, 121)
+    write_sweep('sweep.xlsx', mu=[0.0], sigma=np.arange(2, 32) / 10, x=x)
+    write_sweep('sweep.parquet', mu=np.linspace(-1, 1, 201), sigma=np.linspace(0.1, 3, 300), x=x)
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SQRT_2PI = np.sqrt(2 * np.pi)
+
+# np.trapezoid is numpy>=2; older numpy only has np.trapz (deprecated in 2.0)
+_trapezoid = getattr(np, 'trapezoid', None) or np.trapz
+
+# Values per (pairs x points) array of one block (~32 MB of float64)
+MAX_CHUNK_CELLS = 2 ** 22
+
+COVERAGE_K = (1, 2, 3)
+
+# xlsx sheet limits
+XLSX_MAX_ROWS = 1_048_576
+XLSX_MAX_COLS = 16_384
+
+
+def pdf(x, mu, sigma):
+    """
+    Density of N(mu, sigma^2).
+
+    ``x``, ``mu`` and ``sigma`` may be scalars or arrays and are broadcast: with x of
+    shape (1, N) and mu, sigma of shape (F, 1) the result is the (F, N) table.
+    """
+    return (1 / (sigma * SQRT_2PI)) * np.exp(-((x - mu) ** 2) / (2 * sigma ** 2))
+
+
+def cdf(x, mu, sigma):
+    """CDF of N(mu, sigma^2), broadcast like ``pdf``."""
+    from scipy import special
+
+    return special.ndtr((x - mu) / sigma)
+
+
+def coverage(k):
+    """P(|X - mu| <= k sigma) of any Normal: erf(k / sqrt(2))."""
+    from scipy import special
+
+    return special.erf(np.asarray(k, dtype=float) / np.sqrt(2))
+
+
+# -------------------------
+# Chunked evaluation
+# -------------------------
+
+def _pairs(mu, sigma):
+    """Flattened (mu x sigma) grid, mu-major (all sigmas of the first mu first)."""
+    mu = np.atleast_1d(np.asarray(mu, dtype=float))
+    sigma = np.atleast_1d(np.asarray(sigma, dtype=float))
+    if (sigma <= 0).any():
+        raise ValueError("sigma must be > 0")
+    return np.repeat(mu, len(sigma)), np.tile(sigma, len(mu))
+
+
+def _summary(mu, sigma, x, y, ks) -> pd.DataFrame:
+    """Per-pair summary of one block; ``y`` is the (pairs x points) pdf."""
+    from scipy import special
+
+    m, s = mu[:, None], sigma[:, None]
+    z_lo = (x[0] - mu) / sigma
+    z_hi = (x[-1] - mu) / sigma
+    cols = {
+        'mu': mu,
+        'sigma': sigma,
+        'peak': 1 / (sigma * SQRT_2PI),
+        'mass_in_range': special.ndtr(z_hi) - special.ndtr(z_lo),
+    }
+    dist = np.abs(x[None, :] - m)
+    for k in ks:
+        cols[f'cov_{k:g}'] = special.ndtr(np.minimum(k, z_hi)) - special.ndtr(np.maximum(-k, z_lo))
+        cols[f'cov_{k:g}_grid'] = _trapezoid(np.where(dist <= k * s, y, 0.0), x, axis=1)
+    return pd.DataFrame(cols)
+
+
+def sweep_chunks(mu, sigma, x, ks=COVERAGE_K, chunk_cells: int = MAX_CHUNK_CELLS):
+    """
+    Evaluate the sweep block by block.
+
+    Parameters
+    ----------
+    mu, sigma : float or array-like
+        Parameter grids; every (mu, sigma) combination is evaluated.
+    x : array-like
+        Sorted evaluation points (the x column of the workbook).
+    ks : sequence of float
+        Half-widths of the coverage intervals, in sigmas.
+    chunk_cells : int
+        Max (pairs x points) values per block.
+
+    Yields
+    ------
+    dict
+        ``mu``, ``sigma`` (pairs,), ``pdf``, ``cdf`` (pairs x points) and ``summary``
+        (DataFrame, one row per pair) of consecutive (mu, sigma) pairs, mu-major.
+    """
+    from scipy import special
+
+    x = np.asarray(x, dtype=float)
+    mus, sigmas = _pairs(mu, sigma)
+    step = max(1, chunk_cells // len(x))
+    for start in range(0, len(mus), step):
+        m, s = mus[start:start + step], sigmas[start:start + step]
+        y = pdf(x[None, :], m[:, None], s[:, None])
+        yield {
+            'mu': m,
+            'sigma': s,
+            'pdf': y,
+            'cdf': special.ndtr((x[None, :] - m[:, None]) / s[:, None]),
+            'summary': _summary(m, s, x, y, ks),
+        }
+
+
+def _long_frame(chunk, x) -> pd.DataFrame:
+    """One block as rows (mu, sigma, x, pdf, cdf)."""
+    p, n = chunk['pdf'].shape
+    return pd.DataFrame({
+        'mu': np.repeat(chunk['mu'], n),
+        'sigma': np.repeat(chunk['sigma'], n),
+        'x': np.tile(x, p),
+        'pdf': chunk['pdf'].ravel(),
+        'cdf': chunk['cdf'].ravel(),
+    })
+
+
+def sweep_summary(mu, sigma, x, ks=COVERAGE_K, chunk_cells: int = MAX_CHUNK_CELLS) -> pd.DataFrame:
+    """Summary table of the whole sweep (one row per (mu, sigma) pair)."""
+    return pd.concat([c['summary'] for c in sweep_chunks(mu, sigma, x, ks, chunk_cells)], ignore_index=True)
+
+
+# -------------------------
+# Writers
+# -------------------------
+
+def _summary_path(path: Path) -> Path:
+    return path.with_name(f'{path.stem}_summary{path.suffix}')
+
+
+def _write_csv(path, mu, sigma, x, ks, chunk_cells):
+    summary_path = _summary_path(path)
+    first = True
+    for chunk in sweep_chunks(mu, sigma, x, ks, chunk_cells):
+        mode = 'w' if first else 'a'
+        _long_frame(chunk, x).to_csv(path, mode=mode, header=first, index=False)
+        chunk['summary'].to_csv(summary_path, mode=mode, header=first, index=False)
+        first = False
+    return [path, summary_path]
+
+
+def _write_parquet(path, mu, sigma, x, ks, chunk_cells):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Parquet output needs pyarrow (pip install pyarrow); use .csv otherwise") from exc
+
+    summary_path = _summary_path(path)
+    writers = {}
+    try:
+        # One row group per block
+        for chunk in sweep_chunks(mu, sigma, x, ks, chunk_cells):
+            for key, p, df in (('curves', path, _long_frame(chunk, x)),
+                               ('summary', summary_path, chunk['summary'])):
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if key not in writers:
+                    writers[key] = pq.ParquetWriter(p, table.schema)
+                writers[key].write_table(table)
+    finally:
+        for w in writers.values():
+            w.close()
+    return [path, summary_path]
+
+
+# Sheet labels of normal_sigma_sweep.xlsx
+SETUP_TITLE = 'Normal (Gaussian) – sweep de sigma'
+SUMMARY_LABELS = {
+    'mu': 'μ',
+    'sigma': 'sigma',
+    'peak': 'pico f(μ)=1/(sigma*sqrt(2π))',
+    'mass_in_range': 'masa en [x_min, x_max]',
+}
+
+
+def _summary_label(col):
+    if col in SUMMARY_LABELS:
+        return SUMMARY_LABELS[col]
+    k = col.split('_')[1]
+    return f'±{k}σ (rejilla x)' if col.endswith('_grid') else f'±{k}σ'
+
+
+def _write_xlsx(path, mu, sigma, x, ks, chunk_cells):
+    try:
+        from openpyxl import Workbook
+    except ImportError as exc:
+        raise ImportError("xlsx output needs openpyxl (pip install openpyxl); use .csv otherwise") from exc
+
+    mu = np.atleast_1d(np.asarray(mu, dtype=float))
+    sigma = np.atleast_1d(np.asarray(sigma, dtype=float))
+    if len(x) + 1 > XLSX_MAX_ROWS or len(sigma) + 1 > XLSX_MAX_COLS:
+        raise ValueError(f"{len(x)} x {len(sigma)} does not fit in a sheet; use .csv or .parquet")
+
+    # write_only: rows go to disk as they are appended, nothing is kept per cell
+    wb = Workbook(write_only=True)
+    setup = wb.create_sheet('Setup')
+    for row in ([SETUP_TITLE], [],
+                ['μ (media)', *mu.tolist()],
+                ['x_min', float(x[0])],
+                ['x_max', float(x[-1])],
+                ['N puntos (x)', len(x)],
+                ['sigmas', len(sigma)],
+                [],
+                ['Notas:'],
+                ["• En 'Curves', cada columna es una sigma distinta; grafica x vs una o varias columnas."],
+                ["• En 'Sigma_Summary' puedes graficar sigma vs pico (altura máxima)."]):
+        setup.append(row)
+
+    # Same layout as the workbook: x rows x sigma columns, one Curves sheet per mu
+    header = ['x', *sigma.tolist()]
+    rows_per_block = max(1, chunk_cells // len(sigma))
+    for m in mu:
+        ws = wb.create_sheet('Curves' if len(mu) == 1 else f'Curves mu={m:g}')
+        ws.append(header)
+        for start in range(0, len(x), rows_per_block):
+            xb = x[start:start + rows_per_block]
+            block = pdf(xb[:, None], m, sigma[None, :])
+            for xi, row in zip(xb.tolist(), block.tolist()):
+                ws.append([xi, *row])
+
+    summary = wb.create_sheet('Sigma_Summary')
+    first = True
+    for chunk in sweep_chunks(mu, sigma, x, ks, chunk_cells):
+        df = chunk['summary']
+        if len(mu) == 1:
+            df = df.drop(columns='mu')
+        if first:
+            summary.append([_summary_label(c) for c in df.columns])
+            first = False
+        for row in df.itertuples(index=False):
+            summary.append(list(row))
+    wb.save(path)
+    return [path]
+
+
+WRITERS = {'.csv': _write_csv, '.parquet': _write_parquet, '.xlsx': _write_xlsx}
+
+
+def write_sweep(path, mu, sigma, x, ks=COVERAGE_K, chunk_cells: int = MAX_CHUNK_CELLS) -> list:
+    """
+    Evaluate the sweep and stream it to ``path``; the format follows the extension.
+
+    - ``.csv`` / ``.parquet``: long table (mu, sigma, x, pdf, cdf) in ``path`` and the
+      per-pair summary in ``<stem>_summary.<ext>``. Parquet (pyarrow) writes one row
+      group per block.
+    - ``.xlsx``: the normal_sigma_sweep.xlsx layout (Setup, Curves with one column per
+      sigma, Sigma_Summary with the coverage columns) written row by row with
+      openpyxl's write-only mode. Values are stored, not formulas.
+
+    Returns
+    -------
+    list of Path
+        Files written.
+    """
+    path = Path(path)
+    writer = WRITERS.get(path.suffix.lower())
+    if writer is None:
+        raise ValueError(f"unsupported output {path.suffix!r}; expected one of {sorted(WRITERS)}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return writer(path, mu, sigma, np.asarray(x, dtype=float), ks, chunk_cells)
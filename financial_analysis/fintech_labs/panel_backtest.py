@@ -0,0 +1,152 @@
+"""
+MA crossover backtest on a panel of tickers (all CSVs in data/ at once) and an
+equal-weight portfolio of the per-ticker strategies.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .market_data import DATA_DIR, load_ohlcv
+
+
+def load_close_panel(data_dir=DATA_DIR) -> pd.DataFrame:
+    """
+    Align the Close prices of every CSV in ``data_dir`` into one (date x ticker) frame.
+
+    - The ticker name is the file name without extension (``microsoft``, ``ibm1``...).
+    - Every schema is normalized by ``load_ohlcv``; files that are not price
+      data (e.g. ``housing.csv``) are skipped.
+    - Dates are the union of all files, sorted ascending. Days where a ticker did
+      not trade (e.g. a holiday row in another file) are NaN for that ticker: no
+      price is invented, ``panel_backtest`` skips them.
+    """
+    closes = {}
+    for path in sorted(Path(data_dir).glob('*.csv')):
+        try:
+            closes[path.stem] = load_ohlcv(path)['Close']
+        except ValueError:
+            continue
+
+    return pd.concat(closes, axis=1, sort=True)
+
+
+def panel_backtest(closes: pd.DataFrame, fast: int, slow: int, fee_bps: float = 0.0):
+    """
+    Moving-average crossover backtest (long-or-flat) on many tickers at once.
+
+    Same logic as ``backtest_ma_crossover`` (SMA crossover, position lagged one day,
+    costs on position changes), but every ticker is a column of one NumPy array and
+    all of them are processed in a single vectorized pass.
+
+    Each ticker only sees its OWN rows (its non-NaN prices): the valid prices of every
+    column are packed to the top of a (rows x ticker) array, so SMA windows, returns
+    and trades are counted in that ticker's bars and the metrics are those of
+    ``backtest_ma_crossover`` on the ticker's CSV. Dates are aligned only to combine
+    the strategies into the portfolio.
+
+    Parameters
+    ----------
+    closes : pd.DataFrame
+        Close prices, one column per ticker, indexed by date (see ``load_close_panel``).
+        NaNs mark days without a price for that ticker.
+    fast, slow : int
+        Window lengths of the fast and slow moving averages (fast < slow).
+    fee_bps : float
+        Trading cost in basis points applied whenever the position changes.
+
+    Returns
+    -------
+    metrics : pd.DataFrame
+        One row per ticker with the same keys as ``backtest_ma_crossover``
+        (fast, slow, total_return, bh_return, sharpe, max_dd, trades, final_eq).
+    portfolio_eq : pd.Series
+        Equity curve (starting at 1.0) of an equal-weight portfolio, rebalanced daily
+        across the tickers whose strategy is live (and that have a price) that day.
+    """
+    if fast >= slow:
+        raise ValueError("fast must be < slow")
+
+    raw = closes.to_numpy(dtype=float)               # (n_days, n_tickers)
+    n, k = raw.shape
+    valid = ~np.isnan(raw)
+
+    # Pack each ticker's valid rows to the top (stable: date order is kept).
+    # row_of[i, j] = date row of the i-th price of ticker j; rows past its count are padding.
+    row_of = np.argsort(~valid, axis=0, kind='stable')
+    count = valid.sum(axis=0)
+    t = np.arange(n)[:, None]
+    has = t < count                                  # (n, k) real (non-padding) packed rows
+    c = np.where(has, np.take_along_axis(raw, row_of, axis=0), np.nan)
+
+    # First row of each ticker's backtest window (the first day both MAs exist,
+    # i.e. what dropna() keeps in backtest_ma_crossover)
+    start = slow - 1
+    in_win = has & (t >= start)
+
+    # Simple returns between consecutive prices of the same ticker
+    ret = np.full_like(c, np.nan)
+    ret[1:] = c[1:] / c[:-1] - 1
+
+    # SMAs for every ticker from one cumulative-sum pass per window
+    # (padding is zeroed for the sum and masked out afterwards)
+    csum = np.zeros((n + 1, k))
+    np.cumsum(np.where(has, c, 0.0), axis=0, out=csum[1:])
+
+    def sma(w):
+        out = np.full_like(c, np.nan)
+        out[w - 1:] = (csum[w:] - csum[:-w]) / w
+        out[~has] = np.nan
+        return out
+
+    # Position, lag and trades (first day of each window: no position, no trade)
+    pos = (sma(fast) > sma(slow)) & in_win
+    pos_lag = np.zeros_like(pos)
+    pos_lag[1:] = pos[:-1]
+    trade = np.zeros_like(pos)
+    trade[1:] = pos[1:] != pos[:-1]
+    trade &= in_win & (t > start)
+
+    cost = (fee_bps / 10_000.0) * trade
+    strat_ret = np.where(pos_lag & in_win, ret, 0.0) - cost
+    bh_ret = np.where(in_win, ret, 0.0)
+
+    # Equity curves (flat at 1.0 outside each ticker's window)
+    strat_eq = np.cumprod(1 + strat_ret, axis=0)
+    bh_eq = np.cumprod(1 + bh_ret, axis=0)
+    peak = np.maximum.accumulate(strat_eq, axis=0)
+
+    # Sharpe over each ticker's own window (ddof=0, annualized by sqrt(252))
+    m = in_win.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = strat_ret.sum(axis=0) / m
+        std = np.sqrt((np.where(in_win, strat_ret - mean, 0.0) ** 2).sum(axis=0) / m)
+    sharpe = np.sqrt(252) * mean / (std + 1e-12)
+
+    metrics = pd.DataFrame({
+        'fast': fast,
+        'slow': slow,
+        'total_return': strat_eq[-1] - 1,
+        'bh_return': bh_eq[-1] - 1,
+        'sharpe': sharpe,
+        'max_dd': (strat_eq / peak - 1.0).min(axis=0),
+        'trades': trade.sum(axis=0),
+        'final_eq': strat_eq[-1],
+    }, index=pd.Index(closes.columns, name='ticker'))
+    # Tickers with fewer than `slow` prices never get a window
+    metrics.loc[m == 0, ['total_return', 'bh_return', 'sharpe', 'max_dd', 'final_eq']] = np.nan
+
+    # Back to the date grid: each strategy return lands on the date of its own row.
+    # Days without a price for a ticker are not live for it.
+    live_ret = np.zeros((n, k))
+    live = np.zeros((n, k), dtype=bool)
+    cols = np.broadcast_to(np.arange(k), (n, k))
+    live_ret[row_of[in_win], cols[in_win]] = strat_ret[in_win]
+    live[row_of[in_win], cols[in_win]] = True
+
+    # Equal-weight portfolio: average strategy return of the live tickers each day
+    n_live = live.sum(axis=1)
+    port_ret = np.divide(live_ret.sum(axis=1), n_live, out=np.zeros(n), where=n_live > 0)
+    portfolio_eq = pd.Series(np.cumprod(1 + port_ret), index=closes.index, name='portfolio_eq')
+
+    return metrics, portfolio_eq
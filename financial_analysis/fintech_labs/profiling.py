@@ -0,0 +1,216 @@
+"""
+Optional stage-level profiling of the pipeline (loader, features, backtests, grid search).
+
+The hot functions mark their stages with ``stage('name')`` or ``@profiled``. Nothing
+is recorded unless a ``Profiler`` is active: ``stage`` then returns one shared no-op
+context manager, so a disabled stage costs a function call and a ``with`` (well
+under a microsecond).
+
+With a profiler active every stage records, aggregated per stage over all calls:
+
+    calls, seconds (total / min / max)    wall time (perf_counter)
+    peak_bytes                            highest memory above the stage's start (tracemalloc)
+    alloc_bytes                           net memory still allocated when the stage ends
+    blocks                                net change of live Python objects (sys.getallocatedblocks)
+
+Memory tracking (``memory=True``, the default) runs tracemalloc while the profiler is
+active, which slows allocation-heavy code down; use ``memory=False`` for timings only.
+Nested stages are recorded under their path ('grid_search/sma_table'). Stages that
+run inside worker processes (``workers > 1``) are not seen by the parent's profiler.
+
+Example::
+
+    with Profiler() as prof:
+        grid_search(prices, range(5, 31, 5), range(20, 201, 20))
+    print(prof.summary())
+    prof.to_json('profile.json')
+    prof.to_prometheus('profile.prom')            # node_exporter textfile format
+"""
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Currently active profiler (None = profiling disabled)
+_active = None
+
+_DISABLED = nullcontext()
+
+METRIC_PREFIX = 'fintech_stage'
+
+
+def stage(name: str):
+    """Context manager timing one pipeline stage; a shared no-op when no profiler is active."""
+    profiler = _active
+    if profiler is None:
+        return _DISABLED
+    return profiler._stage(name)
+
+
+def profiled(name: str = None):
+    """Decorator: the whole call is one stage (named after the function by default)."""
+    def decorate(fn):
+        stage_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return fn(*args, **kwargs)
+            with _active._stage(stage_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class Profiler:
+    """
+    Collect per-stage metrics while active (``with Profiler() as prof: ...``).
+
+    Parameters
+    ----------
+    memory : bool
+        Track peak / net memory with tracemalloc (slower). False: wall time and
+        object counts only.
+    callback : callable, optional
+        ``callback(stage, record)`` after every stage, with the record of that call
+        (seconds, peak_bytes, alloc_bytes, blocks). For streaming to a logger.
+    """
+
+    def __init__(self, memory: bool = True, callback=None):
+        self.memory = memory
+        self.callback = callback
+        self.stats = {}              # stage path -> aggregated record
+        self._stack = []             # open stages: [path, t0, mem0, peak_seen, blocks0]
+        self._previous = None
+        self._started_tracing = False
+
+    # -------------------------
+    # Activation
+    # -------------------------
+
+    def __enter__(self):
+        global _active
+        self._previous = _active
+        _active = self
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        _active = self._previous
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    # -------------------------
+    # Recording
+    # -------------------------
+
+    def _memory(self):
+        return tracemalloc.get_traced_memory() if self.memory else (0, 0)
+
+    @contextmanager
+    def _stage(self, name):
+        path = f'{self._stack[-1][0]}/{name}' if self._stack else name
+        mem0, peak = self._memory()
+        if self._stack:
+            # The peak so far belongs to the parent; reset it for this stage
+            self._stack[-1][3] = max(self._stack[-1][3], peak)
+        if self.memory:
+            tracemalloc.reset_peak()
+        frame = [path, time.perf_counter(), mem0, mem0, sys.getallocatedblocks()]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - frame[1]
+            mem1, peak = self._memory()
+            frame[3] = max(frame[3], peak)
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][3] = max(self._stack[-1][3], frame[3])
+            if self.memory:
+                tracemalloc.reset_peak()
+            self._record(path, {
+                'seconds': seconds,
+                'peak_bytes': frame[3] - frame[2],
+                'alloc_bytes': mem1 - frame[2],
+                'blocks': sys.getallocatedblocks() - frame[4],
+            })
+
+    def _record(self, path, rec):
+        s = self.stats.get(path)
+        if s is None:
+            s = self.stats[path] = {'calls': 0, 'seconds': 0.0, 'min_seconds': float('inf'), 'max_seconds': 0.0,
+                                    'peak_bytes': 0, 'alloc_bytes': 0, 'blocks': 0}
+        s['calls'] += 1
+        s['seconds'] += rec['seconds']
+        s['min_seconds'] = min(s['min_seconds'], rec['seconds'])
+        s['max_seconds'] = max(s['max_seconds'], rec['seconds'])
+        s['peak_bytes'] = max(s['peak_bytes'], rec['peak_bytes'])
+        s['alloc_bytes'] += rec['alloc_bytes']
+        s['blocks'] += rec['blocks']
+        if self.callback is not None:
+            self.callback(path, rec)
+
+    # -------------------------
+    # Export
+    # -------------------------
+
+    def summary(self):
+        """Aggregated stages as a DataFrame (one row per stage path, slowest first)."""
+        import pandas as pd
+
+        df = pd.DataFrame.from_dict(self.stats, orient='index')
+        if df.empty:
+            return df
+        df.index.name = 'stage'
+        df['mean_seconds'] = df['seconds'] / df['calls']
+        df['peak_mb'] = df['peak_bytes'] / 1024 ** 2
+        return df.sort_values('seconds', ascending=False)
+
+    def to_dict(self) -> dict:
+        return {'memory': self.memory, 'stages': {k: dict(v) for k, v in self.stats.items()}}
+
+    def to_json(self, path):
+        """Write ``to_dict()`` as JSON (atomic: temp file + os.replace)."""
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp, path)
+        return path
+
+    def prometheus_text(self, labels=None) -> str:
+        """Metrics in the Prometheus text exposition format, one series per stage."""
+        extra = ''.join(f',{k}="{v}"' for k, v in (labels or {}).items())
+        metrics = [
+            ('calls_total', 'counter', 'Number of times each pipeline stage ran.', 'calls'),
+            ('seconds_total', 'counter', 'Wall time spent in each pipeline stage.', 'seconds'),
+            ('seconds_max', 'gauge', 'Slowest single call of each pipeline stage.', 'max_seconds'),
+            ('peak_bytes', 'gauge', 'Highest memory allocated above the stage start (tracemalloc).', 'peak_bytes'),
+            ('alloc_bytes', 'gauge', 'Net memory left allocated by each stage (can be negative).', 'alloc_bytes'),
+            ('blocks', 'gauge', 'Net change of live Python objects in each stage.', 'blocks'),
+        ]
+        lines = []
+        for suffix, kind, help_text, key in metrics:
+            if key in ('peak_bytes', 'alloc_bytes') and not self.memory:
+                continue
+            name = f'{METRIC_PREFIX}_{suffix}'
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+            for path, s in self.stats.items():
+                lines.append(f'{name}{{stage="{path}"{extra}}} {s[key]:.9g}')
+        return '\n'.join(lines) + '\n'
+
+    def to_prometheus(self, path, labels=None):
+        """Write ``prometheus_text`` to a .prom file (atomic, for the node_exporter textfile collector)."""
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as f:
+            f.write(self.prometheus_text(labels))
+        os.replace(tmp, path)
+        return path
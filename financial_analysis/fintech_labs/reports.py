@@ -0,0 +1,263 @@
+"""
+Headless batch rendering of strategy and distribution charts (PNG / SVG).
+
+One report page per (ticker, fast, slow) with the panels the scripts draw one by one:
+
+    price + fast/slow MA        | log-return histogram + fitted Normal PDF
+    position (signal)           | ECDF + fitted Normal CDF
+    strategy vs buy & hold      | summary metrics
+    wealth
+
+The scripts build a new figure per chart and block on ``plt.show()``. Here the
+figure, axes and every artist are created ONCE per ``ReportRenderer``; each report
+only swaps the data of the existing artists (``set_data``) and saves. The figure is
+drawn with the Agg canvas directly, without pyplot, so no GUI backend is involved
+and nothing global is touched. ``render_reports`` spreads the pages over worker
+processes, each with its own renderer.
+
+Example::
+
+    jobs = [('microsoft', 10, 30), ('apple', 20, 60), ('facebook', 10, 30)]
+    render_reports(jobs, 'reports/', fmt='png', workers=4)
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .backtest import _position_returns, backtest_ma_crossover, simple_returns
+from .ecdf import EmpiricalCDF
+from .market_data import data_path, load_ohlcv
+
+HIST_BINS = 50
+PDF_POINTS = 200
+
+
+def report_data(df: pd.DataFrame, fast: int, slow: int, fee_bps: float = 0.0) -> dict:
+    """
+    Everything a report page plots, as arrays (no matplotlib needed).
+
+    The strategy and buy & hold curves are those of ``backtest_ma_crossover`` (the
+    shared ``_position_returns`` core): they start on the first day both MAs exist
+    (row slow - 1, NaN before), that day is not a trade, and they end on the
+    ``final_eq`` / ``bh_return`` of the metrics box.
+    """
+    close = df['Close']
+    ma_fast = close.rolling(fast).mean()
+    ma_slow = close.rolling(slow).mean()
+
+    pos = (ma_fast > ma_slow).astype(float).to_numpy()
+    start = np.array([slow - 1])
+    ret = simple_returns(close.to_numpy(dtype=float))
+    strat_ret, _, in_win = _position_returns(ret, pos[None, :] > 0, start, fee_bps)
+    in_win = in_win[0]
+    strat_eq = np.where(in_win, np.cumprod(1 + strat_ret[0]), np.nan)
+    bh_eq = np.where(in_win, np.cumprod(1 + np.where(in_win, ret, 0.0)), np.nan)
+
+    log_ret = np.log(close).diff().dropna().to_numpy()
+    mu, sigma = log_ret.mean(), log_ret.std(ddof=1)
+
+    return {
+        'dates': df.index,
+        'close': close.to_numpy(),
+        'ma_fast': ma_fast.to_numpy(),
+        'ma_slow': ma_slow.to_numpy(),
+        'pos': pos,
+        'strat_eq': strat_eq,
+        'bh_eq': bh_eq,
+        'wealth': np.cumsum(pos * (close.shift(-1) - close).fillna(0.0).to_numpy()),
+        'log_ret': log_ret,
+        'mu': mu,
+        'sigma': sigma,
+        'metrics': backtest_ma_crossover(df, fast, slow, fee_bps),
+    }
+
+
+class ReportRenderer:
+    """
+    Reusable report page: build the figure once, render many reports into it.
+
+    Parameters
+    ----------
+    figsize : (float, float)
+        Page size in inches.
+    dpi : int
+        Resolution of raster outputs.
+    """
+
+    def __init__(self, figsize=(14, 10), dpi: int = 100):
+        from matplotlib.dates import AutoDateLocator, ConciseDateFormatter
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self.fig)
+        gs = self.fig.add_gridspec(4, 2, height_ratios=[3, 1, 2, 2], width_ratios=[3, 2])
+
+        ax_price = self.fig.add_subplot(gs[0, 0])
+        ax_pos = self.fig.add_subplot(gs[1, 0], sharex=ax_price)
+        ax_eq = self.fig.add_subplot(gs[2, 0], sharex=ax_price)
+        ax_wealth = self.fig.add_subplot(gs[3, 0], sharex=ax_price)
+        ax_hist = self.fig.add_subplot(gs[0:2, 1])
+        ax_ecdf = self.fig.add_subplot(gs[2, 1])
+        ax_text = self.fig.add_subplot(gs[3, 1])
+        # The left column shares its date axis: compact date labels, bottom panel only
+        locator = AutoDateLocator()
+        ax_wealth.xaxis.set_major_locator(locator)
+        ax_wealth.xaxis.set_major_formatter(ConciseDateFormatter(locator))
+        for ax in (ax_price, ax_pos, ax_eq):
+            ax.label_outer()
+        self.axes = {'price': ax_price, 'pos': ax_pos, 'eq': ax_eq, 'wealth': ax_wealth,
+                     'hist': ax_hist, 'ecdf': ax_ecdf, 'text': ax_text}
+
+        # Artists created once; every render only replaces their data
+        self.close_line, = ax_price.plot([], [], lw=1, label='Close')
+        self.fast_line, = ax_price.plot([], [], lw=1, ls=':', label='MA fast')
+        self.slow_line, = ax_price.plot([], [], lw=1, ls='--', label='MA slow')
+        ax_price.set_ylabel('Price')
+        self.price_legend = ax_price.legend(loc='upper left')
+
+        self.pos_line, = ax_pos.plot([], [], lw=1, drawstyle='steps-post')
+        ax_pos.set_ylim(-0.1, 1.1)
+        ax_pos.set_ylabel('Position')
+
+        self.strat_line, = ax_eq.plot([], [], lw=1, label='Strategy')
+        self.bh_line, = ax_eq.plot([], [], lw=1, alpha=0.7, label='Buy & hold')
+        ax_eq.set_ylabel('Equity')
+        ax_eq.legend(loc='upper left')
+
+        self.wealth_line, = ax_wealth.plot([], [], lw=1, color='tab:green')
+        ax_wealth.set_ylabel('Wealth (P&L)')
+
+        self.hist = ax_hist.stairs(np.zeros(HIST_BINS), np.linspace(0, 1, HIST_BINS + 1), fill=True, alpha=0.6)
+        self.pdf_line, = ax_hist.plot([], [], color='red', lw=2, label='Normal fit')
+        ax_hist.set_title('Daily log return')
+        ax_hist.set_ylabel('Density')
+        ax_hist.legend(loc='upper right')
+
+        self.ecdf_line, = ax_ecdf.plot([], [], marker='.', ms=2, ls='none', label='Empirical CDF')
+        self.cdf_line, = ax_ecdf.plot([], [], color='red', lw=1.5, label='Normal CDF')
+        ax_ecdf.set_ylim(0, 1)
+        ax_ecdf.legend(loc='upper left')
+
+        ax_text.axis('off')
+        self.metrics_text = ax_text.text(0.02, 0.95, '', va='top', family='monospace', transform=ax_text.transAxes)
+        self.title = self.fig.suptitle('')
+        # Lay out once, then freeze the axes positions: with a layout engine attached
+        # every savefig would run an extra full draw just to recompute the layout
+        self.fig.tight_layout(rect=(0, 0, 1, 0.96))
+        self.fig.set_layout_engine('none')
+
+    @staticmethod
+    def _rescale(ax):
+        ax.relim()
+        ax.autoscale_view()
+
+    def render(self, data: dict, path, title: str = ''):
+        """Draw one report (``report_data`` output) and save it; the format follows the extension."""
+        from scipy.stats import norm
+
+        dates = data['dates']
+        self.close_line.set_data(dates, data['close'])
+        self.fast_line.set_data(dates, data['ma_fast'])
+        self.slow_line.set_data(dates, data['ma_slow'])
+        m = data['metrics']
+        self.fast_line.set_label(f"MA{m['fast']}")
+        self.slow_line.set_label(f"MA{m['slow']}")
+        self.price_legend.get_texts()[1].set_text(f"MA{m['fast']}")
+        self.price_legend.get_texts()[2].set_text(f"MA{m['slow']}")
+        self.pos_line.set_data(dates, data['pos'])
+        self.strat_line.set_data(dates, data['strat_eq'])
+        self.bh_line.set_data(dates, data['bh_eq'])
+        self.wealth_line.set_data(dates, data['wealth'])
+        for key in ('price', 'eq', 'wealth'):
+            self._rescale(self.axes[key])
+        self.axes['pos'].set_xlim(dates[0], dates[-1])
+
+        r, mu, sigma = data['log_ret'], data['mu'], data['sigma']
+        counts, edges = np.histogram(r, bins=HIST_BINS, density=True)
+        self.hist.set_data(counts, edges)
+        x = np.linspace(edges[0], edges[-1], PDF_POINTS)
+        self.pdf_line.set_data(x, norm.pdf(x, mu, sigma))
+        self._rescale(self.axes['hist'])
+
+        xs, fs = EmpiricalCDF(r).steps()
+        self.ecdf_line.set_data(xs, fs)
+        self.cdf_line.set_data(x, norm.cdf(x, mu, sigma))
+        self.axes['ecdf'].set_xlim(edges[0], edges[-1])
+
+        self.metrics_text.set_text('\n'.join([
+            f"total return {m['total_return']:10.2%}",
+            f"buy & hold   {m['bh_return']:10.2%}",
+            f"sharpe       {m['sharpe']:10.2f}",
+            f"max drawdown {m['max_dd']:10.2%}",
+            f"trades       {m['trades']:10d}",
+            f"mu / sigma   {mu:.5f} / {sigma:.5f}",
+        ]))
+        self.title.set_text(title)
+        self.fig.savefig(path)
+        return path
+
+
+# Per-process renderer and price cache of the report workers
+_worker_state = {}
+
+
+def _prices(ticker) -> pd.DataFrame:
+    cache = _worker_state.setdefault('prices', {})
+    if ticker not in cache:
+        cache[ticker] = load_ohlcv(data_path(ticker))
+    return cache[ticker]
+
+
+def _render_job(args):
+    ticker, fast, slow, start, end, fee_bps, path = args
+    renderer = _worker_state.get('renderer')
+    if renderer is None:
+        renderer = _worker_state['renderer'] = ReportRenderer()
+    df = _prices(ticker).loc[start:end]
+    data = report_data(df, fast, slow, fee_bps)
+    title = f"{ticker}: MA{fast} / MA{slow}  ({df.index[0]:%Y-%m-%d} .. {df.index[-1]:%Y-%m-%d})"
+    return str(renderer.render(data, path, title))
+
+
+def render_reports(jobs, out_dir, fmt: str = 'png', start=None, end=None, fee_bps: float = 0.0,
+                   workers: int = 1) -> list:
+    """
+    Render one report page per job into ``out_dir``.
+
+    Parameters
+    ----------
+    jobs : iterable of (ticker, fast, slow)
+        Tickers are CSV names in data/ ('microsoft', 'apple'...).
+    out_dir : str or Path
+        Output directory (created if needed). Files are named
+        ``<ticker>_ma<fast>_<slow>.<fmt>``.
+    fmt : {'png', 'svg', 'pdf'}
+    start, end : str, optional
+        Date range of every report (e.g. '2015-01-01', '2015-12-31').
+    fee_bps : float
+        Trading cost of the strategy panels.
+    workers : int or None
+        Rendering processes (None = all cores). Each worker builds its renderer once
+        and keeps it for all the pages it receives.
+
+    Returns
+    -------
+    list of str
+        Paths written, in job order.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    tasks = [(t, int(f), int(s), start, end, fee_bps, str(out / f'{t}_ma{f}_{s}.{fmt}')) for t, f, s in jobs]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        return [_render_job(t) for t in tasks]
+    # Contiguous chunks: a worker renders consecutive pages of the same ticker
+    chunksize = max(1, len(tasks) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(_render_job, tasks, chunksize=chunksize))
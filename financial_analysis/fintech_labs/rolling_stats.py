@@ -0,0 +1,254 @@
+"""
+Window statistics engine: mean, var, std, skew and kurtosis in one pass.
+
+Two kinds of windows, both for a single series or a (days x tickers) panel:
+
+- ``block_moments``: fixed calendar blocks (e.g. freq="6MS", Jan-Jun / Jul-Dec), the
+  ``groupby(pd.Grouper(freq=...)).transform(...)`` of mean_sigma_var_microsoft_6m.py
+  but with all five statistics from one segmented reduction instead of one groupby
+  pass per statistic.
+- ``rolling_moments``: true rolling windows of any length, several lengths at once.
+  Window sums of the powers of x come from prefix sums along the time axis (the
+  ``sma_table`` trick), vectorized over rows and tickers. The powers are taken
+  around a local reference value and the prefix sums restart every chunk of rows,
+  so converting them to central moments does not cancel the way raw power sums do.
+
+Conventions follow pandas: var/std use ddof=1, skew is the adjusted Fisher-Pearson
+coefficient, kurt is the unbiased excess kurtosis. NaNs are treated as missing.
+"""
+import numpy as np
+import pandas as pd
+
+STATS = ('mean', 'var', 'std', 'skew', 'kurt')
+
+
+def _finalize(n, mean, m2, m3, m4, stats) -> dict:
+    """
+    Turn counts and central moment sums (M2 = sum (x - mean)^2, ...) into statistics.
+
+    ``n`` may be a (rows, 1) column broadcast against (rows, k) moments: the factors
+    that only depend on the count are then computed once per row.
+    """
+    out = {}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        nm1 = n - 1.0
+        var = m2 / np.where(n > 1, nm1, np.nan)
+        # Variance that is numerically zero makes skew/kurt undefined
+        flat = m2 <= 1e-14 * np.maximum(n, 1) * np.maximum(mean ** 2, 1e-300)
+        if 'mean' in stats:
+            out['mean'] = np.where(n > 0, mean, np.nan)
+        if 'var' in stats:
+            out['var'] = var
+        if 'std' in stats:
+            out['std'] = np.sqrt(var)
+        if 'skew' in stats:
+            # sqrt(n (n-1)) / (n-2) * g1, g1 = sqrt(n) M3 / M2^1.5
+            c = np.where(n > 2, n * np.sqrt(nm1) / (n - 2), np.nan)
+            out['skew'] = np.where(flat, np.nan, c * m3 / (m2 * np.sqrt(m2)))
+        if 'kurt' in stats:
+            # (n-1) / ((n-2) (n-3)) * ((n+1) g2 - 3 (n-1)), g2 = n M4 / M2^2
+            d = np.where(n > 3, (n - 2) * (n - 3), np.nan)
+            c = n * (n * n - 1) / d
+            c0 = 3 * nm1 * nm1 / d
+            out['kurt'] = np.where(flat, np.nan, c * m4 / (m2 * m2) - c0)
+    return out
+
+
+# -------------------------
+# Calendar blocks
+# -------------------------
+
+def block_labels(dates, freq: str = '6MS') -> np.ndarray:
+    """Block number of every date, with the same bins as ``pd.Grouper(freq=freq)``."""
+    s = pd.Series(np.arange(len(dates)), index=pd.DatetimeIndex(dates))
+    return s.groupby(pd.Grouper(freq=freq)).ngroup().to_numpy()
+
+
+def block_moments(x, dates, freq: str = '6MS', stats=STATS, aligned: bool = True) -> dict:
+    """
+    Statistics of ``x`` inside fixed calendar blocks.
+
+    Parameters
+    ----------
+    x : array-like
+        (n,) series or (n, k) panel, rows sorted by date.
+    dates : array-like of datetimes
+        Date of every row.
+    freq : str
+        Block frequency as accepted by ``pd.Grouper`` ('6MS', 'MS', 'QS', 'YS'...).
+    stats : iterable of str
+        Subset of ('mean', 'var', 'std', 'skew', 'kurt').
+    aligned : bool
+        True: every row gets the value of its block (like ``transform``), shape of ``x``.
+        False: one row per block.
+
+    Returns
+    -------
+    dict
+        {stat: np.ndarray}
+    """
+    x = np.asarray(x, dtype=float)
+    squeeze = x.ndim == 1
+    if squeeze:
+        x = x[:, None]
+    labels = block_labels(dates, freq)
+
+    # Blocks are contiguous (rows are sorted by date): reduce each segment at once
+    starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+    valid = ~np.isnan(x)
+    x0 = np.where(valid, x, 0.0)
+
+    n = np.add.reduceat(valid, starts, axis=0).astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.add.reduceat(x0, starts, axis=0) / n
+    # Central moments from deviations to the block mean (two-pass, numerically stable)
+    seg = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(labels)]))
+    dev = np.where(valid, x - mean[seg], 0.0)
+    dev2 = dev * dev
+    m2 = np.add.reduceat(dev2, starts, axis=0)
+    m3 = np.add.reduceat(dev2 * dev, starts, axis=0)
+    m4 = np.add.reduceat(dev2 * dev2, starts, axis=0)
+
+    out = _finalize(n, mean, m2, m3, m4, stats)
+    if aligned:
+        out = {k: v[seg] for k, v in out.items()}
+    if squeeze:
+        out = {k: v[:, 0] for k, v in out.items()}
+    return out
+
+
+# -------------------------
+# Rolling windows
+# -------------------------
+
+# Upper bound on the (rows x tickers) cells of one chunk of the rolling engine, in
+# each of its five prefix-sum arrays
+ROLLING_CHUNK_CELLS = 2 ** 18
+
+# A chunk spans at most this many times the longest window: the prefix sums restart
+# and the reference value moves with the data at least that often, which keeps
+# trending series (prices) accurate
+ROLLING_CHUNK_WINDOWS = 16
+
+
+def rolling_moments(x, windows, stats=STATS, min_periods=None) -> dict:
+    """
+    Rolling statistics for several window lengths at once.
+
+    Parameters
+    ----------
+    x : array-like
+        (n,) series or (n, k) panel (days x tickers). NaNs are skipped.
+    windows : int or sequence of int
+        Window lengths in rows.
+    stats : iterable of str
+        Subset of ('mean', 'var', 'std', 'skew', 'kurt').
+    min_periods : int, optional
+        Minimum non-NaN values in the window to produce a result. Defaults to the
+        window length, like ``Series.rolling(w)``.
+
+    Returns
+    -------
+    dict
+        {stat: array of shape (len(windows), n) or (len(windows), n, k)}.
+        A single int window drops the first axis.
+
+    Notes
+    -----
+    The rows are processed in chunks of a few times the longest window. For each
+    chunk (plus the max(windows) - 1 rows before it) y = x - ref, with ref the chunk
+    mean of each ticker, and the prefix sums P_p of count, y, ..., y^4 (up to the
+    power the requested statistics need) are built once. The sums of any window
+    are then s_p = P_p[t + 1] - P_p[t + 1 - w], for every row, window and ticker
+    at once, and the central moments follow from the power sums (m = s_1 / n):
+
+        M2 = s_2 - n m^2
+        M3 = s_3 - 3 m s_2 + 2 n m^3
+        M4 = s_4 - 4 m s_3 + 6 m^2 s_2 - 3 n m^4
+
+    Memory is the output plus one chunk of prefix sums (``ROLLING_CHUNK_CELLS``).
+    """
+    x = np.asarray(x, dtype=float)
+    squeeze_k = x.ndim == 1
+    if squeeze_k:
+        x = x[:, None]
+    single = np.isscalar(windows)
+    w = np.atleast_1d(np.asarray(windows, dtype=np.int64))
+    if (w < 1).any():
+        raise ValueError("windows must be >= 1")
+    stats = tuple(stats)
+    n_rows, k = x.shape
+    w_max = int(w.max()) if w.size else 1
+    min_n = w if min_periods is None else np.full(len(w), min_periods)
+
+    # Highest power the requested statistics need (kurt: y^4, skew: y^3, var/std: y^2)
+    order = 4 if 'kurt' in stats else 3 if 'skew' in stats else 2 if {'var', 'std'} & set(stats) else 1
+
+    out = {key: np.empty((len(w), n_rows, k)) for key in stats}
+    chunk = max(2 * w_max, min(ROLLING_CHUNK_WINDOWS * w_max, ROLLING_CHUNK_CELLS // max(k, 1)))
+
+    for a in range(0, n_rows, chunk):
+        b = min(a + chunk, n_rows)
+        lo = max(0, a - w_max + 1)                   # history the first rows need
+        seg = x[lo:b]
+        valid = ~np.isnan(seg)
+        with np.errstate(invalid='ignore'):
+            ref = np.nanmean(np.where(valid.any(axis=0), seg, 0.0), axis=0)
+        y = np.where(valid, seg - ref, 0.0)
+
+        # Prefix sums of count, y, ..., y^order behind `pad` rows of zeros, so that
+        # window starts before the first row (partial windows) read 0 like P[0].
+        # Without NaNs the count only depends on the row: it stays a (rows, 1) column
+        # and every count-based factor below is computed once per row, not per cell.
+        pad = w_max - (a - lo)
+        dense = valid.all()
+        count = np.zeros((pad + b - lo + 1, 1 if dense else k))
+        np.cumsum(valid[:, :1] if dense else valid, axis=0, out=count[pad + 1:])
+        prefix = np.zeros((order, pad + b - lo + 1, k))
+        power = y.copy()
+        for p in range(order):
+            np.cumsum(power, axis=0, out=prefix[p, pad + 1:])
+            if p < order - 1:
+                power *= y
+
+        # Rows a..b-1 end at prefix row (t - lo) + pad + 1
+        end = slice(a - lo + pad + 1, b - lo + pad + 1)
+        for i, win in enumerate(w):
+            begin = slice(end.start - win, end.stop - win)
+            n = count[end] - count[begin]
+            sums = prefix[:, end] - prefix[:, begin]
+            s1 = sums[0]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                m = s1 / n
+            m[np.broadcast_to(n == 0, m.shape)] = 0.0
+            m2 = m3 = m4 = 0.0
+            if order >= 2:
+                s2 = sums[1]
+                mm = m * m
+                nmm = n * mm
+                m2 = s2 - nmm
+                # Roundoff of a (numerically) constant window: no spread at all
+                flat = m2 <= 1e-12 * s2
+                m2[flat] = 0.0
+            if order >= 3:
+                m3 = sums[2] - 3 * m * s2 + 2 * nmm * m
+                m3[flat] = 0.0
+            if order >= 4:
+                m4 = sums[3] - 4 * m * sums[2] + 6 * mm * s2 - 3 * nmm * mm
+                np.maximum(m4, 0.0, out=m4)
+                m4[flat] = 0.0
+
+            m += ref
+            res = _finalize(n, m, m2, m3, m4, stats)
+            short = np.broadcast_to(n < min_n[i], (b - a, k))
+            for key, v in res.items():
+                block = out[key][i, a:b]
+                block[...] = v
+                if short.any():
+                    block[short] = np.nan
+
+    if squeeze_k:
+        out = {key: v[..., 0] for key, v in out.items()}
+    if single:
+        out = {key: v[0] for key, v in out.items()}
+    return out
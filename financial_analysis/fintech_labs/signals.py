@@ -0,0 +1,266 @@
+"""
+Pluggable long/flat signal families on the vectorized backtest core.
+
+A signal family turns prices into a (parameter sets x days) boolean position
+matrix; everything after that (lag, trades, costs, equity, Sharpe, drawdown) is the
+shared code of ``fintech_labs.backtest``, so a family only has to describe its
+indicator. Every family computes its indicator for ALL its parameter values in one
+batched pass and ``signal_grid`` evaluates any mix of families in memory-bounded
+chunks.
+
+Built-in families:
+
+    SMACrossover(fast_list, slow_list)   long while SMA(fast) > SMA(slow)
+    EMACrossover(fast_list, slow_list)   long while EMA(fast) > EMA(slow)
+    Momentum(lookbacks)                  long while Close / Close[t - n] - 1 > 0
+    Breakout(windows)                    enter above the previous w-day high, exit
+                                         below the previous w-day low
+
+A new family subclasses ``Signal`` and implements ``params``, ``prepare`` and
+``positions``.
+
+Example::
+
+    signal_grid(prices, [SMACrossover(range(5, 31, 5), range(20, 201, 20)),
+                         EMACrossover([10, 20], [50, 100]),
+                         Momentum([20, 60, 120]),
+                         Breakout([20, 55])], fee_bps=10)
+"""
+import numpy as np
+import pandas as pd
+
+from .backtest import (GRID_CHUNK_CELLS, _position_returns, _strategy_metrics, bh_returns, close_values,
+                       simple_returns, sma_table)
+from .profiling import profiled, stage
+
+
+def ema_table(close: np.ndarray, spans) -> np.ndarray:
+    """
+    Exponential moving averages for several spans in one recursion over time.
+
+    Row i is ``pd.Series(close).ewm(span=spans[i], adjust=False, min_periods=spans[i]).mean()``:
+    e[t] = e[t-1] + alpha * (close[t] - e[t-1]), alpha = 2 / (span + 1), e[0] = close[0],
+    with the first span-1 values set to NaN. The recursion runs once over the days
+    and updates every span at each step.
+    """
+    close = np.asarray(close, dtype=float)
+    spans = np.asarray(spans, dtype=np.int64)
+    alpha = 2.0 / (spans + 1.0)
+
+    out = np.empty((len(spans), close.size))
+    if close.size == 0:
+        return out
+    e = np.full(len(spans), close[0])
+    out[:, 0] = e
+    for t in range(1, close.size):
+        e += alpha * (close[t] - e)
+        out[:, t] = e
+    out[np.arange(close.size)[None, :] < spans[:, None] - 1] = np.nan
+    return out
+
+
+def _crossover_params(fast_list, slow_list) -> pd.DataFrame:
+    pairs = [(f, s) for f in fast_list for s in slow_list if f < s]
+    return pd.DataFrame(pairs, columns=['fast', 'slow'], dtype=np.int64)
+
+
+class Signal:
+    """
+    Base class of a signal family.
+
+    Subclasses set ``name`` and implement:
+
+    - ``params()``: DataFrame with one row per parameter set (its columns name the
+      parameters).
+    - ``prepare(df)``: the indicator tables of every parameter set, computed once
+      per price series (any object; it is only passed back to ``positions``).
+    - ``positions(prepared, rows)``: ``(pos, start)`` for the parameter sets at
+      positions ``rows``: the raw (len(rows) x days) boolean position and, per row,
+      the first day where the indicator is defined.
+    """
+
+    name = 'signal'
+
+    def params(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def prepare(self, df: pd.DataFrame):
+        raise NotImplementedError
+
+    def positions(self, prepared, rows: np.ndarray):
+        raise NotImplementedError
+
+    def labels(self) -> list:
+        """'fast=10, slow=30'-style label of every parameter set."""
+        p = self.params()
+        return [', '.join(f'{k}={v}' for k, v in zip(p.columns, row)) for row in p.itertuples(index=False)]
+
+
+class SMACrossover(Signal):
+    """Long while SMA(fast) > SMA(slow); same positions as ``grid_search``."""
+
+    name = 'sma_cross'
+
+    def __init__(self, fast_list, slow_list):
+        self._params = _crossover_params(fast_list, slow_list)
+
+    def params(self) -> pd.DataFrame:
+        return self._params
+
+    def _table(self, close, windows):
+        return sma_table(close, windows)
+
+    def prepare(self, df: pd.DataFrame):
+        p = self._params
+        windows = np.unique(np.concatenate([p['fast'], p['slow']]))
+        table = self._table(close_values(df), windows)
+        return table, np.searchsorted(windows, p['fast']), np.searchsorted(windows, p['slow'])
+
+    def positions(self, prepared, rows):
+        table, fi, si = prepared
+        return table[fi[rows]] > table[si[rows]], self._params['slow'].to_numpy()[rows] - 1
+
+
+class EMACrossover(SMACrossover):
+    """Long while EMA(fast) > EMA(slow) (``ema_table``), from day slow - 1."""
+
+    name = 'ema_cross'
+
+    def _table(self, close, windows):
+        return ema_table(close, windows)
+
+
+class Momentum(Signal):
+    """Long while the n-day return Close[t] / Close[t - n] - 1 is above ``threshold``."""
+
+    name = 'momentum'
+
+    def __init__(self, lookbacks, threshold: float = 0.0):
+        self._params = pd.DataFrame({'lookback': np.asarray(list(lookbacks), dtype=np.int64)})
+        self.threshold = threshold
+
+    def params(self) -> pd.DataFrame:
+        return self._params
+
+    def prepare(self, df: pd.DataFrame):
+        return close_values(df)
+
+    def positions(self, close, rows):
+        lookback = self._params['lookback'].to_numpy()[rows]
+        t = np.arange(close.size)
+        past = close[np.maximum(t[None, :] - lookback[:, None], 0)]
+        pos = (close[None, :] / past - 1 > self.threshold) & (t[None, :] >= lookback[:, None])
+        return pos, lookback
+
+
+class Breakout(Signal):
+    """
+    Rolling high/low (Donchian) breakout.
+
+    Enter when Close rises above the highest High of the previous ``window`` days,
+    exit when it falls below the lowest Low of the previous ``exit_window`` days
+    (default: the same window), hold in between. Uses Close when the frame has no
+    High / Low columns.
+    """
+
+    name = 'breakout'
+
+    def __init__(self, windows, exit_windows=None):
+        windows = np.asarray(list(windows), dtype=np.int64)
+        exits = windows if exit_windows is None else np.asarray(list(exit_windows), dtype=np.int64)
+        if len(exits) != len(windows):
+            raise ValueError("exit_windows must have one entry per window")
+        self._params = pd.DataFrame({'window': windows, 'exit_window': exits})
+
+    def params(self) -> pd.DataFrame:
+        return self._params
+
+    def prepare(self, df: pd.DataFrame):
+        close = pd.Series(close_values(df))
+        high = pd.Series(np.asarray(df['High'], dtype=float)) if 'High' in df else close
+        low = pd.Series(np.asarray(df['Low'], dtype=float)) if 'Low' in df else close
+        # Previous-w-day extremes of every distinct window (shift(1): today excluded)
+        highs = {w: high.rolling(w).max().shift(1).to_numpy(dtype=float) for w in np.unique(self._params['window'])}
+        lows = {w: low.rolling(w).min().shift(1).to_numpy(dtype=float) for w in np.unique(self._params['exit_window'])}
+        return close.to_numpy(dtype=float), highs, lows
+
+    def positions(self, prepared, rows):
+        close, highs, lows = prepared
+        p = self._params.iloc[rows]
+        upper = np.vstack([highs[w] for w in p['window']])
+        lower = np.vstack([lows[w] for w in p['exit_window']])
+
+        # Last event wins: 1 after an upside break, 0 after a downside break
+        t = np.arange(close.size)
+        up = close[None, :] > upper
+        event = up | (close[None, :] < lower)
+        last = np.maximum.accumulate(np.where(event, t[None, :], -1), axis=1)
+        pos = np.take_along_axis(up, np.maximum(last, 0), axis=1) & (last >= 0)
+        return pos, np.maximum(p['window'], p['exit_window']).to_numpy()
+
+
+@profiled()
+def signal_grid(df: pd.DataFrame, signals, fee_bps: float = 0.0, periods_per_year: float = 252) -> pd.DataFrame:
+    """
+    Backtest every parameter set of every signal family on one price series.
+
+    Parameters
+    ----------
+    df : pd.DataFrame or dict of arrays
+        OHLCV frame (at least 'Close', without NaNs), or a ``TradingCalendar.view``.
+    signals : Signal or list of Signal
+        Families to evaluate; each one prepares its indicators once.
+    fee_bps : float
+        Trading cost in bps on position changes.
+    periods_per_year : float
+        Sharpe annualization (252 for daily bars, see ``fintech_labs.bars.bars_per_year``).
+
+    Returns
+    -------
+    pd.DataFrame
+        signal, params, total_return, bh_return, sharpe, max_dd, trades, final_eq,
+        sorted by Sharpe then total return (like ``grid_search``). For
+        ``SMACrossover`` the metrics are those of ``backtest_ma_crossover``.
+    """
+    if isinstance(signals, Signal):
+        signals = [signals]
+    close = close_values(df)
+    if np.isnan(close).any():
+        raise ValueError("Close contains NaNs")
+    ret = simple_returns(close)
+    step = max(1, GRID_CHUNK_CELLS // max(close.size, 1))
+
+    frames = []
+    for sig in signals:
+        n_params = len(sig.params())
+        if n_params == 0:
+            continue
+        with stage(f'{sig.name}/prepare'):
+            prepared = sig.prepare(df)
+        parts, starts = [], []
+        for i in range(0, n_params, step):
+            with stage(f'{sig.name}/positions'):
+                pos, start = sig.positions(prepared, np.arange(i, min(i + step, n_params)))
+            start = np.asarray(start, dtype=np.int64)
+            if (start >= close.size).any():
+                raise ValueError(f"{sig.name}: window longer than the data ({close.size} rows)")
+            with stage(f'{sig.name}/metrics'):
+                parts.append(_strategy_metrics(*_position_returns(ret, pos, start, fee_bps), start, periods_per_year))
+            starts.append(start)
+        metrics = {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+        frames.append(pd.DataFrame({
+            'signal': sig.name,
+            'params': sig.labels(),
+            'total_return': metrics['total_return'],
+            'bh_return': bh_returns(ret, np.concatenate(starts)),
+            'sharpe': metrics['sharpe'],
+            'max_dd': metrics['max_dd'],
+            'trades': metrics['trades'],
+            'final_eq': metrics['final_eq'],
+        }))
+
+    columns = ['signal', 'params', 'total_return', 'bh_return', 'sharpe', 'max_dd', 'trades', 'final_eq']
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    res = pd.concat(frames, ignore_index=True)
+    return res.sort_values(['sharpe', 'total_return'], ascending=False)
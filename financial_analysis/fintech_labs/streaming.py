@@ -0,0 +1,179 @@
+"""
+Streaming (bar-by-bar) MA crossover for live feeds, O(1) per update.
+"""
+import numpy as np
+
+
+def _kahan_add(total, comp, x):
+    """Compensated (Kahan) addition, same trick pandas uses in rolling().mean()."""
+    y = x - comp
+    t = total + y
+    comp = (t - total) - y
+    return t, comp
+
+
+class StreamingMACrossover:
+    """
+    Incremental moving-average crossover (long-or-flat) for live bar feeds.
+
+    Same rules as ``backtest_ma_crossover`` but fed one bar at a time. Every
+    ``update`` is O(1): the state is a ring buffer with the last ``slow`` closes,
+    running sums for both windows, the current position, equity, peak, drawdown
+    and running mean/variance of the strategy returns (Welford).
+
+    Fed with the same closes, the metrics match the batch function bar-for-bar:
+    the bars before the slow MA exists are the rows ``dropna()`` removes, and the
+    first bar with both MAs starts the equity curve at 1.0.
+
+    ``update`` also accepts an array of closes (one per symbol); then every
+    field of the state is an array and thousands of symbols move together.
+
+    Example
+    -------
+    >>> eng = StreamingMACrossover(fast=10, slow=30, fee_bps=10)
+    >>> for close in ms['Close']:
+    ...     out = eng.update(close)
+    >>> eng.metrics()       # same dict as backtest_ma_crossover(ms, 10, 30, 10)
+    """
+
+    def __init__(self, fast: int, slow: int, fee_bps: float = 0.0):
+        if fast >= slow:
+            raise ValueError("fast must be < slow")
+        self.fast = fast
+        self.slow = slow
+        self.fee_bps = fee_bps
+        self.n_bars = 0
+        self._scalar = True
+        self._buf = None           # (slow, n_symbols) ring buffer, allocated on the first bar
+
+    def _allocate(self, k: int):
+        self._buf = np.zeros((self.slow, k))
+        self._sum_fast = np.zeros(k)
+        self._comp_fast = np.zeros(k)
+        self._sum_slow = np.zeros(k)
+        self._comp_slow = np.zeros(k)
+        self.prev_close = np.full(k, np.nan)
+        self.pos = np.zeros(k, dtype=bool)
+        self.equity = np.ones(k)
+        self.bh_equity = np.ones(k)
+        self.peak = np.ones(k)
+        self.max_dd = np.zeros(k)
+        self.trades = np.zeros(k, dtype=np.int64)
+        # Welford running mean / sum of squared deviations of strat_ret
+        self._count = 0
+        self._mean = np.zeros(k)
+        self._m2 = np.zeros(k)
+
+    @property
+    def ready(self) -> bool:
+        """True once both moving averages exist (the batch backtest's first row)."""
+        return self.n_bars >= self.slow
+
+    def update(self, bar) -> dict:
+        """
+        Feed one bar and get the new signal and metrics.
+
+        Parameters
+        ----------
+        bar : float, array-like or mapping
+            Close price (or one close per symbol), or anything with a 'Close' key
+            such as a dict or a DataFrame row.
+
+        Returns
+        -------
+        dict
+            ready, pos (signal for the next bar), trade, strat_ret, equity,
+            drawdown, max_dd, trades, sharpe. Values are None until ``ready``.
+        """
+        if not np.isscalar(bar) and hasattr(bar, '__getitem__') and not isinstance(bar, np.ndarray):
+            try:
+                bar = bar['Close']
+            except (KeyError, IndexError, TypeError):
+                pass
+        close = np.atleast_1d(np.asarray(bar, dtype=float))
+        if self._buf is None:
+            self._scalar = np.ndim(bar) == 0
+            self._allocate(close.size)
+
+        i = self.n_bars
+        slot = i % self.slow
+
+        # Remove the closes that leave each window, then add the new one
+        if i >= self.fast:
+            self._sum_fast, self._comp_fast = _kahan_add(self._sum_fast, self._comp_fast,
+                                                         -self._buf[(i - self.fast) % self.slow])
+        if i >= self.slow:
+            self._sum_slow, self._comp_slow = _kahan_add(self._sum_slow, self._comp_slow, -self._buf[slot])
+        self._buf[slot] = close
+        self._sum_fast, self._comp_fast = _kahan_add(self._sum_fast, self._comp_fast, close)
+        self._sum_slow, self._comp_slow = _kahan_add(self._sum_slow, self._comp_slow, close)
+        self.n_bars += 1
+
+        if not self.ready:
+            self.prev_close = close
+            return {'ready': False, 'pos': None, 'trade': None, 'strat_ret': None, 'equity': None,
+                    'drawdown': None, 'max_dd': None, 'trades': None, 'sharpe': None}
+
+        pos = (self._sum_fast / self.fast) > (self._sum_slow / self.slow)
+        ret = close / self.prev_close - 1
+
+        if self.n_bars == self.slow:
+            # First bar of the window: no lagged position and no trade yet
+            trade = np.zeros_like(pos)
+            strat_ret = np.zeros_like(close)
+        else:
+            trade = pos != self.pos
+            strat_ret = np.where(self.pos, ret, 0.0) - (self.fee_bps / 10_000.0) * trade
+
+        self.equity = self.equity * (1 + strat_ret)
+        self.bh_equity = self.bh_equity * (1 + ret)
+        self.peak = np.maximum(self.peak, self.equity)
+        drawdown = self.equity / self.peak - 1.0
+        self.max_dd = np.minimum(self.max_dd, drawdown)
+        self.trades += trade
+
+        self._count += 1
+        delta = strat_ret - self._mean
+        self._mean = self._mean + delta / self._count
+        self._m2 = self._m2 + delta * (strat_ret - self._mean)
+
+        self.pos = pos
+        self.prev_close = close
+
+        return self._out({
+            'ready': True,
+            'pos': pos.astype(int),
+            'trade': trade.astype(int),
+            'strat_ret': strat_ret,
+            'equity': self.equity,
+            'drawdown': drawdown,
+            'max_dd': self.max_dd,
+            'trades': self.trades,
+            'sharpe': self._sharpe(),
+        })
+
+    def _sharpe(self):
+        # sqrt(252) * mean / population std, as in backtest_ma_crossover
+        std = np.sqrt(self._m2 / max(self._count, 1))
+        return np.sqrt(252) * self._mean / (std + 1e-12)
+
+    def _out(self, d: dict) -> dict:
+        """Unwrap 1-element arrays when the engine is fed scalars."""
+        if not self._scalar:
+            return d
+        return {k: (v.item() if isinstance(v, np.ndarray) else v) for k, v in d.items()}
+
+    def metrics(self) -> dict:
+        """Summary metrics so far, with the same keys as ``backtest_ma_crossover``."""
+        if not self.ready:
+            raise ValueError(f"need at least {self.slow} bars, got {self.n_bars}")
+        return self._out({
+            'fast': self.fast,
+            'slow': self.slow,
+            'total_return': self.equity - 1,
+            'bh_return': self.bh_equity - 1,
+            'sharpe': self._sharpe(),
+            'max_dd': self.max_dd.copy(),
+            'trades': self.trades.copy(),
+            'final_eq': self.equity.copy(),
+        })
@@ -0,0 +1,110 @@
+"""
+Trading calendar: dates -> row offsets in O(1), date ranges as zero-copy array views.
+
+``df.loc['2015-01-01':'2015-12-01']`` searches the DatetimeIndex and builds a new
+DataFrame; ``backtest_ma_crossover`` then copies the Close column again. For
+thousands of small windows per job those frames dominate. ``TradingCalendar`` keeps
+the price columns as plain (or memory-mapped) NumPy arrays and answers a date range
+with a ``slice`` of row offsets, so every window is a view of the same memory.
+
+Dates are resolved through a table with one entry per CALENDAR day (the first row
+on or after that day), built once: a lookup is an index into that table, whatever
+the number of rows. Non-trading days fall on the next trading day for a start and
+on the previous one for an end, like label slicing on a sorted index. Intraday
+timestamps (a time of day) fall back to a binary search.
+
+Example::
+
+    cal = TradingCalendar.load(data_path('microsoft'))          # memory-mapped columns
+    v = cal.view('2015-01-01', '2015-12-01')                     # {'Date': ..., 'Close': ...} views
+    backtest_ma_crossover(v, fast=10, slow=30, fee_bps=10)
+    for s in cal.period_slices('6MS'):                           # semesters
+        block = cal.arrays['Close'][s]
+"""
+import numpy as np
+
+from .bars import bar_bounds
+from .market_data import load_ohlcv_arrays
+
+
+class TradingCalendar:
+    """
+    Row offsets of a sorted date column and views of its price arrays.
+
+    Parameters
+    ----------
+    dates : array-like of datetimes
+        Sorted dates (several rows per day allowed, e.g. minute bars).
+    arrays : dict of np.ndarray, optional
+        Columns aligned with ``dates`` ('Close', 'Open', ...), returned by ``view``.
+    """
+
+    def __init__(self, dates, arrays=None):
+        self.dates = np.asarray(dates, dtype='datetime64[ns]')
+        if self.dates.size and (self.dates[1:] < self.dates[:-1]).any():
+            raise ValueError("dates must be sorted")
+        self.arrays = {} if arrays is None else dict(arrays)
+        for name, values in self.arrays.items():
+            if len(values) != len(self.dates):
+                raise ValueError(f"column {name!r} has {len(values)} rows, expected {len(self.dates)}")
+
+        # _first[k] = first row whose day is >= day0 + k, for every calendar day of the
+        # range (plus one past the end): the O(1) lookup table
+        days = self.dates.astype('datetime64[D]')
+        self._day0 = days[0] if days.size else np.datetime64(0, 'D')
+        span = int((days[-1] - self._day0).astype(np.int64)) + 1 if days.size else 0
+        self._first = np.searchsorted(days, self._day0 + np.arange(span + 1), side='left')
+
+    @classmethod
+    def load(cls, path, columns=None):
+        """Calendar of a price CSV with its columns (memory maps when the cache is valid)."""
+        arrays = load_ohlcv_arrays(path)
+        names = [c for c in arrays if c != 'Date'] if columns is None else list(columns)
+        return cls(arrays['Date'], {c: arrays[c] for c in names})
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def offset(self, date, side: str = 'left') -> int:
+        """
+        Row offset of ``date``.
+
+        side='left': first row at or after ``date`` (start of a range).
+        side='right': one past the last row at or before ``date`` (end of a range).
+        A bare date (no time of day) covers the whole day on both sides.
+        """
+        t = np.datetime64(date, 'ns')
+        day = t.astype('datetime64[D]')
+        if t != day:
+            return int(np.searchsorted(self.dates, t, side=side))
+        k = int((day - self._day0).astype(np.int64)) + (side == 'right')
+        return int(self._first[min(max(k, 0), len(self._first) - 1)])
+
+    def slice(self, start=None, end=None) -> slice:
+        """Rows from ``start`` to ``end`` INCLUSIVE (like ``.loc[start:end]``); None = open."""
+        i = 0 if start is None else self.offset(start, 'left')
+        j = len(self.dates) if end is None else self.offset(end, 'right')
+        return slice(i, max(i, j))
+
+    def view(self, start=None, end=None, columns=None) -> dict:
+        """
+        ``{'Date': ..., column: ...}`` views of the rows from ``start`` to ``end``.
+
+        No data is copied: the arrays share memory with ``self.arrays`` (and with the
+        memory-mapped cache when the calendar was built by ``load``).
+        """
+        s = self.slice(start, end)
+        names = self.arrays if columns is None else columns
+        out = {'Date': self.dates[s]}
+        out.update({c: self.arrays[c][s] for c in names})
+        return out
+
+    def period_starts(self, freq: str = 'MS') -> np.ndarray:
+        """First row of every period ('MS' months, '6MS' semesters...; bins of ``pd.Grouper``)."""
+        return bar_bounds(self.dates, freq)[0]
+
+    def period_slices(self, freq: str = 'MS') -> list:
+        """Row slices of every non-empty period, e.g. Jan-Jun / Jul-Dec for '6MS'."""
+        starts = self.period_starts(freq)
+        ends = np.r_[starts[1:], len(self.dates)]
+        return [slice(int(i), int(j)) for i, j in zip(starts, ends)]
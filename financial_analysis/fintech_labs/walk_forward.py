@@ -0,0 +1,151 @@
+"""
+Walk-forward optimization of the MA crossover with prefix-sum window reuse.
+"""
+import numpy as np
+import pandas as pd
+
+from .backtest import simple_returns, sma_table
+
+# Sharpe / total return gaps below this are float noise when ranking pairs
+RANK_TOL = 1e-10
+
+
+def walk_forward(df: pd.DataFrame, fast_list, slow_list, train_len: int = 252, test_len: int = 21,
+                 anchored: bool = False, fee_bps: float = 0.0):
+    """
+    Walk-forward optimization of the MA crossover.
+
+    For every fold: pick the best (fast, slow) on the training window (same ranking
+    as ``grid_search``: Sharpe, then total return), trade it on the following test
+    window, then roll forward by ``test_len`` bars. The test windows are stitched
+    into one out-of-sample equity curve.
+
+    Why it is fast
+    --------------
+    Nothing is recomputed per fold:
+    - all SMAs come from ONE cumulative-sum pass over the whole history
+      (an SMA at day t only uses closes up to t, so it is valid for every window);
+    - the strategy return of every pair is computed once for the whole history.
+      Inside a training window [a, b) pair p starts at s = a + slow - 1 (like dropna()
+      in ``backtest_ma_crossover``); its returns are 0 on day s and identical to the
+      full-history returns after it. So sum, sum of squares and sum of log(1 + r)
+      over the window are differences of prefix sums: O(1) per pair and fold.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Must contain a 'Close' column (no NaNs), ideally indexed by date.
+    fast_list, slow_list : iterables of int
+        Parameter grid (pairs with fast >= slow are skipped).
+    train_len, test_len : int
+        Window lengths in bars (e.g. 252 = one year, 21 = monthly refits).
+    anchored : bool
+        False: rolling training window of ``train_len`` bars.
+        True: training always starts at the first bar (expanding window).
+    fee_bps : float
+        Trading cost in bps applied whenever the position changes.
+
+    Returns
+    -------
+    folds : pd.DataFrame
+        One row per refit: train/test dates, chosen fast/slow, in-sample Sharpe and
+        total return, and out-of-sample return of the test window.
+    oos_eq : pd.Series
+        Stitched out-of-sample equity curve (starts at 1.0 on the first test day).
+
+    Notes
+    -----
+    Memory is O(n_pairs x n_days): three prefix-sum matrices are kept for the whole sweep.
+    """
+    close = df['Close'].to_numpy(dtype=float)
+    n = close.size
+    if np.isnan(close).any():
+        raise ValueError("Close contains NaNs")
+    if train_len >= n:
+        raise ValueError(f"train_len={train_len} leaves no out-of-sample data ({n} rows)")
+
+    pairs = [(f, s) for f in fast_list for s in slow_list if f < s]
+    fast = np.array([p[0] for p in pairs], dtype=np.int64)
+    slow = np.array([p[1] for p in pairs], dtype=np.int64)
+    rows = np.arange(len(pairs))
+
+    # ---- Full-history signals and strategy returns, computed once ----
+    ret = simple_returns(close)
+    windows = np.unique(np.concatenate([fast, slow]))
+    sma = sma_table(close, windows)
+    pos = sma[np.searchsorted(windows, fast)] > sma[np.searchsorted(windows, slow)]   # (P, n)
+
+    trade = np.zeros_like(pos)
+    trade[:, 1:] = pos[:, 1:] != pos[:, :-1]
+    pos_lag = np.zeros_like(pos)
+    pos_lag[:, 1:] = pos[:, :-1]
+    strat_ret = np.where(pos_lag, ret, 0.0) - (fee_bps / 10_000.0) * trade
+
+    # Prefix sums: S[:, k] = sum of the first k values
+    def prefix(a):
+        out = np.zeros((a.shape[0], n + 1))
+        np.cumsum(a, axis=1, out=out[:, 1:])
+        return out
+
+    s1 = prefix(strat_ret)
+    s2 = prefix(strat_ret ** 2)
+    slog = prefix(np.log1p(strat_ret))
+
+    # ---- Folds ----
+    sig = np.zeros(n, dtype=bool)        # stitched signal actually traded
+    fold_rows = []
+    b = train_len
+    while b < n:
+        a = 0 if anchored else b - train_len
+        e = min(b + test_len, n)
+
+        # Training statistics of every pair over its own window [s, b)
+        s = a + slow - 1
+        ok = s < b                       # slow window fits inside the training data
+        lo = np.minimum(s + 1, b)
+        m = np.maximum(b - s, 1)
+        tot1 = s1[rows, b] - s1[rows, lo]
+        tot2 = s2[rows, b] - s2[rows, lo]
+        mean = tot1 / m
+        std = np.sqrt(np.maximum(tot2 / m - mean ** 2, 0.0))
+        sharpe = np.where(ok, np.sqrt(252) * mean / (std + 1e-12), -np.inf)
+        total = np.where(ok, np.expm1(slog[rows, b] - slog[rows, lo]), -np.inf)
+
+        # Best pair in grid_search's order: Sharpe desc, then total return desc, ties in
+        # grid order. Prefix-sum differences carry a few ulps of noise that grid_search's
+        # direct sums do not, so exact ties (e.g. pairs long over the whole window) can
+        # differ slightly here: values within RANK_TOL of the best count as tied.
+        tied = sharpe >= sharpe.max() - RANK_TOL
+        tied &= total >= total[tied].max() - RANK_TOL
+        best = int(np.argmax(tied))
+        if not ok[best]:
+            raise ValueError(f"no (fast, slow) pair fits a training window of {b - a} bars")
+
+        # The winner's signal at the close of b-1 sets the position for day b, and so on.
+        # A later fold overwrites sig[e-1] with its own winner's signal.
+        sig[b - 1:e] = pos[best, b - 1:e]
+
+        fold_rows.append({
+            'train_start': df.index[a],
+            'train_end': df.index[b - 1],
+            'test_start': df.index[b],
+            'test_end': df.index[e - 1],
+            'fast': int(fast[best]),
+            'slow': int(slow[best]),
+            'is_sharpe': float(sharpe[best]),
+            'is_total_return': float(total[best]),
+        })
+        b = e
+
+    # ---- Out-of-sample returns of the stitched signal ----
+    t0 = train_len
+    held = sig[t0 - 1:n - 1]                              # position held on day t (lagged signal)
+    changed = sig[t0:] != sig[t0 - 1:n - 1]               # entry/exit on day t
+    oos_ret = np.where(held, ret[t0:], 0.0) - (fee_bps / 10_000.0) * changed
+    oos_eq = pd.Series(np.cumprod(1 + oos_ret), index=df.index[t0:], name='oos_eq')
+
+    folds = pd.DataFrame(fold_rows)
+    starts = df.index.get_indexer(folds['test_start']) - t0
+    ends = df.index.get_indexer(folds['test_end']) - t0
+    folds['oos_return'] = [np.prod(1 + oos_ret[i:j + 1]) - 1 for i, j in zip(starts, ends)]
+    return folds, oos_eq
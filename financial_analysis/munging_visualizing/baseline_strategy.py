@@ -1,43 +1,40 @@
-import pandas as pd
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 
-# ---- Load data ----
-fb = pd.read_csv('../data/facebook.csv')
+# Make the fintech_labs package (in financial_analysis/) importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fintech_labs.market_data import load_ohlcv, data_path
+from fintech_labs.features import FeaturePipeline, next_close, profit, shares, sma, wealth
 
-# If the CSV has a Date column, use it as index for better plots
-if 'Date' in fb.columns:
-    fb['Date'] = pd.to_datetime(fb['Date'])
-    fb = fb.set_index('Date')
+# ---- Load data (Date index, canonical OHLCV columns) ----
+fb = load_ohlcv(data_path('facebook'))
 
 df = fb.loc['2015-01-01':'2015-12-31'].copy()
 
 
-# ---- Features: moving averages ----
-df['MA10'] = df['Close'].rolling(10).mean()
-df['MA50'] = df['Close'].rolling(30).mean()
-
-# Drop rows where MAs are NaN
-df = df.dropna()
-
-# ---- Strategy signal: 1 share if fast > slow else 0 ----
-df['Shares'] = (df['MA10'] > df['MA50']).astype(int)
+# ---- Features ----
+# - MA10 / MA50: moving averages (note: "MA50" really uses a 30-day window)
+# - Shares: strategy signal, 1 share if fast > slow else 0
+# - Close1: tomorrow's close
+# - Profit: tomorrow close - today close if Shares==1 else 0
+# - wealth: accumulated P&L (cumsum of Profit)
+ma_fast = sma(10)
+ma_slow = sma(30).named('MA50')
+held = shares(ma_fast, ma_slow)
+pnl = profit(held)
 
-# ---- Profit: tomorrow close - today close if Shares==1 else 0 ----
-df['Close1'] = df['Close'].shift(-1)
-# df['Profit'] = (df['Close1'] - df['Close']).where(df['Shares'].eq(1), 0)
-df['Profit'] = [df.loc[ei, 'Close1'] - df.loc[ei, 'Close'] if df.loc[ei, 'Shares']==1 else 0 for ei in df.index]
+features = FeaturePipeline([ma_fast, ma_slow, held, next_close(), pnl, wealth(pnl)])
 
-# This is the same than:
-# profit = []
-# for ei in fb.index:
-#     if fb.loc[ei, 'Shares'] == 1:
-#         profit.append(fb.loc[ei, 'Close1'] - fb.loc[ei, 'Close'])
-#     else:
-#         profit.append(0)
-# fb['Profit'] = profit
+# Profit used to be a per-row list comprehension:
+# df['Profit'] = [df.loc[ei, 'Close1'] - df.loc[ei, 'Close'] if df.loc[ei, 'Shares']==1 else 0 for ei in df.index]
+# The pipeline does the same with one vectorized np.where:
+# Profit = where(Shares == 1, Close1 - Close, 0)
+df = features.run(df)
 
-# ---- Wealth (accumulated P&L) ----
-df['wealth'] = df['Profit'].cumsum()
+# Drop rows where MAs are NaN (Shares=0 and Profit=0 there, so wealth is unchanged)
+df = df.dropna(subset=['MA10', 'MA50'])
 
 # Save
 df.to_csv('../data_aux/facebook_features.csv')
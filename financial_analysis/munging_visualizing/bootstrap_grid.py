@@ -0,0 +1,48 @@
+"""
+Bootstrap confidence intervals for the MA crossover: one backtest and the whole grid.
+
+The computation lives in ``fintech_labs.bootstrap_grid``; this script is only the
+command line.
+
+Usage::
+
+    python bootstrap_grid.py --reps 2000 --seed 0
+    python bootstrap_grid.py --ticker apple --method moving_block --block 10
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Make the fintech_labs package (in financial_analysis/) importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fintech_labs.bootstrap_grid import bootstrap_backtest, bootstrap_grid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bootstrap confidence intervals for MA crossover backtests")
+    parser.add_argument('--ticker', default='microsoft')
+    parser.add_argument('--start', default='2015-01-01')
+    parser.add_argument('--end', default='2015-12-01')
+    parser.add_argument('--fee-bps', type=float, default=10.0)
+    parser.add_argument('--reps', type=int, default=2000)
+    parser.add_argument('--method', default='stationary', choices=['iid', 'moving_block', 'stationary'])
+    parser.add_argument('--block', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    from fintech_labs.market_data import load_ohlcv, data_path
+
+    prices = load_ohlcv(data_path(args.ticker)).loc[args.start:args.end]
+    opts = dict(fee_bps=args.fee_bps, reps=args.reps, method=args.method, block=args.block, seed=args.seed)
+
+    # 1) One backtest with 95% intervals (stationary bootstrap, mean block of 20 days)
+    print(bootstrap_backtest(prices, fast=10, slow=30, **opts))
+
+    # 2) The whole grid: which pairs can we actually tell apart from the best one?
+    res = bootstrap_grid(prices, fast_list=range(5, 31, 5), slow_list=range(20, 201, 20), **opts)
+    print(res[['fast', 'slow', 'sharpe', 'sharpe_lo', 'sharpe_hi', 'indistinguishable']].head(15))
+    print("Pairs indistinguishable from the best:", int(res['indistinguishable'].sum()), "of", len(res))
+
+
+if __name__ == "__main__":
+    main()
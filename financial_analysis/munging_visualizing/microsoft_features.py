@@ -1,31 +1,37 @@
-import pandas as pd
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-import matplotlib.ticker as mticker
-
-# Load Microsoft stock data from CSV file
-ms = pd.read_csv('../data/microsoft.csv', index_col='Date', parse_dates=['Date'])
-
-# Calculate the price difference between the next day's close and today's close
-ms['PriceDiff'] = ms['Close'].shift(-1) - ms['Close']
 
-# Calculate the daily return
-ms['Return'] = ms['PriceDiff'] / ms['Close']
-
-# Determine the price movement direction (1 for up, 0 for down/flat)
-ms['Direction'] = [1 if ms['PriceDiff'].loc[el] > 0 else 0 for el in ms.index]
+# Make the fintech_labs package (in financial_analysis/) importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fintech_labs.market_data import load_ohlcv, data_path
+from fintech_labs.features import FeaturePipeline, price_diff, simple_return, direction, sma
+
+# Load Microsoft stock data (Date index, cached after the first read)
+ms = load_ohlcv(data_path('microsoft'))
+
+# Features (computed with vectorized NumPy, in dependency order, in one pass):
+# - PriceDiff: next day's close - today's close
+# - Return: PriceDiff / Close (daily return)
+# - Direction: 1 for up, 0 for down/flat (no per-row .loc lookups)
+# - ma30/ma60/ma120: moving averages of the closing price
+features = FeaturePipeline([
+    price_diff(),
+    simple_return(),
+    direction(),
+    sma(30).named('ma30'),
+    sma(60).named('ma60'),
+    sma(120).named('ma120'),
+])
+
+# Compute the features and save the processed DataFrame to a new CSV file
+ms = features.to_csv(ms, '../data_aux/microsoft_features.csv')
 
 # Print price difference and direction for a specific date
 print('Price difference on {} is {}. direction is {}'.format('2015-01-06', ms['PriceDiff'].loc['2015-01-06'], ms['Direction'].loc['2015-01-06']))
 
-# Calculate the 60-day moving average (MA60) of the closing price
-ms['ma30'] = ms['Close'].rolling(30).mean()
-ms['ma60'] = ms['Close'].rolling(60).mean()
-ms['ma120'] = ms['Close'].rolling(120).mean()
-
-# Save the processed DataFrame to a new CSV file
-ms.to_csv('../data_aux/microsoft_features.csv')
-
 
 # Plot the 60-day moving average and the closing price for the year 2015
 # plt.figure(figsize=(8, 7))
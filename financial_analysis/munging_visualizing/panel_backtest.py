@@ -0,0 +1,73 @@
+"""
+MA crossover on every ticker in data/ at once, plus the equal-weight portfolio.
+
+The computation lives in ``fintech_labs.panel_backtest``; this script is only the
+command line.
+
+Usage::
+
+    python panel_backtest.py --fast 10 --slow 30 --fee-bps 10
+    python panel_backtest.py --check --no-plot      # compare with backtest_ma_crossover
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Make the fintech_labs package (in financial_analysis/) importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fintech_labs.backtest import backtest_ma_crossover
+from fintech_labs.market_data import data_path, load_ohlcv
+from fintech_labs.panel_backtest import load_close_panel, panel_backtest
+
+
+def check_against_single(metrics, fast, slow, fee_bps):
+    """Tickers whose panel metrics differ from ``backtest_ma_crossover`` on their own CSV."""
+    mismatches = []
+    for ticker, row in metrics.iterrows():
+        ref = backtest_ma_crossover(load_ohlcv(data_path(ticker)), fast, slow, fee_bps=fee_bps)
+        bad = [k for k, v in ref.items() if not np.isclose(row[k], v, rtol=1e-9, atol=1e-12)]
+        if bad:
+            mismatches.append((ticker, bad))
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MA crossover backtest on all tickers in data/")
+    parser.add_argument('--fast', type=int, default=10)
+    parser.add_argument('--slow', type=int, default=30)
+    parser.add_argument('--fee-bps', type=float, default=10.0)
+    parser.add_argument('--no-plot', action='store_true')
+    parser.add_argument('--check', action='store_true',
+                        help='check every ticker against backtest_ma_crossover (exit 1 on mismatch)')
+    args = parser.parse_args(argv)
+
+    # Every ticker in data/, one pass
+    closes = load_close_panel()
+    metrics, portfolio_eq = panel_backtest(closes, fast=args.fast, slow=args.slow, fee_bps=args.fee_bps)
+    print(metrics)
+
+    if args.check:
+        mismatches = check_against_single(metrics, args.fast, args.slow, args.fee_bps)
+        for ticker, keys in mismatches:
+            print(f"MISMATCH {ticker}: {', '.join(keys)}")
+        print("check:", "FAILED" if mismatches else "every ticker matches backtest_ma_crossover")
+        if mismatches:
+            return 1
+
+    if args.no_plot:
+        return 0
+
+    import matplotlib.pyplot as plt
+
+    portfolio_eq.plot()
+    plt.title(f"Equal-weight MA{args.fast}/MA{args.slow} portfolio (all tickers in data/)")
+    plt.xlabel("Date")
+    plt.ylabel("Equity (starts at 1.0)")
+    plt.show()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
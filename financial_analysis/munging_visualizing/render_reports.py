@@ -0,0 +1,42 @@
+"""
+Render report pages (price + MAs, signal, equity, wealth, return histogram, ECDF)
+for many tickers and MA pairs into PNG/SVG files, without opening any window.
+
+The renderer lives in ``fintech_labs.reports``; this script is only the command line.
+
+Usage::
+
+    python render_reports.py                                          # bundled tickers, MA10/30
+    python render_reports.py --tickers microsoft apple --pairs 10:30 20:60 --fmt svg
+    python render_reports.py --start 2015-01-01 --end 2015-12-31 --workers 4 --out ../reports
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Make the fintech_labs package (in financial_analysis/) importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fintech_labs.reports import render_reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless batch report renderer")
+    parser.add_argument('--tickers', nargs='+', default=['microsoft', 'apple', 'facebook'])
+    parser.add_argument('--pairs', nargs='+', default=['10:30'], help="fast:slow MA pairs")
+    parser.add_argument('--start')
+    parser.add_argument('--end')
+    parser.add_argument('--fee-bps', type=float, default=10.0)
+    parser.add_argument('--fmt', default='png', choices=['png', 'svg', 'pdf'])
+    parser.add_argument('--out', default=str(Path(__file__).resolve().parents[1] / 'reports'))
+    parser.add_argument('--workers', type=int, default=1, help="rendering processes (0 = all cores)")
+    args = parser.parse_args(argv)
+
+    pairs = [tuple(int(v) for v in p.split(':')) for p in args.pairs]
+    jobs = [(t, fast, slow) for t in args.tickers for fast, slow in pairs]
+    paths = render_reports(jobs, args.out, fmt=args.fmt, start=args.start, end=args.end,
+                           fee_bps=args.fee_bps, workers=args.workers or None)
+    print(f"{len(paths)} reports written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Replay a ticker bar by bar through the streaming MA crossover and compare it with
+the batch backtest.
+
+The engine lives in ``fintech_labs.streaming``; this script is only the command line.
+
+Usage::
+
+    python streaming_ma_crossover.py --ticker microsoft --fast 10 --slow 30
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Make the fintech_labs package (in financial_analysis/) importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fintech_labs.streaming import StreamingMACrossover
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming MA crossover replay")
+    parser.add_argument('--ticker', default='microsoft')
+    parser.add_argument('--fast', type=int, default=10)
+    parser.add_argument('--slow', type=int, default=30)
+    parser.add_argument('--fee-bps', type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    from fintech_labs.backtest import backtest_ma_crossover
+    from fintech_labs.market_data import load_ohlcv, data_path
+
+    prices = load_ohlcv(data_path(args.ticker))
+
+    # Replay the history bar by bar as if it was a live feed
+    eng = StreamingMACrossover(fast=args.fast, slow=args.slow, fee_bps=args.fee_bps)
+    for close in prices["Close"]:
+        eng.update(close)
+
+    print("streaming:", eng.metrics())
+    print("batch:    ", backtest_ma_crossover(prices, fast=args.fast, slow=args.slow, fee_bps=args.fee_bps))
+
+
+if __name__ == "__main__":
+    main()
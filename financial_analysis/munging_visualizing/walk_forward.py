@@ -0,0 +1,56 @@
+"""
+Walk-forward optimization of the MA crossover: refit on a rolling training window,
+trade the next test window, plot the stitched out-of-sample equity.
+
+The computation lives in ``fintech_labs.walk_forward``; this script is only the
+command line.
+
+Usage::
+
+    python walk_forward.py --ticker apple --train 252 --test 21
+    python walk_forward.py --anchored --no-plot
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Make the fintech_labs package (in financial_analysis/) importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fintech_labs.walk_forward import walk_forward
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Walk-forward optimization of the MA crossover")
+    parser.add_argument('--ticker', default='apple')
+    parser.add_argument('--train', type=int, default=252, help="training window in bars")
+    parser.add_argument('--test', type=int, default=21, help="test window (refit period) in bars")
+    parser.add_argument('--anchored', action='store_true', help="expanding instead of rolling training window")
+    parser.add_argument('--fee-bps', type=float, default=10.0)
+    parser.add_argument('--no-plot', action='store_true')
+    args = parser.parse_args(argv)
+
+    from fintech_labs.market_data import load_ohlcv, data_path
+
+    prices = load_ohlcv(data_path(args.ticker))
+
+    # Rolling 1-year training window, monthly refits (by default)
+    folds, oos_eq = walk_forward(prices, fast_list=range(5, 31, 5), slow_list=range(20, 201, 20),
+                                 train_len=args.train, test_len=args.test, anchored=args.anchored,
+                                 fee_bps=args.fee_bps)
+    print(folds.tail(10))
+    print("Out-of-sample total return:", oos_eq.iloc[-1] - 1)
+
+    if args.no_plot:
+        return
+
+    import matplotlib.pyplot as plt
+
+    oos_eq.plot()
+    plt.title("Walk-forward out-of-sample equity (MA crossover, refit every test window)")
+    plt.xlabel("Date")
+    plt.ylabel("Equity (starts at 1.0)")
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
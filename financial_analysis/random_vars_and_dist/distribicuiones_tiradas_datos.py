@@ -1,15 +1,29 @@
+import sys
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Make the fintech_labs package (in financial_analysis/) importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fintech_labs.discrete_sums import DIE, clt_distance, sum_pmf
+
 np.random.seed(0)
 rolls = [1, 2, 3, 5, 10, 15, 100]
 trials = 50000  # simulaciones por caso
 
+# Distancia exacta a la Normal (TCL) para cada n, sin simular nada
+print(clt_distance(DIE, rolls + [1000], start=1))
+
 for n in rolls:
     s = np.random.randint(1, 7, size=(trials, n)).sum(axis=1)
+    # PMF exacta de la suma (convolución por FFT); es una densidad porque el paso es 1
+    support, pmf = sum_pmf(DIE, n, start=1)
     plt.figure()
-    plt.hist(s, bins="auto", density=True)
+    plt.hist(s, bins="auto", density=True, label=f"Monte Carlo (trials={trials})")
+    plt.plot(support, pmf, 'r.-', lw=1, ms=3, label="PMF exacta")
     plt.title(f"Suma de {n} dado(s) (trials={trials})")
     plt.xlabel("Suma")
     plt.ylabel("Densidad")
+    plt.legend()
     plt.show()
@@ -1,23 +1,36 @@
-import pandas as pd
-import numpy as np
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 
-ms = pd.read_csv('../data/microsoft.csv')
+# Make the fintech_labs package (in financial_analysis/) importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fintech_labs.market_data import load_ohlcv, data_path, DATA_DIR
+from fintech_labs.feature_store import default_store
+from fintech_labs.features import log_return
+from fintech_labs.dist_fit import fit_distributions, pdf_grid, FitCache
+
+ms = load_ohlcv(data_path('microsoft'))
 print(ms.head())
 
 # let play around with ms data by calculating the log daily return
-ms['LogReturn'] = np.log(ms['Close']).shift(-1) - np.log(ms['Close'])
+# LogReturn = log(Close).shift(-1) - log(Close), served by the feature store
+# (computed once per session, shared with other scripts/notebook cells)
+ms['LogReturn'] = default_store().get('microsoft', log_return())
 
 # Plot a histogram to show the distribution of log return of Microsoft's stock.
-# You can see it is very close to a normal distribution
-from scipy.stats import norm
-mu = ms['LogReturn'].mean()
-sigma = ms['LogReturn'].std(ddof=1)
+# You can see it is very close to a normal distribution... except in the tails.
+# Fit a Normal and a Student-t (fitted parameters are cached by data fingerprint)
+fits = fit_distributions({'microsoft': ms['LogReturn']}, dists=('norm', 't'),
+                         cache=FitCache(DATA_DIR / '.cache' / 'fits.json'))
+print(fits.drop(columns='params'))
 
-density = pd.DataFrame()
-density['x'] = np.arange(ms['LogReturn'].min()-0.01, ms['LogReturn'].max()+0.01, 0.001)
-density['pdf'] = norm.pdf(density['x'], mu, sigma)
+lo, hi = ms['LogReturn'].min() - 0.01, ms['LogReturn'].max() + 0.01
+normal = pdf_grid('norm', fits.loc[('microsoft', 'norm'), 'params'], lo, hi)
+student = pdf_grid('t', fits.loc[('microsoft', 't'), 'params'], lo, hi)
 
-ms['LogReturn'].hist(bins=50, figsize=(15, 8))
-plt.plot(density['x'], density['pdf'], color='red')
+ms['LogReturn'].hist(bins=50, figsize=(15, 8), density=True)
+plt.plot(normal['x'], normal['pdf'], color='red', label='Normal')
+plt.plot(student['x'], student['pdf'], color='green', label='Student-t')
+plt.legend()
 plt.show()
@@ -1,17 +1,25 @@
+import sys
+from pathlib import Path
+
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
-from scipy.stats import norm
+
+# Make the fintech_labs package (in financial_analysis/) importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fintech_labs.market_data import load_ohlcv, data_path, DATA_DIR
+from fintech_labs.feature_store import default_store
+from fintech_labs.features import log_return
+from fintech_labs.hypothesis_tests import return_tests, rolling_windows
+from fintech_labs.ecdf import EmpiricalCDF
+from fintech_labs.dist_fit import fit_distributions, pdf_grid, FitCache
+from fintech_labs.horizon_risk import HORIZONS, normal_tail_prob, simulate_horizons, empirical_tail_prob, cube_frame
 
 # -----------------------------
 # 1) Load data
 # -----------------------------
-ms = pd.read_csv('../data/microsoft.csv')  # Load Microsoft's historical prices
+ms = load_ohlcv(data_path('microsoft'))   # Load Microsoft's historical prices (Close is already float64)
 print(ms.head())                          # In a .py script you must print to see it
 
-# Ensure the Close column is numeric (sometimes CSVs load as strings)
-ms['Close'] = pd.to_numeric(ms['Close'], errors='coerce')
-
 # -----------------------------
 # 2) Compute returns
 # -----------------------------
@@ -20,7 +28,8 @@ ms['SimpleReturn'] = ms['Close'].shift(-1) / ms['Close'] - 1.0
 # ms['SimpleReturn'] = ms['SimpleReturn'].sort_values().to_numpy()
 
 # Log return (aka continuously-compounded return): ln(P_{t+1}/P_t)
-ms['LogReturn'] = np.log(ms['Close'].shift(-1)) - np.log(ms['Close'])
+# Served by the feature store: computed once per session, shared with other scripts
+ms['LogReturn'] = default_store().get('microsoft', log_return())
 # ms['LogReturn'] = ms['LogReturn'].sort_values().to_numpy()
 
 
@@ -30,27 +39,25 @@ ms = ms.dropna(subset=['SimpleReturn', 'LogReturn']).copy()
 # -----------------------------
 # 3) Fit a Normal distribution to LogReturn
 # -----------------------------
+r = ms["LogReturn"].dropna().to_numpy()
+
+# Normal vs Student-t vs skew-normal, fitted once (cached on disk between runs)
+fits = fit_distributions({'microsoft': r}, cache=FitCache(DATA_DIR / '.cache' / 'fits.json'))
+
 # mu: sample mean of daily log returns (average daily log return)
-mu = ms['LogReturn'].mean()
+# sigma: sample standard deviation of daily log returns (volatility), ddof=1
+mu, sigma = fits.loc[('microsoft', 'norm'), 'params']
 
 # mur: sample mean of daily returns (average daily return)
 mur = ms['SimpleReturn'].mean()
 
-# sigma: sample standard deviation of daily log returns (volatility)
-# ddof=1 => divide by (n-1), i.e. sample std
-sigma = ms['LogReturn'].std(ddof=1)
-
 print(f"mu (mean log return, daily) = {mu:.6f}")
 print(f"mur (mean return, daily) = {mur:.6f}")
 print(f"sigma (std log return, daily) = {sigma:.6f}")
 
-# Create an x-grid to draw the fitted Normal PDF/CDF
-x_min = ms['LogReturn'].min() - 0.01
-x_max = ms['LogReturn'].max() + 0.01
-x = np.arange(x_min, x_max, 0.001)
-
-pdf = norm.pdf(x, loc=mu, scale=sigma)  # Probability Density Function (height, not probability)
-cdf = norm.cdf(x, loc=mu, scale=sigma)  # Cumulative Distribution Function P(X <= x)
+# Fitted Normal PDF (height, not probability) and CDF P(X <= x) on an x-grid for the plots
+grid = pdf_grid('norm', (mu, sigma), r.min() - 0.01, r.max() + 0.01)
+x, pdf, cdf = grid['x'], grid['pdf'], grid['cdf']
 
 # -----------------------------
 # 4) Plots (more explanatory)
@@ -79,9 +86,9 @@ axes[1, 0].legend()
 
 # (D) CDF of the fitted Normal (helps interpret probabilities)
 
-r = ms["LogReturn"].dropna().to_numpy()
-r_sorted = np.sort(r)
-ecdf = np.arange(1, len(r_sorted)+1) / len(r_sorted)
+# Sorted once: every tail probability / quantile below is a binary search, not a scan
+r_index = EmpiricalCDF(r)
+r_sorted, ecdf = r_index.steps()
 axes[1, 1].plot(r_sorted, ecdf, marker='.', linestyle='none', label="Empirical CDF")
 
 axes[1, 1].plot(x, cdf, linewidth=2)
@@ -92,12 +99,36 @@ axes[1, 1].set_ylabel("Cumulative probability")
 plt.tight_layout()
 plt.show()
 
-p_emp = np.mean(r < -0.05)
-p_norm = norm.cdf(-0.05, loc=mu, scale=sigma)
+p_emp = r_index.tail_prob(-0.05)
+p_norm = fits.loc[('microsoft', 'norm'), 'P(X<-0.05)']
 print("Daily P(X < -0.05)  empirical:", p_emp, " normal:", p_norm)
 
-mu_a = mu * 252
-sigma_a = sigma * np.sqrt(252)
-
-p_year_norm = norm.cdf(-0.40, loc=mu_a, scale=sigma_a)
+# Scale to longer horizons: X_h ~ N(mu * h, sigma * sqrt(h)), all horizons/thresholds at once
+thresholds = [-0.05, -0.10, -0.20, -0.40]
+p_norm_cube = normal_tail_prob(mu, sigma, HORIZONS, thresholds)
+p_year_norm = p_norm_cube[0, HORIZONS.index(252), thresholds.index(-0.40)]
 print("Annual approx P(X_year < -0.40) normal:", p_year_norm)
+
+# Same cube without the Normal assumption: resample real daily returns (block bootstrap)
+sims = simulate_horizons(r, HORIZONS, paths=20_000, method='stationary', seed=0)
+print(pd.concat({'normal': cube_frame(p_norm_cube, ['microsoft'], HORIZONS, thresholds),
+                 'bootstrap': cube_frame(empirical_tail_prob(sims, thresholds), ['microsoft'], HORIZONS, thresholds)},
+                axis=1))
+
+# Historical (empirical) 1-day risk at 95% and 99%, as positive losses
+print("Empirical VaR 95%/99%: ", r_index.var([0.05, 0.01]))
+print("Empirical CVaR 95%/99%:", r_index.cvar([0.05, 0.01]))
+
+# Which parametric family gets the left tail right? (Normal vs Student-t vs skew-normal)
+print(fits[['aic', 'ks', 'P(X<-0.05)', 'P(X<-0.05)_emp']])
+
+# -----------------------------
+# 5) Hypothesis tests on the mean log return
+# -----------------------------
+# H0: mean daily log return = 0 (t and z), H0: log returns are Normal (Jarque-Bera)
+print(return_tests(r, index=['microsoft']).T)
+
+# Same tests on every 252-day window at once (one row per window, no Python loop)
+by_window = return_tests(rolling_windows(r, 252), index=ms.index[251:len(r)])
+print("Windows where the mean is significant at 5%:", int((by_window['t_p'] < 0.05).sum()), "of", len(by_window))
+print("Windows where normality is rejected at 5%:", int((by_window['jb_p'] < 0.05).sum()), "of", len(by_window))
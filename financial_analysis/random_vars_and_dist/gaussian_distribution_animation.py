@@ -1,12 +1,33 @@
+"""
+Animación de la Normal N(mu, sigma^2) mientras mu y sigma cambian, con las áreas ±1σ y ±2σ.
+
+Todos los frames se calculan ANTES de animar, como un único array (FRAMES x N_POINTS):
+la curva, las áreas rellenas y las líneas verticales de cada frame. En la animación
+cada frame solo copia esos datos en artistas que ya existen (nada se borra ni se
+recrea) y se dibuja con blit=True (solo se repintan los artistas que cambian).
+
+Uso::
+
+    python gaussian_distribution_animation.py                    # ventana interactiva
+    python gaussian_distribution_animation.py --save normal.mp4  # exporta (ffmpeg; sin él, GIF), sin ventana
+    python gaussian_distribution_animation.py --save normal.gif  # exporta (Pillow), sin ventana
+"""
+import argparse
+import sys
+from pathlib import Path
+
 import numpy as np
 
-# Fuerza un backend "interactivo" para que la ventana de Matplotlib se muestre bien
-# (TkAgg suele funcionar en muchos entornos; Qt5Agg si tienes Qt instalado).
-import matplotlib
-matplotlib.use("TkAgg")
+# Make the fintech_labs package (in financial_analysis/) importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+# pdf(x, mu, sigma) de la Normal, con broadcasting: con x de forma (1, N) y mu, sigma de
+# forma (F, 1) devuelve la tabla (F, N). Es la misma que usa normal_sigma_sweep.py.
+from fintech_labs.normal_sweep import pdf
 
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
+# El backend lo elige Matplotlib (o la variable de entorno MPLBACKEND, p. ej.
+# MPLBACKEND=TkAgg o Qt5Agg si la ventana no aparece). No se fuerza aquí:
+# matplotlib.use("TkAgg") fallaba en equipos sin pantalla y en procesos de cálculo.
+# pyplot se importa dentro de main(), cuando ya se sabe si hay que exportar.
 
 
 # =========================
@@ -39,203 +60,212 @@ LINE_WIDTH = 2  # equivale a lw=2
 AREA_1SIGMA = 0.682689492  # P(|Z|<=1)
 AREA_2SIGMA = 0.954499736  # P(|Z|<=2)
 
-# =========================
-# DATOS BASE
-# =========================
-
-# linspace devuelve un numpy.ndarray (array) con N_POINTS valores equiespaciados
-x = np.linspace(X_MIN, X_MAX, N_POINTS)
-
-
-# =========================
-# FIGURA Y EJES
-# =========================
-
-# plt.subplots() devuelve una tupla: (fig, ax)
-# - fig: el objeto Figure (la "ventana"/lienzo completo)
-# - ax: el objeto Axes (los ejes donde dibujas la curva)
-# La asignación "fig, ax = ..." es asignación múltiple (unpacking) en Python.
-fig, ax = plt.subplots()
-
-# ax.plot(...) devuelve una lista de objetos Line2D (aunque sea una sola línea).
-# "line, = ..." (con coma) hace unpacking del primer (y único) elemento de esa lista.
-# lw=2 significa line width = grosor de la línea.
-line, = ax.plot([], [], lw=LINE_WIDTH)
-
-# Límites visibles de los ejes
-ax.set_xlim(X_MIN, X_MAX)     # xlim: rango mostrado en el eje X
-ax.set_ylim(0, Y_MAX)         # ylim: rango mostrado en el eje Y (densidad siempre >= 0)
-
-# Mostrar varianza
-txt_var = ax.text(0.02, 0.95, "", transform=ax.transAxes, va="top")
-
-
-# =========================
-# MODELO: PDF Normal
-# =========================
-
-def pdf(x, mu, sigma):
-    """PDF (densidad) de la Normal N(mu, sigma^2).
-    - x puede ser escalar o array (NumPy vectoriza).
-    - Devuelve un array si x es array.
-    """
-    return (1 / (sigma * np.sqrt(2*np.pi))) * np.exp(-((x - mu)**2) / (2 * sigma**2))
-
 
 # =========================
 # UTIL: interpolación lineal de parámetros
 # =========================
 
 def lerp(a, b, t):
-    """Linear interpolation: a -> b, con t en [0,1]."""
+    """Linear interpolation: a -> b, con t en [0,1] (t también puede ser un array)."""
     return a + (b - a) * t
 
-# =========================
-# Elementos extra: líneas y áreas
-# =========================
-
-# Líneas verticales: mu, mu±sigma, mu±2sigma
-v_mu   = ax.axvline(0, lw=1)
-v_m1   = ax.axvline(0, lw=1, ls="--")
-v_p1   = ax.axvline(0, lw=1, ls="--")
-v_m2   = ax.axvline(0, lw=1, ls=":")
-v_p2   = ax.axvline(0, lw=1, ls=":")
-
-# Rellenos (guardamos el "handle" para poder borrarlo y redibujar cada frame)
-fill_1 = None
-fill_2 = None
 
 # =========================
-# ANIMACIÓN
+# PRECÁLCULO: todos los frames de una vez
 # =========================
 
-def init():
-    """
-    init() se ejecuta UNA vez al arrancar la animación.
-    Su objetivo es dejar el gráfico en un estado inicial consistente:
-    - la curva con datos (x, y)
-    - las líneas verticales colocadas en mu, mu±sigma, mu±2sigma
-    - los rellenos (áreas) dibujados para ±1σ y ±2σ
+def _area_verts(x, y):
     """
-    global fill_1, fill_2  # vamos a reasignar estos objetos (rellenos) aquí
-
-    # Estado inicial: usa el inicio de los rangos configurados
-    mu0 = MU_START
-    sigma0 = SIGMA_START
-
-    # Texto varianza
-    txt_var.set_text(f"sigma={sigma0:.3f}   Var=sigma^2={sigma0**2:.3f}")
-
-    # Calcula y = f(x) para la normal N(mu0, sigma0^2)
-    y0 = pdf(x, mu0, sigma0)
+    Vértices del polígono "área bajo y" para cada frame: (F, 2N, 2).
 
-    # Carga los datos en el objeto Line2D ya creado por ax.plot(...)
-    # Esto es lo que realmente "dibuja" la curva.
-    line.set_data(x, y0)
-
-    # --- NUEVO: líneas de referencia (verticales) ---
-    # set_xdata([a,a]) en una línea vertical hace que la línea se coloque en x=a
-    v_mu.set_xdata([mu0, mu0])  # línea en el centro (mu)
-
-    # líneas discontinuas en mu±sigma
-    v_m1.set_xdata([mu0 - sigma0, mu0 - sigma0])
-    v_p1.set_xdata([mu0 + sigma0, mu0 + sigma0])
+    Es el mismo polígono que dibuja fill_between(x, y): ida por la curva y vuelta
+    por el eje (y = 0). Se calcula para todos los frames con una sola operación.
+    """
+    frames = y.shape[0]
+    top = np.stack(np.broadcast_arrays(x, y), axis=-1)                        # (F, N, 2)
+    bottom = np.stack(np.broadcast_arrays(x[::-1], np.zeros((frames, 1))), axis=-1)
+    return np.concatenate([top, bottom], axis=1)
 
-    # líneas punteadas en mu±2sigma
-    v_m2.set_xdata([mu0 - 2*sigma0, mu0 - 2*sigma0])
-    v_p2.set_xdata([mu0 + 2*sigma0, mu0 + 2*sigma0])
 
-    # --- NUEVO: rellenos (áreas) ---
-    # En Matplotlib, fill_between devuelve un PolyCollection.
-    # Para "animarlo" simple, lo habitual es borrarlo (remove) y recrearlo.
-    if fill_1:
-        fill_1.remove()
-    if fill_2:
-        fill_2.remove()
+def precompute_frames(frames=FRAMES, n_points=N_POINTS):
+    """
+    Curva, áreas ±1σ / ±2σ y posiciones de las líneas verticales de TODOS los frames.
+
+    Devuelve un dict de arrays:
+    - x: (N,)            eje X
+    - mu, sigma: (F,)    parámetros de cada frame
+    - y: (F, N)          pdf de cada frame
+    - verts1, verts2: (F, 2N, 2) polígonos de las áreas ±1σ y ±2σ
+    - vlines: (F, 5)     posiciones de mu, mu±sigma, mu±2sigma
+    """
+    x = np.linspace(X_MIN, X_MAX, n_points)
 
-    # Calcula intervalos en x que corresponden a ±1σ y ±2σ
-    m1, p1 = mu0 - sigma0, mu0 + sigma0
-    m2, p2 = mu0 - 2*sigma0, mu0 + 2*sigma0
+    # t en [0,1] para cada frame (no depende del número de frames)
+    t = np.linspace(0.0, 1.0, frames) if frames > 1 else np.ones(1)
+    mu = lerp(MU_START, MU_END, t)
+    sigma = lerp(SIGMA_START, SIGMA_END, t)
 
-    # Máscaras booleanas para quedarnos solo con los puntos x dentro del intervalo
-    mask1 = (x >= m1) & (x <= p1)
-    mask2 = (x >= m2) & (x <= p2)
+    # (F, N): una fila por frame
+    y = pdf(x[None, :], mu[:, None], sigma[:, None])
 
-    # Rellena el área bajo la curva dentro de ±2σ y ±1σ.
-    # Ojo: el alpha no es "probabilidad"; es solo transparencia visual.
-    fill_2 = ax.fill_between(x[mask2], y0[mask2], alpha=0.15)  # ±2σ (≈0.9545)
-    fill_1 = ax.fill_between(x[mask1], y0[mask1], alpha=0.30)  # ±1σ (≈0.6827)
+    # Máscaras ±1σ y ±2σ de todos los frames: fuera del intervalo la altura es 0
+    dist = np.abs(x[None, :] - mu[:, None])
+    y1 = np.where(dist <= sigma[:, None], y, 0.0)
+    y2 = np.where(dist <= 2 * sigma[:, None], y, 0.0)
 
-    # Título inicial (informativo)
-    ax.set_title(f"mu={mu0:.2f}, sigma={sigma0:.2f} | ±1σ≈0.683, ±2σ≈0.954")
+    return {
+        'x': x,
+        'mu': mu,
+        'sigma': sigma,
+        'y': y,
+        'verts1': _area_verts(x, y1),
+        'verts2': _area_verts(x, y2),
+        'vlines': np.stack([mu, mu - sigma, mu + sigma, mu - 2*sigma, mu + 2*sigma], axis=1),
+    }
 
-    # IMPORTANTE: devolver los "artists" que cambian (especialmente si usaras blit=True).
-    return line, v_mu, v_m1, v_p1, v_m2, v_p2, txt_var
 
+# =========================
+# FIGURA, ARTISTAS Y ANIMACIÓN
+# =========================
 
-def update(frame):
+def build_animation(fig, ax, data, interval=INTERVAL_MS, blit=True):
     """
-    update(frame) se ejecuta en cada frame.
-    'frame' es un entero: 0, 1, 2, ..., FRAMES-1
-
-    Aquí actualizamos:
-    - mu y sigma (interpolando de inicio a fin)
-    - la curva line (set_data)
-    - las líneas verticales
-    - los rellenos del área
+    Crea los artistas una sola vez. Devuelve (FuncAnimation, update, artistas).
+
+    update(frame) solo copia datos precalculados en esos artistas:
+    - line.set_ydata(y[frame])                  (la curva)
+    - PolyCollection.set_verts(...)             (las áreas, sin remove() + fill_between)
+    - axvline.set_xdata(...)                    (las líneas verticales)
     """
-    global fill_1, fill_2  # porque vamos a eliminar y recrear los rellenos
+    from matplotlib.animation import FuncAnimation
+    from matplotlib.collections import PolyCollection
 
-    # Convertimos frame a t en [0,1] para que el rango no dependa del número de frames
-    t = frame / (FRAMES - 1) if FRAMES > 1 else 1.0
+    x = data['x']
 
-    # mu y sigma evolucionan linealmente en el tiempo (configurable con START/END)
-    mu = lerp(MU_START, MU_END, t)
-    sigma = lerp(SIGMA_START, SIGMA_END, t)
+    # Límites visibles de los ejes
+    ax.set_xlim(X_MIN, X_MAX)     # xlim: rango mostrado en el eje X
+    ax.set_ylim(0, Y_MAX)         # ylim: rango mostrado en el eje Y (densidad siempre >= 0)
+    ax.set_title(f"N(mu, sigma²) | ±1σ≈{AREA_1SIGMA:.3f}, ±2σ≈{AREA_2SIGMA:.3f}")
 
-    # Texto varianza
-    txt_var.set_text(f"sigma={sigma:.3f}   Var=sigma^2={sigma**2:.3f}")
+    # "line, = ..." (con coma) hace unpacking del único Line2D que devuelve ax.plot
+    line, = ax.plot(x, data['y'][0], lw=LINE_WIDTH)
 
-    # Recalcula la curva
-    y = pdf(x, mu, sigma)
-    line.set_data(x, y)
+    # Rellenos: PolyCollection creados una vez; cada frame cambia sus vértices
+    fill_2 = ax.add_collection(PolyCollection([data['verts2'][0]], alpha=0.15))   # ±2σ (≈0.9545)
+    fill_1 = ax.add_collection(PolyCollection([data['verts1'][0]], alpha=0.30))   # ±1σ (≈0.6827)
 
-    # Mueve líneas verticales
-    v_mu.set_xdata([mu, mu])
-    v_m1.set_xdata([mu - sigma, mu - sigma])
-    v_p1.set_xdata([mu + sigma, mu + sigma])
-    v_m2.set_xdata([mu - 2*sigma, mu - 2*sigma])
-    v_p2.set_xdata([mu + 2*sigma, mu + 2*sigma])
+    # Líneas verticales: mu, mu±sigma, mu±2sigma
+    styles = ['-', '--', '--', ':', ':']
+    vlines = [ax.axvline(0, lw=1, ls=ls) for ls in styles]
 
-    # Actualiza rellenos: borrar y recrear (simple y fiable)
-    if fill_1:
-        fill_1.remove()
-    if fill_2:
-        fill_2.remove()
+    # Texto con mu, sigma y varianza (dentro de los ejes para que blit lo repinte)
+    txt = ax.text(0.02, 0.95, "", transform=ax.transAxes, va="top")
 
-    m1, p1 = mu - sigma, mu + sigma
-    m2, p2 = mu - 2*sigma, mu + 2*sigma
+    artists = (line, fill_1, fill_2, *vlines, txt)
 
-    mask1 = (x >= m1) & (x <= p1)
-    mask2 = (x >= m2) & (x <= p2)
+    def update(frame):
+        line.set_ydata(data['y'][frame])
+        fill_1.set_verts([data['verts1'][frame]])
+        fill_2.set_verts([data['verts2'][frame]])
+        for v, pos in zip(vlines, data['vlines'][frame]):
+            v.set_xdata([pos, pos])
+        mu, sigma = data['mu'][frame], data['sigma'][frame]
+        txt.set_text(f"mu={mu:.2f}   sigma={sigma:.3f}   Var=sigma^2={sigma**2:.3f}")
+        # IMPORTANTE con blit=True: devolver los "artists" que cambian
+        return artists
 
-    fill_2 = ax.fill_between(x[mask2], y[mask2], alpha=0.15)
-    fill_1 = ax.fill_between(x[mask1], y[mask1], alpha=0.30)
+    def init():
+        return update(0)
 
-    # Si sigma cambia mucho, el pico cambia mucho: pico = 1/(sigma*sqrt(2pi))
-    # Esto ajusta el eje Y para que siempre se vea bien el "top" de la campana.
-    # peak = 1 / (sigma * np.sqrt(2*np.pi))
-    # ax.set_ylim(0, 1.2 * peak)
+    anim = FuncAnimation(fig, update, init_func=init, frames=len(data['mu']),
+                         interval=interval, blit=blit)
+    return anim, update, artists
 
-    ax.set_title(f"mu={mu:.2f}, sigma={sigma:.2f} | ±1σ≈0.683, ±2σ≈0.954")
 
-    return line, v_mu, v_m1, v_p1, v_m2, v_p2, txt_var
+# =========================
+# EXPORTACIÓN (MP4 / GIF) con blit
+# =========================
 
+def render_frames(fig, update, artists, frames):
+    """
+    Genera las imágenes RGBA de los frames indicados (iterable de índices) con blit.
 
-# FuncAnimation crea el "bucle de frames" llamando update(frame)
-# - frames=FRAMES: cuántos frames
-# - interval=INTERVAL_MS: ms entre frames
-# - blit=False: más compatible (refresca todo el eje)
-anim = FuncAnimation(fig, update, init_func=init, frames=FRAMES, interval=INTERVAL_MS, blit=False)
+    anim.save() vuelve a dibujar la figura ENTERA en cada frame (ejes, ticks y textos
+    incluidos), que es lo más caro. Aquí el fondo estático se dibuja una sola vez y
+    en cada frame solo se pintan encima los artistas que cambian.
+    """
+    canvas = fig.canvas
+    for a in artists:
+        a.set_animated(True)          # el fondo se dibuja sin ellos
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+    for frame in frames:
+        canvas.restore_region(background)
+        for a in update(frame):
+            a.axes.draw_artist(a)
+        yield np.asarray(canvas.buffer_rgba()).copy()
+
+
+def export(fig, update, artists, frames, path, fps):
+    """
+    Guarda la animación en .gif (Pillow) o .mp4 (FFMpegWriter) y devuelve la ruta escrita.
 
-plt.show()
+    Si ffmpeg no está disponible (ni en el PATH ni en rcParams['animation.ffmpeg_path'])
+    avisa y guarda un GIF con el mismo nombre en lugar del .mp4.
+    """
+    from matplotlib import animation
+
+    if not path.lower().endswith('.gif') and not animation.writers.is_available('ffmpeg'):
+        gif = str(Path(path).with_suffix('.gif'))
+        print(f"ffmpeg no está disponible (instálalo o pon su ruta en rcParams['animation.ffmpeg_path']); "
+              f"se guarda un GIF en su lugar: {gif}", file=sys.stderr)
+        path = gif
+
+    if path.lower().endswith('.gif'):
+        from PIL import Image
+        # Una paleta para todos los frames, sacada del primero y el último juntos
+        # (cuantizar con paleta fija es mucho más rápido que calcular una por frame)
+        ends = list(render_frames(fig, update, artists, [0, frames - 1]))
+        palette = Image.fromarray(np.concatenate(ends)[..., :3]).quantize()
+        images = [Image.fromarray(img[..., :3]).quantize(palette=palette, dither=Image.Dither.NONE)
+                  for img in render_frames(fig, update, artists, range(frames))]
+        images[0].save(path, save_all=True, append_images=images[1:], duration=round(1000 / fps), loop=0)
+        return path
+
+    # FFMpegWriter lanza y cierra ffmpeg (y da error si falla). Los frames se le pasan
+    # ya dibujados con blit: grab_frame() volvería a dibujar la figura entera en cada uno.
+    writer = animation.FFMpegWriter(fps=fps, codec='libx264', extra_args=['-pix_fmt', 'yuv420p'])
+    writer.frame_format = 'rgba'
+    with writer.saving(fig, path, dpi=fig.dpi):
+        for img in render_frames(fig, update, artists, range(frames)):
+            writer._proc.stdin.write(img.tobytes())
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Animación de la Normal con áreas ±1σ / ±2σ")
+    parser.add_argument('--save', help="exporta a un fichero .mp4 (ffmpeg) o .gif (Pillow) sin abrir ventana")
+    parser.add_argument('--fps', type=int, default=round(1000 / INTERVAL_MS))
+    parser.add_argument('--dpi', type=int, default=100)
+    args = parser.parse_args(argv)
+
+    if args.save:
+        # Exportar no necesita pantalla: backend sin ventana (funciona en servidores)
+        import matplotlib
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    data = precompute_frames()
+    fig, ax = plt.subplots(dpi=args.dpi)
+    anim, update, artists = build_animation(fig, ax, data)
+
+    if args.save:
+        anim.pause()                  # los frames los genera export(), no el temporizador
+        path = export(fig, update, artists, len(data['mu']), args.save, args.fps)
+        print(f"{len(data['mu'])} frames guardados en {path}")
+    else:
+        plt.show()
+
+
+if __name__ == "__main__":
+    main()
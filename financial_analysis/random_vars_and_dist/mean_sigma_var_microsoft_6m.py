@@ -1,31 +1,51 @@
-import pandas as pd
+import sys
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Hace importable el paquete fintech_labs (en financial_analysis/) al ejecutar el script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fintech_labs.bars import bars_per_year, resample_ohlcv
+from fintech_labs.market_data import load_ohlcv, data_path
+from fintech_labs.rolling_stats import block_moments, rolling_moments
+
+# Tamaño de barra: "D" (diaria, como el CSV), "W" (semanal), "ME" (mensual)... o un entero N
+# (barras de N días). Los log-returns y las estadísticas se calculan sobre esas barras.
+TIMEFRAME = "D"
+
 # --- Leer el CSV ---
-ms = pd.read_csv("../data/microsoft.csv")          # Carga el fichero con datos históricos
-ms["Date"] = pd.to_datetime(ms["Date"])           # Convierte la columna Date a tipo fecha
-ms = ms.sort_values("Date").set_index("Date")     # Ordena por fecha y pone Date como índice (eje X)
+# load_ohlcv devuelve Date como índice (ordenado) y Close ya como float64 (con caché binaria)
+ms = load_ohlcv(data_path("microsoft"))
 
 # --- Limpiar precios ---
-ms["Close"] = pd.to_numeric(ms["Close"], errors="coerce")  # Asegura que Close es numérico (si algo falla, NaN)
 ms = ms.dropna(subset=["Close"])                           # Elimina filas sin precio
 
-# --- Calcular log-returns diarios ---
+# --- Agregar a otra escala temporal (Open=primero, High=máx, Low=mín, Close=último, Volume=suma) ---
+if TIMEFRAME != "D":
+    ms = resample_ohlcv(ms, TIMEFRAME)
+
+# --- Calcular log-returns (diarios con TIMEFRAME = "D") ---
 # LogReturn_t = ln(P_t) - ln(P_{t-1})  == ln(P_t / P_{t-1})
 ms["LogReturn"] = np.log(ms["Close"]).diff()     # diff() resta con el día anterior; el primer día queda NaN
 ms = ms.dropna(subset=["LogReturn"])             # Quitamos el primer NaN (y cualquier otro)
 
 # --- Agrupar en bloques de 6 meses (enero-junio, julio-diciembre) ---
-# pd.Grouper(freq="6MS") = grupos que empiezan cada 6 meses (Month Start): Jan 1, Jul 1, Jan 1, ...
-g = ms.groupby(pd.Grouper(freq="6MS"))["LogReturn"]  # g es un “grupo” de log-returns por semestres
+# freq="6MS" = grupos que empiezan cada 6 meses (Month Start): Jan 1, Jul 1, Jan 1, ...
+# (los mismos bloques que pd.Grouper(freq="6MS"))
+# block_moments calcula media, varianza, desviación, asimetría y curtosis de cada bloque
+# en UNA pasada (en vez de un groupby(...).transform(...) por cada estadístico).
+# aligned=True: cada fila recibe el valor de SU bloque (como transform("mean"))
+stats = block_moments(ms["LogReturn"].to_numpy(), ms.index, freq="6MS")
+
+ms["mu_6m"] = stats["mean"]       # μ = media de log-return en ese semestre (valor constante por bloque)
+ms["sigma_6m"] = stats["std"]     # σ = desviación típica en ese semestre (volatilidad diaria)
+ms["var_6m"] = stats["var"]       # σ² = varianza en ese semestre (volatilidad al cuadrado)
 
-print(g.head())
-# --- Calcular estadísticas por bloque, pero alineadas a cada día del bloque ---
-# transform("mean") pone a cada fila el valor medio de SU bloque
-ms["mu_6m"] = g.transform("mean")       # μ = media de log-return en ese semestre (valor constante por bloque)
-ms["sigma_6m"] = g.transform("std")     # σ = desviación típica en ese semestre (volatilidad diaria)
-ms["var_6m"] = g.transform("var")       # σ² = varianza en ese semestre (volatilidad al cuadrado)
+# Ventanas móviles de verdad (no bloques fijos): σ de los últimos ~6 meses
+# (126 barras diarias, 26 semanales, 6 mensuales...)
+window = max(2, round(bars_per_year(TIMEFRAME) / 2))
+ms["sigma_rolling"] = rolling_moments(ms["LogReturn"].to_numpy(), window, stats=("std",))["std"]
 
 # --- Dibujar gráficos ---
 fig, (ax_price, ax_stats) = plt.subplots(2, 1, figsize=(14, 8), sharex=True)  # 2 filas, mismo eje X (fecha)
@@ -38,6 +58,7 @@ ax_price.set_ylabel("Price")
 # Gráfico 2: métricas por semestres (eje izquierdo)
 ax_stats.plot(ms.index, ms["mu_6m"], label="μ (media log-return, bloque 6M)")
 ax_stats.plot(ms.index, ms["sigma_6m"], label="σ (desv típica log-return, bloque 6M)")
+ax_stats.plot(ms.index, ms["sigma_rolling"], label=f"σ (ventana móvil {window} barras)", alpha=0.7)
 ax_stats.axhline(0, linewidth=1)           # Línea horizontal en 0 para ver si μ está por encima o por debajo
 ax_stats.set_ylabel("Return (log)")
 ax_stats.legend(loc="center left")
@@ -0,0 +1,62 @@
+"""
+Generate normal_sigma_sweep tables (CSV, Parquet or workbooks) from Python.
+
+The defaults reproduce the grid of normal_sigma_sweep.xlsx: mu = 0, x from -6 to 6 in
+121 points, sigma from 0.2 to 3.1 in steps of 0.1, written as CSV. An .xlsx output
+(same sheet layout as the workbook) needs openpyxl and .parquet needs pyarrow; neither
+is in requirements.txt. The sweep itself lives in
+``fintech_labs.normal_sweep``; blocks are streamed to the output, so large grids
+(many mus, sigmas and points) do not need to fit in memory.
+
+Usage::
+
+    python normal_sigma_sweep.py                           # normal_sigma_sweep_generated.csv
+    python normal_sigma_sweep.py --out sweep.xlsx          # pip install openpyxl
+    python normal_sigma_sweep.py --out sweep.csv --mu -1 1 21 --sigma 0.1 3 0.01 --points 2001
+    python normal_sigma_sweep.py --out sweep.parquet --mu -2 2 401 --sigma 0.05 5 0.05
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Make the fintech_labs package (in financial_analysis/) importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fintech_labs.normal_sweep import COVERAGE_K, write_sweep
+
+
+def sigma_range(start: float, stop: float, step: float) -> np.ndarray:
+    """start, start + step, ... up to stop (inclusive), rounded like the workbook headers."""
+    n = int(np.floor((stop - start) / step + 1e-9)) + 1
+    return np.round(start + step * np.arange(n), 10)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Normal pdf / cdf / ±kσ coverage over a (mu x sigma x x) grid")
+    parser.add_argument('--out', default='normal_sigma_sweep_generated.csv',
+                        help="output file: .csv, .xlsx (needs openpyxl) or .parquet (needs pyarrow)")
+    parser.add_argument('--mu', type=float, nargs='+', default=[0.0],
+                        help="one mu, or START STOP COUNT for a linspace of mus")
+    parser.add_argument('--sigma', type=float, nargs=3, default=[0.2, 3.1, 0.1], metavar=('START', 'STOP', 'STEP'))
+    parser.add_argument('--x-min', type=float, default=-6.0)
+    parser.add_argument('--x-max', type=float, default=6.0)
+    parser.add_argument('--points', type=int, default=121, help="N puntos (x)")
+    parser.add_argument('--k', type=float, nargs='+', default=list(COVERAGE_K), help="coverage half-widths in sigmas")
+    args = parser.parse_args(argv)
+
+    if len(args.mu) == 3:
+        mu = np.linspace(args.mu[0], args.mu[1], int(args.mu[2]))
+    elif len(args.mu) == 1:
+        mu = np.array(args.mu)
+    else:
+        parser.error("--mu takes one value or START STOP COUNT")
+    sigma = sigma_range(*args.sigma)
+    x = np.linspace(args.x_min, args.x_max, args.points)
+
+    paths = write_sweep(args.out, mu, sigma, x, ks=args.k)
+    print(f"{len(mu)} mu x {len(sigma)} sigma x {len(x)} x -> {', '.join(map(str, paths))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,13 @@
+import sys
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Make the fintech_labs package (in financial_analysis/) importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fintech_labs.normal_sweep import pdf  # la misma pdf(x, mu, sigma) de la animación
+
 # 3 poblaciones
 A = np.array([1,3,5,7,9])
 B = np.array([1,2,5,8,9])
@@ -11,9 +18,6 @@ names = ["A: 1,3,5,7,9", "B: 1,2,5,8,9", "C: 1,4,5,7,8", "D: 3,4,5,6,7"]
 
 Y_MAX = 0.3
 
-def pdf(x, mu, sigma):
-    return (1/(sigma*np.sqrt(2*np.pi))) * np.exp(-((x-mu)**2)/(2*sigma**2))
-
 fig, axes = plt.subplots(4, 1, sharex=True)
 
 for ax, data, name in zip(axes, pops, names):
@@ -1,25 +1,20 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-
-meanlist = []
-varlist = []
+import sys
+from pathlib import Path
 
-# Generate 1000 samples
-for t in range(1000):
-    # Each sample has 30 random values from N(10, 5)
-    sample = pd.DataFrame(np.random.normal(loc=10, scale=5, size=30))
+import matplotlib.pyplot as plt
 
-    # Save the sample mean
-    meanlist.append(sample[0].mean())
+# Make the fintech_labs package (in financial_analysis/) importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from fintech_labs.sampling import sampling_distribution
 
-    # Save the sample variance
-    varlist.append(sample[0].var(ddof=1))
+# Generate 1000 samples, each one with 30 random values from N(10, 5).
+# Instead of a Python loop (one DataFrame per sample), all samples are drawn at once
+# as a (1000 x 30) array and the mean / variance (ddof=1) of every row are computed
+# in one vectorized step. Use trials=1_000_000 or more for smooth histograms.
+collection = sampling_distribution(n=30, trials=1000, loc=10, scale=5, seed=None)
 
-# Store results in a DataFrame
-collection = pd.DataFrame()
-collection["meanlist"] = meanlist
-collection["varlist"] = varlist
+# Same column names as the original loop version
+collection = collection.rename(columns={"mean": "meanlist", "var": "varlist"})
 
 print(collection.head())
 
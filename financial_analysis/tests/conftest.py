@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Make the fintech_labs package (in financial_analysis/) importable from the tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
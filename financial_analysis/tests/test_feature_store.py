@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fintech_labs.backtest import backtest_ma_crossover
+from fintech_labs.feature_store import FeatureStore
+from fintech_labs.market_data import data_path, load_ohlcv
+
+
+@pytest.fixture
+def gappy_csv(tmp_path):
+    """microsoft.csv with one missing close in the middle of 2016."""
+    raw = pd.read_csv(data_path('microsoft'))
+    raw.loc[raw['Date'] == '2016-06-15', 'Close'] = np.nan
+    path = tmp_path / 'gappy.csv'
+    raw.to_csv(path, index=False)
+    return path
+
+
+def test_rolling_mean_matches_rolling_with_nan(gappy_csv):
+    store = FeatureStore()
+    df = load_ohlcv(gappy_csv).loc['2016']
+    for window in (5, 30):
+        np.testing.assert_allclose(store.rolling_mean(str(gappy_csv), window, df.index),
+                                   df['Close'].rolling(window).mean().to_numpy(), equal_nan=True)
+
+
+def test_backtest_store_matches_uncached_with_nan(gappy_csv):
+    df = load_ohlcv(gappy_csv).loc['2016':'2017']
+    expected = backtest_ma_crossover(df, 10, 40, fee_bps=5)
+    got = backtest_ma_crossover(df, 10, 40, fee_bps=5, store=FeatureStore(), ticker=str(gappy_csv))
+    assert got.keys() == expected.keys()
+    for k in expected:
+        assert got[k] == pytest.approx(expected[k], rel=1e-9), k
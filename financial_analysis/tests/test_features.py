@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fintech_labs.features import rolling_mean
+
+
+@pytest.mark.parametrize('window', [1, 3, 20])
+def test_rolling_mean_matches_pandas(window):
+    x = 100 + np.cumsum(np.random.default_rng(0).normal(size=500))
+    expected = pd.Series(x).rolling(window).mean().to_numpy()
+    np.testing.assert_allclose(rolling_mean(x, window), expected, rtol=1e-12, equal_nan=True)
+
+
+def test_rolling_mean_nan_only_spoils_its_windows():
+    x = np.arange(1, 41, dtype=float)
+    x[5] = np.nan
+    out = rolling_mean(x, 3)
+    np.testing.assert_allclose(out, pd.Series(x).rolling(3).mean().to_numpy(), equal_nan=True)
+    np.testing.assert_allclose(out[-3:], [37, 38, 39])
+    assert np.isnan(out[5:8]).all() and not np.isnan(out[8:]).any()
+
+
+def test_rolling_mean_leading_nan():
+    x = np.array([np.nan, np.nan, 1e6, 1e6 + 1, 1e6 + 2, 1e6 + 3])
+    np.testing.assert_allclose(rolling_mean(x, 2), pd.Series(x).rolling(2).mean().to_numpy(),
+                               equal_nan=True)
+    assert np.isnan(rolling_mean(np.full(5, np.nan), 2)).all()
@@ -0,0 +1,31 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from fintech_labs.bootstrap import resample_indices
+from fintech_labs.horizon_risk import MAX_CHUNK_CELLS, simulate_horizons
+
+
+@pytest.mark.parametrize('method', ['iid', 'moving_block', 'stationary'])
+@pytest.mark.parametrize('length', [1, 21, 252, 5000])
+def test_resample_indices_length(method, length):
+    idx = resample_indices(779, 50, method, block=20, rng=0, length=length)
+    assert idx.shape == (50, length)
+    assert idx.min() >= 0 and idx.max() < 779
+
+
+@pytest.mark.parametrize('method', ['moving_block', 'stationary'])
+def test_simulate_horizons_memory_does_not_grow_with_history(method):
+    # 50k days of history, 252-day horizon: only paths x 252 cells may be generated
+    r = np.random.default_rng(0).normal(0.0, 0.01, 50_000)
+    paths = 2_000
+    tracemalloc.start()
+    try:
+        sims = simulate_horizons(r, horizons=(1, 21, 252), paths=paths, method=method, seed=1)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert sims.shape == (1, 3, paths)
+    # A handful of (paths x 252) int64 / float64 temporaries, far below paths x 50k
+    assert peak < 16 * min(paths * 252, MAX_CHUNK_CELLS) * 8 + r.nbytes
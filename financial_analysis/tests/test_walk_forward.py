@@ -0,0 +1,15 @@
+import pytest
+
+from fintech_labs.backtest import grid_search
+from fintech_labs.market_data import data_path, load_ohlcv
+from fintech_labs.walk_forward import walk_forward
+
+
+@pytest.mark.parametrize('ticker', ['apple', 'microsoft'])
+def test_folds_pick_grid_search_winner(ticker):
+    df = load_ohlcv(data_path(ticker))
+    fast_list, slow_list = range(5, 31, 5), range(20, 201, 20)
+    folds, _ = walk_forward(df, fast_list, slow_list, train_len=252, test_len=126, fee_bps=10)
+    for f in folds.itertuples():
+        best = grid_search(df.loc[f.train_start:f.train_end], fast_list, slow_list, fee_bps=10).iloc[0]
+        assert (best['fast'], best['slow']) == (f.fast, f.slow), f.train_start